@@ -9,8 +9,20 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_asgi_application()
+
+# The event loop outlives requests, so async views may keep an asyncio
+# Redis client per loop (core.async_cache).
+from core import async_cache  # noqa: E402
+async_cache.ASGI = True
+
+if settings.DEBUG:
+    # uvicorn does not serve static files; keep the admin usable in dev
+    # the way runserver did.
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+    application = ASGIStaticFilesHandler(application)
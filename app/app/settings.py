@@ -48,6 +48,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,6 +58,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ThrottleMiddleware',
+    'core.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'app.urls'
@@ -87,9 +92,41 @@ DATABASES = {
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'PORT': os.environ.get('DB_PORT', ''),
+        # Keep connections open between requests (seconds; 0 closes them
+        # after each request) and check them before reuse. Persistent
+        # connections are only safe for sync (WSGI) servers: under ASGI,
+        # sync ORM calls run in per-request threads whose connections
+        # would stay open. gunicorn.conf.py sets it for gthread workers.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '0')),
+        'CONN_HEALTH_CHECKS': os.environ.get(
+            'DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
+        # Required behind PgBouncer in transaction pooling mode.
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get(
+            'DB_DISABLE_SERVER_SIDE_CURSORS', 'False').lower() == 'true',
     }
 }
 
+# Read replicas (`host` or `host:port`, comma-separated; same name and
+# credentials as the primary). The read-only API views read from them
+# (core.db_router), except for clients that wrote in the last
+# DB_REPLICA_STICKY_SECONDS, which keep reading from the primary.
+DATABASE_REPLICAS = []
+for i, replica in enumerate(
+        r.strip() for r in os.environ.get('DB_REPLICA_HOSTS', '').split(',')
+        if r.strip()):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica_{i}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{i}')
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+DB_REPLICA_STICKY_SECONDS = int(
+    os.environ.get('DB_REPLICA_STICKY_SECONDS', '5'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -131,6 +168,125 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# DRF: JSON is encoded and decoded with orjson (core.renderers).
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Reverse proxies in front of the app. Client IPs (rate limits) are
+    # read from X-Forwarded-For only behind this many proxies; with 0,
+    # the header is ignored, as clients can set it to anything.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
+}
+
+# Article list counts stop at this many rows: beyond it, the response
+# gives the Postgres planner's estimate or the cap, flagged with
+# `count_is_approximate` (core.pagination).
+PAGINATION_COUNT_CAP = int(os.getenv("PAGINATION_COUNT_CAP", "10000"))
+
+# Rate limits per client and route (core.throttling): cost units per
+# sliding window, keyed by URL name, e.g.
+# THROTTLE_RATES="article-list=600/min,default=1200/min". A request
+# costs 1; one that misses the page cache costs THROTTLE_MISS_COST more,
+# plus 1 for every THROTTLE_PAGE_COST_STEP pages of depth.
+THROTTLE_ENABLED = os.getenv("THROTTLE_ENABLED", "True").lower() == "true"
+THROTTLE_RATES = {
+    "default": "1200/min",
+    "article-list": "600/min",
+    "article-related": "120/min",
+    **{
+        route.strip(): rate.strip() or None
+        for route, _, rate in (
+            item.partition("=")
+            for item in os.getenv("THROTTLE_RATES", "").split(",")
+            if item.strip()
+        )
+    },
+}
+THROTTLE_MISS_COST = int(os.getenv("THROTTLE_MISS_COST", "5"))
+THROTTLE_PAGE_COST_STEP = int(os.getenv("THROTTLE_PAGE_COST_STEP", "10"))
+
+# Responses of at least COMPRESSION_MIN_SIZE bytes are compressed with
+# brotli or gzip (core.compression); cached pages are stored compressed.
+COMPRESSION_ENABLED = os.getenv(
+    "COMPRESSION_ENABLED", "True").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# RSS/Atom feeds polled by `fetch_articles --sources feeds`
+RSS_FEEDS = [
+    u.strip() for u in os.getenv("RSS_FEEDS", "").split(",") if u.strip()
+]
+
+# Ingest HTTP client (core.services.http_client): timeouts in seconds,
+# retries of 429/5xx and connection errors with exponential backoff (at
+# most INGEST_HTTP_BACKOFF_MAX seconds per wait), and a circuit breaker
+# per provider that opens after INGEST_CIRCUIT_THRESHOLD failed calls
+# within INGEST_CIRCUIT_WINDOW seconds, for INGEST_CIRCUIT_COOLDOWN.
+INGEST_HTTP_CONNECT_TIMEOUT = float(
+    os.getenv("INGEST_HTTP_CONNECT_TIMEOUT", "3.05"))
+INGEST_HTTP_READ_TIMEOUT = float(os.getenv("INGEST_HTTP_READ_TIMEOUT", "10"))
+INGEST_HTTP_RETRIES = int(os.getenv("INGEST_HTTP_RETRIES", "3"))
+INGEST_HTTP_BACKOFF = float(os.getenv("INGEST_HTTP_BACKOFF", "0.5"))
+INGEST_HTTP_BACKOFF_MAX = float(os.getenv("INGEST_HTTP_BACKOFF_MAX", "30"))
+INGEST_CIRCUIT_THRESHOLD = int(os.getenv("INGEST_CIRCUIT_THRESHOLD", "5"))
+INGEST_CIRCUIT_WINDOW = int(os.getenv("INGEST_CIRCUIT_WINDOW", "300"))
+INGEST_CIRCUIT_COOLDOWN = int(os.getenv("INGEST_CIRCUIT_COOLDOWN", "60"))
+
+# Summarizer LLM calls: timeout in seconds and SDK retries, and the
+# circuit breaker that sends summaries straight to the offline fallback
+# once, within SUMMARIZER_CIRCUIT_WINDOW seconds, at least
+# SUMMARIZER_CIRCUIT_THRESHOLD calls failed and they are at least
+# SUMMARIZER_CIRCUIT_ERROR_RATE of all calls; it probes the LLM again
+# after SUMMARIZER_CIRCUIT_COOLDOWN seconds.
+SUMMARIZER_LLM_TIMEOUT = float(os.getenv("SUMMARIZER_LLM_TIMEOUT", "30"))
+SUMMARIZER_LLM_RETRIES = int(os.getenv("SUMMARIZER_LLM_RETRIES", "1"))
+SUMMARIZER_CIRCUIT_THRESHOLD = int(
+    os.getenv("SUMMARIZER_CIRCUIT_THRESHOLD", "5"))
+SUMMARIZER_CIRCUIT_ERROR_RATE = float(
+    os.getenv("SUMMARIZER_CIRCUIT_ERROR_RATE", "0.5"))
+SUMMARIZER_CIRCUIT_WINDOW = int(os.getenv("SUMMARIZER_CIRCUIT_WINDOW", "120"))
+SUMMARIZER_CIRCUIT_COOLDOWN = int(
+    os.getenv("SUMMARIZER_CIRCUIT_COOLDOWN", "60"))
+# Seconds after which an article claimed for summarizing, but still not
+# summarized (its worker died), is claimed again.
+SUMMARIZER_CLAIM_TIMEOUT = int(os.getenv("SUMMARIZER_CLAIM_TIMEOUT", "900"))
+
+# Embedding index (memory-mapped .npy files, rebuilt by embed_articles)
+EMBEDDING_INDEX_DIR = os.getenv(
+    "EMBEDDING_INDEX_DIR", str(BASE_DIR / "data" / "embeddings")
+)
+
+# Articles published more than this many days ago are deleted by
+# `prune_articles` and the pipeline's daily prune job (0 keeps them all).
+ARTICLE_RETENTION_DAYS = int(os.getenv("ARTICLE_RETENTION_DAYS", "0"))
+
+# Cache warming: after the pipeline stores new articles or summaries,
+# the first CACHE_WARM_PAGES pages of the CACHE_WARM_COMBINATIONS most
+# requested list queries (over the last CACHE_STATS_WINDOW_HOURS) are
+# recomputed into the page cache.
+CACHE_WARM_COMBINATIONS = int(os.getenv("CACHE_WARM_COMBINATIONS", "20"))
+CACHE_WARM_PAGES = int(os.getenv("CACHE_WARM_PAGES", "3"))
+CACHE_STATS_WINDOW_HOURS = int(os.getenv("CACHE_STATS_WINDOW_HOURS", "24"))
+
+# Per-request profiling (core.middleware.ProfilingMiddleware): staff
+# requests with `X-Profile: 1` or `?profile=1`, plus a sampled fraction
+# of all requests; the newest profiles are kept in the cache.
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_MAX_PROFILES = int(os.getenv("PROFILING_MAX_PROFILES", "50"))
+PROFILING_TTL = int(os.getenv("PROFILING_TTL", str(24 * 60 * 60)))
+
+# Who may read /metrics (core.permissions.MetricsAccess): clients from
+# METRICS_ALLOWED_IPS (comma-separated addresses or CIDR ranges), or
+# requests with `Authorization: Bearer <METRICS_TOKEN>` when it is set.
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
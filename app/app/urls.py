@@ -19,12 +19,30 @@ from django.urls import path, include
 
 from rest_framework.routers import DefaultRouter
 
-from core.views.articles import ArticleViewSet
+from core.views.articles import (
+    ArticleViewSet,
+    article_detail,
+    article_summary,
+)
+from core.views.metrics import metrics
+from core.views.profiles import profile_detail, profile_list, profile_pstats
+from core.views.summaries import bulk_summaries
 
 router = DefaultRouter()
 router.register("articles", ArticleViewSet, basename="article")
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
+    # Async read endpoints (served without blocking under ASGI).
+    path('articles/<int:pk>/', article_detail, name='article-detail'),
+    path('articles/<int:pk>/summary/', article_summary,
+         name='article-summary'),
+    path('summaries/', bulk_summaries, name='summary-list'),
+    path('profiles/', profile_list, name='profile-list'),
+    path('profiles/<str:profile_id>/', profile_detail,
+         name='profile-detail'),
+    path('profiles/<str:profile_id>/pstats', profile_pstats,
+         name='profile-pstats'),
     path('', include(router.urls)),
 ]
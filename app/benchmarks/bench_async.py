@@ -0,0 +1,191 @@
+"""
+Benchmark: concurrency of one worker process under a slow database.
+
+Serves the article detail endpoint from a single process in two ways:
+
+* sync: the DRF viewset behind a WSGI server with a fixed thread pool
+  (like a gunicorn gthread worker);
+* async: the async view behind uvicorn.
+
+Every SQL query is delayed by `--latency-ms` to simulate a slow or
+remote database. Each stack is loaded at several concurrency levels
+and the throughput, latency percentiles and number of database
+connections opened are printed as JSON. Run it against Postgres; an
+in-memory SQLite test database does not model connections faithfully.
+
+    python -m benchmarks.bench_async --latency-ms 50 --threads 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _slow_query(latency):
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+class _SyncServer:
+    """WSGI server handling requests on a fixed-size thread pool."""
+
+    def __init__(self, threads: int):
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.core.servers.basehttp import (WSGIRequestHandler,
+                                                  WSGIServer)
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        class PooledWSGIServer(WSGIServer):
+            request_queue_size = 256
+
+            def process_request(self, request, client_address):
+                pool.submit(self._process, request, client_address)
+
+            def _process(self, request, client_address):
+                try:
+                    self.finish_request(request, client_address)
+                except Exception:
+                    self.handle_error(request, client_address)
+                finally:
+                    self.shutdown_request(request)
+
+        pool = ThreadPoolExecutor(max_workers=threads)
+        self.pool = pool
+        self.httpd = PooledWSGIServer(("127.0.0.1", _free_port()),
+                                      QuietHandler)
+        self.httpd.set_app(WSGIHandler())
+        self.url = "http://127.0.0.1:%d" % self.httpd.server_address[1]
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.pool.shutdown(wait=True)
+        self.thread.join()
+
+
+class _AsyncServer:
+    """uvicorn serving the ASGI application in a background thread."""
+
+    def __init__(self):
+        import uvicorn
+        from django.core.asgi import get_asgi_application
+
+        port = _free_port()
+        self.server = uvicorn.Server(uvicorn.Config(
+            get_asgi_application(), host="127.0.0.1", port=port,
+            lifespan="off", log_level="warning", access_log=False,
+        ))
+        self.url = f"http://127.0.0.1:{port}"
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def _run_load(url: str, ids: list[int], concurrency: int,
+              total: int) -> dict:
+    from benchmarks.load_test import run_load
+
+    result = asyncio.run(run_load(url, [{"path": "/articles/{id}/"}], ids,
+                                  concurrency, total))
+    del result["endpoints"]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", default="1,8,32,64")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    django.setup()
+
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from django.test.utils import (override_settings,
+                                   setup_test_environment,
+                                   teardown_test_environment)
+    from core.models import Article
+    from benchmarks.report import emit
+    from benchmarks.seed import seed
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    results = []
+    try:
+        seed(articles=200)
+        ids = list(Article.objects.values_list("pk", flat=True))
+        slow = _slow_query(args.latency_ms / 1000)
+
+        created = []
+
+        def install(sender, connection, **kwargs):
+            created.append(1)
+            connection.execute_wrappers.append(slow)
+        connection_created.connect(install)
+
+        stacks = [
+            (f"sync ({args.threads} threads)", "benchmarks.sync_urls",
+             lambda: _SyncServer(args.threads)),
+            ("async (uvicorn)", "app.urls", _AsyncServer),
+        ]
+        # The load generator runs in its own process so it does not
+        # compete with the server for the GIL.
+        loader = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+        for name, urlconf, make_server in stacks:
+            with override_settings(ROOT_URLCONF=urlconf, DEBUG=False,
+                                   THROTTLE_ENABLED=False), \
+                    make_server() as server:
+                for c in [int(c) for c in args.concurrency.split(",")]:
+                    opened = len(created)
+                    row = loader.submit(_run_load, server.url, ids, c,
+                                        args.requests).result()
+                    row["connections_opened"] = len(created) - opened
+                    results.append({"stack": name, **row})
+        loader.shutdown()
+        connection_created.disconnect(install)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    emit("async", results, output=args.output, latency_ms=args.latency_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Import-time benchmark of the app's entry points.
+
+Runs each entry point in a fresh interpreter under `python -X importtime`
+and reports the total import time (the sum of every module's own time),
+the wall time of the process and the slowest top-level imports:
+
+- `check`: `manage.py check` (settings, apps, URLconf, system checks);
+- `tag_articles`: `manage.py tag_articles --help` (command startup);
+- `run_pipeline`: `manage.py run_pipeline --help` (the worker, which
+  imports every service);
+- `wsgi`: the WSGI application with its URLconf loaded.
+
+Exits with status 1 when the best import time of an entry point (like
+timeit, the minimum over the runs, which is the least noisy) is above
+its budget, so it can guard against slow imports creeping back.
+
+    python -m benchmarks.bench_import --repeat 5
+    python -m benchmarks.bench_import --max-ms check=600
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+TARGETS = {
+    "check": ["manage.py", "check"],
+    "tag_articles": ["manage.py", "tag_articles", "--help"],
+    "run_pipeline": ["manage.py", "run_pipeline", "--help"],
+    "wsgi": ["-c", "from app.wsgi import application; "
+                   "from django.urls import get_resolver; "
+                   "get_resolver().url_patterns"],
+}
+# Import time budgets in milliseconds. They leave headroom over the
+# measured times, but not enough for the OpenAI SDK (~450 ms) to be
+# imported again on these paths.
+BUDGETS_MS = {"check": 600, "tag_articles": 400, "run_pipeline": 600,
+              "wsgi": 600}
+
+
+def _parse(stderr: str) -> tuple[float, list[tuple[str, float]]]:
+    """Returns total self time (ms) and cumulative ms per top import."""
+    total_us, top = 0, []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        if not name.startswith("  "):  # not imported by another module
+            top.append((name.strip(), int(cumulative_us) / 1000))
+    return total_us / 1000, top
+
+
+def measure(name: str, repeat: int) -> dict:
+    """Run an entry point `repeat` times and summarize its import time."""
+    totals, walls, top = [], [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", *TARGETS[name]],
+            cwd=APP_DIR, capture_output=True, text=True, check=True,
+        )
+        walls.append((time.perf_counter() - started) * 1000)
+        total, top = _parse(proc.stderr)
+        totals.append(total)
+    return {
+        "name": name,
+        "import_ms": round(statistics.median(totals), 1),
+        "import_ms_min": round(min(totals), 1),
+        "wall_ms": round(statistics.median(walls), 1),
+        "slowest_imports": [
+            {"module": module, "cumulative_ms": round(ms, 1)}
+            for module, ms in sorted(top, key=lambda t: -t[1])[:8]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target", action="append", choices=TARGETS,
+                        help="Entry point to measure (repeatable; "
+                             "default: all)")
+    parser.add_argument("--max-ms", action="append", default=[],
+                        metavar="TARGET=MS",
+                        help="Override the import time budget of a target")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    budgets = dict(BUDGETS_MS)
+    for item in args.max_ms:
+        target, _, ms = item.partition("=")
+        budgets[target] = float(ms)
+
+    import django
+    django.setup()
+    from benchmarks.report import emit
+
+    results = []
+    for name in args.target or TARGETS:
+        result = measure(name, args.repeat)
+        result["budget_ms"] = budgets[name]
+        result["over_budget"] = result["import_ms_min"] > budgets[name]
+        results.append(result)
+    emit("import_time", results, output=args.output, repeat=args.repeat)
+
+    over = [r["name"] for r in results if r["over_budget"]]
+    if over:
+        sys.stderr.write(f"Import time over budget: {', '.join(over)}\n")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: ingest throughput and peak memory against the fixture server.
+
+Runs the NewsAPI adapter through ingest_sources in a throwaway test
+database for several page and batch sizes and prints the results as
+JSON. Each case runs twice: once for throughput, once under tracemalloc
+for peak memory, which should follow the batch size, not the page size.
+
+    python -m benchmarks.bench_ingest
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+import django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+    from core.models import Article
+    from core.services.ingest import ingest_sources
+    from core.services.sources import NewsApiAdapter
+    from benchmarks.fixture_server import FixtureServer
+    from benchmarks.report import emit
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    results = []
+    try:
+        with FixtureServer() as server:
+            for page_size, batch_size in [(100, 50), (1000, 50),
+                                          (1000, 250)]:
+                def run():
+                    adapter = NewsApiAdapter(page_size=page_size,
+                                             api_key="bench",
+                                             url=server.url)
+                    return ingest_sources([adapter],
+                                          batch_size=batch_size)[0]
+
+                Article.objects.all().delete()
+                started = time.perf_counter()
+                created = run()
+                elapsed = time.perf_counter() - started
+
+                Article.objects.all().delete()
+                tracemalloc.start()
+                run()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                results.append({
+                    "page_size": page_size,
+                    "batch_size": batch_size,
+                    "created": created,
+                    "seconds": round(elapsed, 3),
+                    "items_per_sec": round(created / elapsed, 1),
+                    "peak_mib": round(peak / 2**20, 2),
+                })
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    emit("ingest", results, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
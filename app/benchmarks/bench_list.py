@@ -0,0 +1,126 @@
+"""
+List-endpoint benchmark over a large article table.
+
+Seeds a throwaway test database with `benchmarks.seed` (1M articles by
+default), then times `/articles/` requests through the Django test
+client with the page cache disabled: the first and a deep page, a topic
+filter (an EXISTS semi-join on the topic links) and duplicate
+collapsing. On Postgres it also reports the size of the article table
+and of the body table, and the shared buffers the list query touches
+(EXPLAIN (ANALYZE, BUFFERS)).
+
+    python -m benchmarks.bench_list --articles 1000000
+
+Seeding a million articles takes a while; `--articles 50000` gives a
+quick comparison.
+"""
+import argparse
+import os
+import re
+import statistics
+import time
+
+import django
+
+REQUESTS = [
+    ("first page", {}),
+    ("page 50", {"page": 50}),
+    ("topic filter", {"topic_slugs": "ai,python"}),
+    ("collapse duplicates", {"collapse_duplicates": "true"}),
+]
+
+
+def _time_request(client, url: str, params: dict, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url, params)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.status_code
+    return {
+        "min_ms": round(min(timings), 2),
+        "median_ms": round(statistics.median(timings), 2),
+    }
+
+
+def _postgres_stats(connection) -> dict:
+    """Table sizes and buffers read by the first list page query."""
+    from core.views.articles import ArticleViewSet
+
+    with connection.cursor() as cursor:
+        sizes = {}
+        for table in ("core_article", "core_articlebody"):
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [table])
+            if cursor.fetchone()[0]:
+                cursor.execute(
+                    "SELECT pg_relation_size(%s), pg_total_relation_size(%s)",
+                    [table, table])
+                heap, total = cursor.fetchone()
+                sizes[table] = {"heap_mb": round(heap / 2**20, 1),
+                                "total_mb": round(total / 2**20, 1)}
+        sql, params = (ArticleViewSet.queryset.order_by("-published_at")
+                       [:20].query.sql_with_params())
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+    buffers = re.search(r"Buffers: shared hit=(\d+)(?: read=(\d+))?", plan)
+    return {
+        "tables": sizes,
+        "first_page_buffers": {
+            "hit": int(buffers.group(1)) if buffers else None,
+            "read": int(buffers.group(2) or 0) if buffers else None,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    django.setup()
+
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+    from django.urls import reverse
+    from benchmarks.report import emit
+    from benchmarks.seed import seed
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    results, extra = [], {}
+    try:
+        started = time.perf_counter()
+        seed(articles=args.articles)
+        extra["seed_seconds"] = round(time.perf_counter() - started, 1)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM ANALYZE")
+
+        dummy = {"default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        client = Client()
+        url = reverse("article-list")
+        with override_settings(CACHES=dummy):
+            client.get(url)  # warm up
+            for name, params in REQUESTS:
+                results.append({
+                    "name": name,
+                    **_time_request(client, url, params, args.repeat),
+                })
+        if connection.vendor == "postgresql":
+            extra["postgres"] = _postgres_stats(connection)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    emit("list", results, output=args.output, articles=args.articles,
+         database=connection.vendor, **extra)
+
+
+if __name__ == "__main__":
+    main()
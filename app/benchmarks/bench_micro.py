@@ -0,0 +1,114 @@
+"""
+Micro-benchmarks of the hot helpers behind ingest and the API.
+
+Seeds a throwaway test database with `benchmarks.seed`, then times
+keyword tagging (`_guess_topics`), the offline summary
+(`_fallback_summary`), the serializers over a page of preloaded rows,
+and the article filters evaluated for one page. Prints per-operation
+timings as JSON.
+
+    python -m benchmarks.bench_micro --articles 2000
+"""
+import argparse
+import os
+import statistics
+import timeit
+
+import django
+
+
+def _time(name: str, func, repeat: int, items: int = 1) -> dict:
+    """Time `func` (which handles `items` operations) like timeit."""
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    per_op = [run / loops / items
+              for run in timer.repeat(repeat=repeat, number=loops)]
+    return {
+        "name": name,
+        "loops": loops,
+        "per_op_us": round(min(per_op) * 1e6, 2),
+        "median_us": round(statistics.median(per_op) * 1e6, 2),
+        "ops_per_sec": round(1 / min(per_op), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+    from core.filters import ArticleFilter
+    from core.models import Article, Summary, Topic
+    from core.serializers import (ArticleListSerializer, ArticleSerializer,
+                                  ArticleSummarySerializer)
+    from core.services.summarizer import _fallback_summary
+    from core.services.tagger import _guess_topics
+    from benchmarks.report import emit
+    from benchmarks.seed import seed
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    results = []
+    try:
+        seed(articles=args.articles)
+        texts = [f"{title}\n{content}" for title, content in
+                 Article.objects.values_list("title", "body__content")[:200]]
+        page = list(
+            Article.objects
+            .select_related("source", "summary", "body")
+            .prefetch_related("topics")
+            .order_by("-published_at")[:20]
+        )
+        summaries = list(Summary.objects.order_by("article_id")[:100])
+        topic_ids = ",".join(
+            str(pk) for pk in Topic.objects.values_list("pk", flat=True)[:2]
+        )
+
+        results.append(_time(
+            "tagger._guess_topics",
+            lambda: [_guess_topics(t) for t in texts],
+            args.repeat, items=len(texts)))
+        results.append(_time(
+            "summarizer._fallback_summary",
+            lambda: [_fallback_summary(t) for t in texts],
+            args.repeat, items=len(texts)))
+        results.append(_time(
+            "ArticleSerializer (page of 20)",
+            lambda: ArticleSerializer(page, many=True).data,
+            args.repeat))
+        results.append(_time(
+            "ArticleListSerializer (page of 20)",
+            lambda: ArticleListSerializer(page, many=True).data,
+            args.repeat))
+        results.append(_time(
+            "ArticleSummarySerializer (100 rows)",
+            lambda: ArticleSummarySerializer(summaries, many=True).data,
+            args.repeat))
+        for label, params in [
+            ("none", {}),
+            ("topic_slugs", {"topic_slugs": "ai,python"}),
+            ("topic_ids", {"topic_ids": topic_ids}),
+            ("collapse_duplicates", {"collapse_duplicates": "true"}),
+        ]:
+            def query(params=params):
+                qs = ArticleFilter(params, queryset=Article.objects.all()).qs
+                return list(qs.order_by("-published_at")[:20])
+            results.append(_time(f"ArticleFilter ({label}, one page)",
+                                 query, args.repeat))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    emit("micro", results, output=args.output, articles=args.articles)
+
+
+if __name__ == "__main__":
+    main()
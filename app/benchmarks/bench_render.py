@@ -0,0 +1,102 @@
+"""
+JSON rendering and compression benchmark.
+
+Seeds a throwaway test database with `benchmarks.seed`, serializes a
+list page (`ArticleListSerializer`) and a page of full articles with
+their bodies (`ArticleSerializer`), then reports:
+
+- rendering throughput of DRF's JSONRenderer and of ORJSONRenderer
+  (pages and MB per second);
+- bytes on the wire per page: raw, gzip and (when installed) brotli,
+  with the time it takes to compress them.
+
+    python -m benchmarks.bench_render --articles 2000
+"""
+import argparse
+import os
+import statistics
+import timeit
+
+import django
+
+
+def _time(func, repeat: int) -> float:
+    """Best time of one call of `func`, in seconds (like timeit)."""
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    return min(run / loops for run in timer.repeat(repeat=repeat,
+                                                   number=loops))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+    from rest_framework.renderers import JSONRenderer
+    from core import compression
+    from core.models import Article
+    from core.renderers import ORJSONRenderer
+    from core.serializers import ArticleListSerializer, ArticleSerializer
+    from benchmarks.report import emit
+    from benchmarks.seed import seed
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    results = []
+    try:
+        seed(articles=args.articles)
+        rows = list(
+            Article.objects
+            .select_related("source", "summary", "body")
+            .prefetch_related("topics")
+            .order_by("-published_at")[:args.page_size]
+        )
+        pages = {
+            "list page": {"results": ArticleListSerializer(rows,
+                                                           many=True).data},
+            "full articles": {"results": ArticleSerializer(rows,
+                                                           many=True).data},
+        }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    encodings = ["gzip"] + (["br"] if compression.brotli else [])
+    for name, data in pages.items():
+        raw = ORJSONRenderer().render(data)
+        for renderer in (JSONRenderer(), ORJSONRenderer()):
+            seconds = _time(lambda: renderer.render(data), args.repeat)
+            results.append({
+                "name": f"render {name} ({type(renderer).__name__})",
+                "per_op_us": round(seconds * 1e6, 2),
+                "ops_per_sec": round(1 / seconds, 1),
+                "mb_per_sec": round(len(raw) / seconds / 2**20, 1),
+            })
+        sizes = {"raw_bytes": len(raw)}
+        for encoding in encodings:
+            encoded = compression.encode(raw, encoding)
+            seconds = _time(lambda: compression.encode(raw, encoding),
+                            args.repeat)
+            sizes[f"{encoding}_bytes"] = len(encoded)
+            sizes[f"{encoding}_ratio"] = round(len(raw) / len(encoded), 2)
+            sizes[f"{encoding}_us"] = round(seconds * 1e6, 1)
+        results.append({"name": f"wire size {name}", **sizes})
+
+    emit("render", results, output=args.output, articles=args.articles,
+         page_size=args.page_size,
+         median_body_bytes=statistics.median(
+             len(r["content"]) for r in pages["full articles"]["results"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare two saved results of the same benchmark.
+
+Rows are matched on their non-metric fields (e.g. `stack` and
+`concurrency`, or `name`). A metric counts as regressed when it got
+worse by more than `--threshold` (relative): latencies and durations
+should go down, throughputs should go up. Prints the comparison as
+JSON and exits with status 1 if anything regressed.
+
+    python -m benchmarks.compare baseline.json current.json
+"""
+import argparse
+import json
+import sys
+
+LOWER_IS_BETTER = ("_ms", "_us", "seconds", "_mib")
+HIGHER_IS_BETTER = ("rps", "_per_sec")
+# Counters that describe a run but do not identify its row.
+COUNTERS = ("errors", "requests", "created", "connections_opened", "loops")
+
+
+def _direction(metric: str) -> int:
+    """Returns -1 if lower is better, 1 if higher is better, else 0."""
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    if metric.endswith(HIGHER_IS_BETTER):
+        return 1
+    return 0
+
+
+def _key(row: dict) -> tuple:
+    return tuple(sorted(
+        (k, v) for k, v in row.items()
+        if not _direction(k) and not isinstance(v, (dict, list))
+        and k not in COUNTERS
+    ))
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """Returns one entry per metric present in both documents."""
+    before = {_key(row): row for row in baseline["results"]}
+    changes = []
+    for row in current["results"]:
+        old = before.get(_key(row))
+        if old is None:
+            continue
+        for metric, value in row.items():
+            direction = _direction(metric)
+            if not direction or not old.get(metric) or value is None:
+                continue
+            change = (value - old[metric]) / old[metric]
+            changes.append({
+                **dict(_key(row)),
+                "metric": metric,
+                "baseline": old[metric],
+                "current": value,
+                "change": round(change, 3),
+                "regressed": change * direction < -threshold,
+            })
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    if baseline["benchmark"] != current["benchmark"]:
+        sys.exit("Results are from different benchmarks.")
+
+    changes = compare(baseline, current, args.threshold)
+    regressions = [c for c in changes if c["regressed"]]
+    json.dump({
+        "benchmark": current["benchmark"],
+        "baseline_revision": baseline.get("revision", ""),
+        "current_revision": current.get("revision", ""),
+        "regressions": regressions,
+        "changes": changes,
+    }, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Local HTTP server that serves generated NewsAPI-style responses.
+
+Used by the benchmarks so ingest can be measured without network
+access or API quota. Bodies are generated on the fly and streamed, so
+the server itself stays small even for very large pages.
+"""
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BODY_WORDS = (
+    "markets policy software research energy cloud security python "
+    "election climate bank rates inflation startup funding court ruling "
+    "league season vaccine hospital trial launch satellite network outage "
+    "chip factory supply shipping port strike union budget minister "
+    "parliament data breach model training open source release update"
+).split()
+
+
+def fake_item(n: int, content_size: int = 2000) -> dict:
+    rng = random.Random(n)
+    words = " ".join(rng.choice(BODY_WORDS)
+                     for _ in range(content_size // 7))
+    return {
+        "source": {"id": None, "name": f"Source {n % 25}"},
+        "author": f"Author {n % 100}",
+        "title": f"Benchmark story {n}",
+        "description": f"Description of story {n}.",
+        "url": f"https://source-{n % 25}.example.com/story-{n}",
+        "publishedAt": "2025-11-10T08:00:00Z",
+        "content": f"Story {n}. {words}"[:content_size],
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    content_size = 2000
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page_size = int(query.get("pageSize", ["50"])[0])
+        page = int(query.get("page", ["1"])[0])
+        first = (page - 1) * page_size
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(b'{"status": "ok", "totalResults": %d, '
+                         b'"articles": [' % (first + page_size))
+        for i in range(page_size):
+            if i:
+                self.wfile.write(b",")
+            item = fake_item(first + i, self.content_size)
+            self.wfile.write(json.dumps(item).encode())
+        self.wfile.write(b"]}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Context manager running the fixture server in a thread."""
+
+    def __init__(self, content_size: int = 2000):
+        handler = type("Handler", (_Handler,),
+                       {"content_size": content_size})
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.url = "http://127.0.0.1:%d/v2/everything" % (
+            self.httpd.server_address[1]
+        )
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever,
+                         daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
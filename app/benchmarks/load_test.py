@@ -0,0 +1,180 @@
+"""
+Load test against a running server.
+
+Replays a request mix against the API: a JSON Lines file with one
+request per line,
+
+    {"name": "list by topic", "path": "/articles/",
+     "params": {"topic_slugs": "ai"}, "weight": 15}
+
+where `{id}` / `{ids}` in the path or params are replaced by one / five
+random article ids (discovered from the first page of the article
+list). Requests are drawn by weight and sent `--concurrency` at a time.
+Prints the achieved requests per second and latency percentiles,
+overall and per request, as JSON.
+
+Run the server with THROTTLE_ENABLED=False (or rates well above the
+load): otherwise the rate limits answer most requests with a cheap 429
+and the figures measure the throttle, not the API. The result counts
+429s under "throttled" and other 4xx responses under "client_errors",
+and a warning is printed when any request was throttled.
+
+    python -m benchmarks.load_test --url http://localhost:8000 \\
+        --mix benchmarks/mixes/articles.jsonl --concurrency 64 \\
+        --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+
+DEFAULT_MIX = [
+    {"path": "/articles/"},
+    {"path": "/articles/{id}/"},
+    {"path": "/articles/{id}/summary/"},
+    {"path": "/summaries/", "params": {"article_ids": "{ids}"}},
+]
+
+
+def load_mix(path: str) -> list[dict]:
+    """Read a request mix from a JSON Lines file."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _name(entry: dict) -> str:
+    if entry.get("name"):
+        return entry["name"]
+    params = "&".join(f"{k}={v}" for k, v in entry.get("params", {}).items())
+    return entry["path"] + (f"?{params}" if params else "")
+
+
+def _percentiles(latencies: list[float]) -> dict:
+    latencies = sorted(latencies)
+    if not latencies:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+
+    def pick(q):
+        return round(latencies[min(len(latencies) - 1,
+                                   int(len(latencies) * q))] * 1000, 1)
+    return {
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+    }
+
+
+async def run_load(base_url: str, mix: list[dict], ids: list[int],
+                   concurrency: int, total: int, seed: int = 0) -> dict:
+    """
+    Send `total` GET requests drawn from the mix, `concurrency` at a
+    time. Responses with a 5xx status or transport errors count as
+    errors, 429 responses as throttled and other 4xx responses as
+    client errors.
+
+    Returns:
+        dict: Throughput, error, client error and throttled counts,
+        latency percentiles and a per-request breakdown under
+        "endpoints".
+    """
+    import httpx
+
+    rng = random.Random(seed)
+    weights = [entry.get("weight", 1) for entry in mix]
+    latencies = {_name(entry): [] for entry in mix}
+    counts = {name: {"errors": 0, "client_errors": 0, "throttled": 0}
+              for name in latencies}
+    remaining = iter(range(total))
+
+    def fill(value: str) -> str:
+        return value.format(
+            id=rng.choice(ids),
+            ids=",".join(str(i) for i in rng.sample(ids, min(5, len(ids)))),
+        )
+
+    def outcome(status: int) -> str | None:
+        if status == 429:
+            return "throttled"
+        if status >= 500:
+            return "errors"
+        if status >= 400:
+            return "client_errors"
+        return None
+
+    async def worker(client):
+        for _ in remaining:
+            entry = rng.choices(mix, weights)[0]
+            params = {k: fill(v) for k, v in entry.get("params", {}).items()}
+            started = time.perf_counter()
+            try:
+                res = await client.get(base_url + fill(entry["path"]),
+                                       params=params)
+                kind = outcome(res.status_code)
+            except httpx.HTTPError:
+                kind = "errors"
+            latencies[_name(entry)].append(time.perf_counter() - started)
+            if kind:
+                counts[_name(entry)][kind] += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        **{kind: sum(c[kind] for c in counts.values())
+           for kind in ("errors", "client_errors", "throttled")},
+        "rps": round(total / elapsed, 1),
+        **_percentiles([t for ts in latencies.values() for t in ts]),
+        "endpoints": [
+            {"endpoint": name, "requests": len(ts), **counts[name],
+             **_percentiles(ts)}
+            for name, ts in latencies.items()
+        ],
+    }
+
+
+def _discover_ids(base_url: str) -> list[int]:
+    import httpx
+
+    res = httpx.get(f"{base_url}/articles/", timeout=30)
+    res.raise_for_status()
+    return [row["id"] for row in res.json()["results"]]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--mix", help="JSON Lines request mix")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    from benchmarks.report import emit
+
+    base_url = args.url.rstrip("/")
+    mix = load_mix(args.mix) if args.mix else DEFAULT_MIX
+    ids = _discover_ids(base_url)
+    if not ids:
+        sys.exit("No articles found; seed some with benchmarks.seed first.")
+    result = asyncio.run(run_load(base_url, mix, ids, args.concurrency,
+                                  args.requests, seed=args.seed))
+    if result["throttled"]:
+        print(f"warning: {result['throttled']} of {result['requests']} "
+              "requests were throttled (429); run the server with "
+              "THROTTLE_ENABLED=False", file=sys.stderr)
+    endpoints = result.pop("endpoints")
+    emit("load_test", [{"endpoint": "all", **result}, *endpoints],
+         output=args.output, url=base_url, mix=args.mix or "default")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+JSON output shared by the benchmarks.
+
+Every result document carries the benchmark name, a UTC timestamp, the
+git revision and the Python/Django versions, so results saved from
+different releases can be compared with `benchmarks.compare`.
+"""
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+            text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def emit(benchmark: str, results: list[dict], output: str | None = None,
+         **extra) -> dict:
+    """Print (or write to `output`) a benchmark result document."""
+    import django
+
+    document = {
+        "benchmark": benchmark,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        **extra,
+        "results": results,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return document
@@ -0,0 +1,156 @@
+"""
+Data generator for the benchmarks.
+
+Seeds sources, topics, articles and summaries with realistic text
+sizes: article bodies follow a log-normal length distribution (median
+around 3 KB, capped at 20 KB), mention topic keywords so keyword tagging
+finds something, and about a tenth of the articles are near-duplicates
+of an earlier one. The same `--seed` always produces the same data.
+
+    python -m benchmarks.seed --articles 10000
+
+seeds the configured database; the other benchmarks call `seed()` on
+their throwaway test database.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import timedelta
+
+import django
+
+WORDS = (
+    "markets policy software research energy cloud security python "
+    "election climate bank rates inflation startup funding court ruling "
+    "league season vaccine hospital trial launch satellite network outage "
+    "chip factory supply shipping port strike union budget minister "
+    "parliament data breach model training open source release update "
+    "the a of to in and for on with as by from that is was will said"
+).split()
+KEYWORDS = ("ai", "machine learning", "python", "django", "kubernetes",
+            "aws", "ransomware", "postgres", "api", "cloud")
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 22))]
+    if rng.random() < 0.15:
+        words.insert(rng.randrange(len(words)), rng.choice(KEYWORDS))
+    return " ".join(words).capitalize() + "."
+
+
+def _body(rng: random.Random) -> str:
+    size = min(20000, max(300, int(rng.lognormvariate(8.0, 0.6))))
+    sentences, length = [], 0
+    while length < size:
+        sentence = _sentence(rng)
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(sentences)
+
+
+def seed(articles: int = 1000, sources: int = 25,
+         summary_ratio: float = 0.8, duplicate_ratio: float = 0.1,
+         seed: int = 0, batch_size: int = 500) -> dict:
+    """
+    Seed the database with generated data.
+
+    Returns:
+        dict: Number of rows created per model.
+    """
+    from django.db import transaction
+    from django.utils import timezone
+    from core.models import Article, Source, Summary, Topic
+    from core.services.summarizer import _fallback_summary
+    from core.services.tagger import TOPIC_KEYWORDS, _guess_topics
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    topics = {
+        name: Topic.objects.get_or_create(name=name)[0]
+        for name in TOPIC_KEYWORDS
+    }
+    source_rows = [
+        Source.objects.get_or_create(
+            name=f"Bench Source {i}",
+            defaults={"homepage": f"https://source-{i}.example.com"},
+        )[0]
+        for i in range(sources)
+    ]
+    Through = Article.topics.through
+    counts = {"articles": 0, "summaries": 0, "article_topics": 0}
+    previous, cluster_id = None, None
+
+    for start in range(0, articles, batch_size):
+        rows, duplicates = [], []
+        for n in range(start, min(articles, start + batch_size)):
+            duplicate = previous is not None and rng.random() < duplicate_ratio
+            if duplicate:
+                content = previous.content + " " + _sentence(rng)
+            else:
+                content = _body(rng)
+            duplicates.append(duplicate)
+            source = rng.choice(source_rows)
+            rows.append(Article(
+                source=source,
+                title=" ".join(rng.choice(WORDS)
+                               for _ in range(rng.randint(6, 12)))
+                .capitalize(),
+                url=f"{source.homepage}/{seed}/story-{n}",
+                published_at=now - timedelta(
+                    minutes=rng.randint(0, 60 * 24 * 30)),
+                author=f"Author {rng.randint(1, 300)}",
+                content=content,
+                tagged_at=now,
+            ))
+            previous = rows[-1]
+
+        with transaction.atomic():
+            created = Article.objects.bulk_create(rows)
+            for article, duplicate in zip(created, duplicates):
+                article.cluster_id = (cluster_id if duplicate
+                                      else article.pk)
+                cluster_id = article.cluster_id
+            Article.objects.bulk_update(created, ["cluster_id"])
+
+            links = [
+                Through(article_id=a.pk, topic_id=topics[name].pk)
+                for a in created
+                for name in _guess_topics(f"{a.title}\n{a.content}")[:5]
+            ]
+            Through.objects.bulk_create(links)
+            summarized = [a for a in created if rng.random() < summary_ratio]
+            Summary.objects.bulk_create(
+                Summary(article=a, text=_fallback_summary(a.content))
+                for a in summarized
+            )
+            Article.objects.filter(
+                pk__in=[a.pk for a in summarized]
+            ).update(summarized_at=now)
+
+        counts["articles"] += len(created)
+        counts["summaries"] += len(summarized)
+        counts["article_topics"] += len(links)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--sources", type=int, default=25)
+    parser.add_argument("--summary-ratio", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    django.setup()
+
+    counts = seed(articles=args.articles, sources=args.sources,
+                  summary_ratio=args.summary_ratio, seed=args.seed)
+    json.dump({"seeded": counts}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
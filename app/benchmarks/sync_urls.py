@@ -0,0 +1,28 @@
+"""
+URLconf serving the article detail endpoint through a sync DRF viewset,
+as it was before the read endpoints became async views. Used as the
+baseline of `bench_async`.
+"""
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+from core.models import Article
+from core.serializers import ArticleSerializer
+
+
+class SyncArticleViewSet(ReadOnlyModelViewSet):
+    queryset = (
+        Article.objects
+        .select_related("source", "summary")
+        .prefetch_related("topics")
+    )
+    serializer_class = ArticleSerializer
+
+
+router = DefaultRouter()
+router.register("articles", SyncArticleViewSet, basename="article")
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
@@ -1,7 +1,8 @@
 from django.contrib import admin
-from .models import Source, Topic, Article, Summary
+from .models import Source, Topic, Article, Summary, Job
 
 admin.site.register(Source)
 admin.site.register(Topic)
 admin.site.register(Article)
 admin.site.register(Summary)
+admin.site.register(Job)
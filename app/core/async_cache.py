@@ -0,0 +1,65 @@
+"""
+Non-blocking access to the default cache for async views.
+
+Django's `cache.aget` / `cache.aset` run the sync backend in a thread.
+With the django-redis backend under an ASGI server, this module talks
+to Redis through a native asyncio client instead (one per event loop),
+using the backend's key format and serializer, so values stay
+interchangeable with the sync `django.core.cache.cache`. Under WSGI each
+async view runs in an event loop of its own, where a client would open
+a connection per request, so it uses Django's API like other backends.
+"""
+import asyncio
+import weakref
+
+from django.core.cache import cache, caches
+
+_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+# Set by app.asgi once the ASGI application is loaded.
+ASGI = False
+
+
+def _uses_redis() -> bool:
+    # `cache` is a proxy; the backend class is the one of the alias.
+    return (ASGI and type(caches["default"]).__module__
+            .startswith("django_redis"))
+
+
+def _client():
+    """Returns the asyncio Redis client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        from redis import asyncio as aioredis
+        backend = caches["default"].client
+        options = backend._options
+        # django-redis splits LOCATION into its servers; the first one
+        # takes the writes, like the sync client's.
+        client = aioredis.Redis.from_url(
+            backend._server[0],
+            password=options.get("PASSWORD"),
+            socket_connect_timeout=options.get("SOCKET_CONNECT_TIMEOUT"),
+            socket_timeout=options.get("SOCKET_TIMEOUT"),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def aget(key: str, default=None):
+    """Fetch a value from the cache without blocking the event loop."""
+    if not _uses_redis():
+        return await cache.aget(key, default)
+    value = await _client().get(cache.client.make_key(key))
+    if value is None:
+        return default
+    return cache.client.decode(value)
+
+
+async def aset(key: str, value, timeout: int) -> None:
+    """Store a value in the cache for `timeout` seconds."""
+    if not _uses_redis():
+        await cache.aset(key, value, timeout)
+        return
+    await _client().set(cache.client.make_key(key),
+                        cache.client.encode(value), ex=timeout)
@@ -0,0 +1,297 @@
+"""
+Caching helpers for views.
+
+`cache_page` is Django's page cache with stampede protection. A cached
+response is fresh for `timeout` seconds (the soft TTL) and kept until
+`hard_timeout` (the hard TTL). Only the request holding the page's
+lock recomputes it; the lock is a `cache.add` key (SET NX with an
+expiry on Redis), so a crashed worker only holds it for
+`lock_timeout` seconds. Meanwhile:
+
+- when a stale copy exists, the other requests get it (stale while
+  revalidate);
+- when nothing is cached yet, they wait up to `lock_timeout` seconds
+  for the first response to be stored (single flight), then compute
+  the page themselves; if the holder releases the lock without storing
+  a copy, one of them takes it over at once.
+
+Locks are per variant of the page (its Vary headers), like the copies.
+
+The page cache also keeps access statistics: how often each parameter
+combination of a cached page was requested, in hourly buckets
+(`record_access`, `hot_pages`). The cache warmer
+(core.services.cache_warming) refreshes the most requested ones.
+"""
+import hashlib
+import json
+import time
+import uuid
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+
+from django.middleware.cache import CacheMiddleware
+from django.utils.cache import (
+    get_cache_key,
+    has_vary_header,
+    learn_cache_key,
+    patch_response_headers,
+    patch_vary_headers,
+)
+from django.utils.decorators import decorator_from_middleware_with_args
+
+from core import compression, metrics
+
+# How often a request waiting for the first copy of a page polls for it.
+LOCK_POLL_INTERVAL = 0.05
+
+STATS_KEY = "page_stats"
+# Request headers the cached pages vary on (besides Cookie), recorded
+# with each combination so warmed copies match the clients' cache keys.
+STATS_HEADERS = ("Accept", "Accept-Encoding")
+# Combinations kept per hourly bucket when the backend is not Redis.
+STATS_MAX_ENTRIES = 1000
+
+
+def _uses_redis(cache) -> bool:
+    # A backend from `caches`: the class of the `cache` proxy is
+    # ConnectionProxy whatever the backend.
+    return type(cache).__module__.startswith("django_redis")
+
+
+def _stats_bucket(hour: int) -> str:
+    return f"{STATS_KEY}:{hour}"
+
+
+def record_access(cache, request) -> None:
+    """
+    Count a request for a cached page under its parameter combination:
+    scheme, host, path, the query without `page`, and the STATS_HEADERS
+    the client sent. `cache` is the page cache's backend (from
+    `caches`), as for `hot_pages`.
+    """
+    query = [(k, v) for k, v in parse_qsl(request.META.get("QUERY_STRING", ""),
+                                          keep_blank_values=True)
+             if k != "page"]
+    headers = {name: request.headers[name] for name in STATS_HEADERS
+               if name in request.headers}
+    member = json.dumps([request.scheme, request.get_host(),
+                         request.path_info, urlencode(query), headers],
+                        sort_keys=True)
+    hour = int(time.time() // 3600)
+    ttl = (settings.CACHE_STATS_WINDOW_HOURS + 1) * 3600
+    if _uses_redis(cache):
+        key = cache.client.make_key(_stats_bucket(hour))
+        pipe = cache.client.get_client(write=True).pipeline()
+        pipe.zincrby(key, 1, member)
+        pipe.expire(key, ttl)
+        pipe.execute()
+        return
+    counts = cache.get(_stats_bucket(hour), {})
+    if member in counts or len(counts) < STATS_MAX_ENTRIES:
+        counts[member] = counts.get(member, 0) + 1
+        cache.set(_stats_bucket(hour), counts, ttl)
+
+
+def hot_pages(cache, limit: int) -> list[dict]:
+    """
+    Returns the `limit` most requested parameter combinations over the
+    last CACHE_STATS_WINDOW_HOURS, most requested first.
+
+    Returns:
+        list[dict]: `scheme`, `host`, `path`, `query`, `headers` and
+        `hits` of each combination.
+    """
+    hour = int(time.time() // 3600)
+    buckets = [_stats_bucket(hour - i)
+               for i in range(settings.CACHE_STATS_WINDOW_HOURS)]
+    totals: dict[str, float] = {}
+    if _uses_redis(cache):
+        pipe = cache.client.get_client(write=False).pipeline()
+        # Only the top of each bucket is summed: an approximation that
+        # keeps the lookup cheap.
+        for bucket in buckets:
+            pipe.zrevrange(cache.client.make_key(bucket), 0, 4 * limit - 1,
+                           withscores=True)
+        counts = [{m.decode(): s for m, s in rows}
+                  for rows in pipe.execute()]
+    else:
+        counts = cache.get_many(buckets).values()
+    for bucket in counts:
+        for member, hits in bucket.items():
+            totals[member] = totals.get(member, 0) + hits
+    top = sorted(totals.items(), key=lambda item: -item[1])[:limit]
+    return [
+        dict(zip(("scheme", "host", "path", "query", "headers"),
+                 json.loads(member)), hits=int(hits))
+        for member, hits in top
+    ]
+
+
+class _InstrumentedCacheMiddleware(CacheMiddleware):
+    """
+    CacheMiddleware with soft and hard TTLs, a recompute lock and hit,
+    stale and miss counts.
+    """
+
+    def __init__(self, get_response, hard_timeout=None, lock_timeout=10,
+                 **kwargs):
+        super().__init__(get_response, **kwargs)
+        self.hard_timeout = max(hard_timeout or 0, self.page_timeout)
+        self.lock_timeout = lock_timeout
+
+    def _lock_key(self, request) -> str:
+        # One lock per cached variant: the key of the copy when the
+        # page's Vary headers are known, else the URL with the headers
+        # pages usually vary on.
+        variant = get_cache_key(request, self.key_prefix, "GET",
+                                cache=self.cache)
+        if variant is None:
+            variant = "\n".join([
+                request.build_absolute_uri(),
+                *(request.headers.get(name, "")
+                  for name in (*STATS_HEADERS, "Cookie")),
+            ])
+        digest = hashlib.md5(variant.encode()).hexdigest()
+        return f"page_lock.{self.key_prefix}.{request.method}.{digest}"
+
+    def _acquire(self, request) -> bool:
+        key, token = self._lock_key(request), uuid.uuid4().hex
+        if self.cache.add(key, token, self.lock_timeout):
+            # Released under the same key, even if the Vary headers are
+            # learned meanwhile.
+            request._cache_lock = (key, token)
+            return True
+        return False
+
+    def _release(self, request) -> None:
+        lock = getattr(request, "_cache_lock", None)
+        if lock is None:
+            return
+        request._cache_lock = None
+        key, token = lock
+        # Leave a lock that expired and was taken over by another request.
+        if self.cache.get(key) == token:
+            self.cache.delete(key)
+
+    def _cached(self, request):
+        cache_key = get_cache_key(request, self.key_prefix, "GET",
+                                  cache=self.cache)
+        if cache_key is None:
+            return None
+        return self.cache.get(cache_key)
+
+    def _wait_for_first_copy(self, request):
+        """
+        Wait for the lock holder to store the page. Returns the copy, or
+        None once this request may compute the page itself: the holder
+        released the lock without storing anything (an error or a
+        response that is not cached) and this request took it over, or
+        `lock_timeout` passed.
+        """
+        key = self._lock_key(request)
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            response = self._cached(request)
+            if response is not None:
+                return response
+            if self.cache.get(key) is None and self._acquire(request):
+                # The copy may have been stored just before the release.
+                response = self._cached(request)
+                if response is not None:
+                    self._release(request)
+                return response
+        return None
+
+    def _count(self, result: str) -> None:
+        metrics.CACHE_REQUESTS.labels("page", result).inc()
+
+    def _miss(self, request) -> None:
+        self._count("miss")
+        request._cache_update_cache = True
+        # Read by the throttle (core.throttling.response_cost), which
+        # gets the Django request when this runs on a DRF Request.
+        getattr(request, "_request", request)._cache_miss = True
+
+    def process_request(self, request):
+        if request.method not in ("GET", "HEAD"):
+            request._cache_update_cache = False
+            return None
+        if getattr(request, "_cache_refresh", False):
+            # Set by the cache warmer: recompute whatever is cached.
+            self._acquire(request)
+            request._cache_update_cache = True
+            return None
+        if not request.headers.get("Cookie"):
+            # Only anonymous pages are shared, so only they are warmed.
+            record_access(self.cache, request)
+
+        response = self._cached(request)
+        if response is None:
+            if not self._acquire(request):
+                response = self._wait_for_first_copy(request)
+            if response is None:
+                self._miss(request)
+                return None
+        elif time.time() >= getattr(response, "_cache_fresh_until", 0):
+            if self._acquire(request):
+                self._miss(request)
+                return None
+            self._count("stale")
+            request._cache_update_cache = False
+            return response
+
+        self._count("hit")
+        request._cache_update_cache = False
+        return response
+
+    def process_response(self, request, response):
+        if (not self._should_update_cache(request, response)
+                or response.streaming
+                or response.status_code != 200
+                or "private" in response.get("Cache-Control", ())
+                or (not request.COOKIES and response.cookies
+                    and has_vary_header(response, "Cookie"))):
+            self._release(request)
+            return response
+
+        # Clients and proxies see the soft TTL only.
+        patch_response_headers(response, self.page_timeout)
+        if settings.COMPRESSION_ENABLED:
+            # Pages are stored compressed, once per encoding.
+            patch_vary_headers(response, ("Accept-Encoding",))
+        cache_key = learn_cache_key(request, response, self.hard_timeout,
+                                    self.key_prefix, cache=self.cache)
+        fresh_until = time.time() + self.page_timeout
+
+        def store(r):
+            compression.compress(request, r)
+            r._cache_fresh_until = fresh_until
+            self.cache.set(cache_key, r, self.hard_timeout)
+            self._release(request)
+
+        if hasattr(response, "render") and callable(response.render):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        return response
+
+    def process_exception(self, request, exception):
+        self._release(request)
+        return None
+
+
+def cache_page(timeout, *, hard_timeout=None, lock_timeout=10, cache=None,
+               key_prefix=None):
+    """
+    Django's `cache_page` with stampede protection and metrics.
+
+    `timeout` is the soft TTL: once it has passed, one request refreshes
+    the page while the others are served the stale copy, until
+    `hard_timeout` (defaults to `timeout`, i.e. no stale copies).
+    """
+    return decorator_from_middleware_with_args(_InstrumentedCacheMiddleware)(
+        page_timeout=timeout, hard_timeout=hard_timeout,
+        lock_timeout=lock_timeout, cache_alias=cache, key_prefix=key_prefix,
+    )
@@ -0,0 +1,69 @@
+"""
+Response compression (brotli or gzip).
+
+`compress` encodes a response for the client's Accept-Encoding, so it
+can be applied once before a response is cached (core.cache) and the
+cached copy is served as is. CompressionMiddleware applies it to every
+other response. Bodies under COMPRESSION_MIN_SIZE bytes, streaming and
+already-encoded responses and non-text content types are left alone.
+brotli is optional: without it, only gzip is offered.
+"""
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+_accepts_br = re.compile(r"\bbr\b")
+_accepts_gzip = re.compile(r"\bgzip\b")
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Returns the encoding to use for an Accept-Encoding header."""
+    if brotli is not None and _accepts_br.search(accept_encoding):
+        return "br"
+    if _accepts_gzip.search(accept_encoding):
+        return "gzip"
+    return None
+
+
+def encode(content: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress(request, response):
+    """Compress a rendered response in place if the client accepts it."""
+    if (not settings.COMPRESSION_ENABLED
+            or response.streaming
+            or response.has_header("Content-Encoding")
+            or not response.get("Content-Type", "").startswith(
+                COMPRESSIBLE_TYPES)):
+        return response
+    patch_vary_headers(response, ("Accept-Encoding",))
+    if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+        return response
+    encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+    if encoding is None:
+        return response
+
+    compressed = encode(response.content, encoding)
+    if len(compressed) >= len(response.content):
+        return response
+    response.content = compressed
+    response["Content-Length"] = str(len(compressed))
+    response["Content-Encoding"] = encoding
+    # The compressed body is a different representation.
+    if response.has_header("ETag") and not response["ETag"].startswith("W/"):
+        response["ETag"] = "W/" + response["ETag"]
+    return response
@@ -0,0 +1,127 @@
+"""
+Read-replica routing.
+
+Writes and migrations always go to the primary (`default`). Reads go to
+a replica only inside views marked with `use_replica`, and only while
+the client is not pinned to the primary:
+
+- a request that writes is pinned for the rest of the request, and its
+  response sets the `DB_PIN_COOKIE` cookie, which pins the client's
+  next requests for DB_REPLICA_STICKY_SECONDS, so it reads its own
+  writes despite the replication lag;
+- everything outside a request (the pipeline, management commands,
+  the shell) reads from the primary.
+
+core.middleware.ReplicaRoutingMiddleware keeps the per-request state
+(`request_route`). Without any replica in DATABASE_REPLICAS the router
+always returns the primary.
+"""
+import functools
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+
+DB_PIN_COOKIE = "db_pin"
+
+
+@dataclass
+class _RequestRoute:
+    replica: str | None
+    pinned: bool
+    enabled: bool = False
+    wrote: bool = False
+
+
+# The state is a mutable object rather than plain values, so a write
+# made in a sync_to_async thread (which runs in a copy of the context)
+# is still seen by the middleware.
+_route: ContextVar[_RequestRoute | None] = ContextVar("db_route",
+                                                      default=None)
+
+
+def _replicas() -> list[str]:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def use_replica(view):
+    """
+    Let a read-only view (sync or async) read from a replica.
+    """
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper(*args, **kwargs):
+            _enable()
+            return await view(*args, **kwargs)
+    else:
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            _enable()
+            return view(*args, **kwargs)
+    return wrapper
+
+
+def _enable() -> None:
+    state = _route.get()
+    if state is not None:
+        state.enabled = True
+
+
+class ReplicaRouter:
+    """Send replica-enabled reads to the request's replica."""
+
+    def db_for_read(self, model, **hints):
+        state = _route.get()
+        if (state is None or not state.enabled or state.pinned
+                or state.wrote or state.replica is None):
+            return "default"
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _route.get()
+        if state is not None:
+            state.wrote = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+@contextmanager
+def request_route(request):
+    """
+    Route the reads of a request: picks its replica and whether the
+    client is pinned to the primary.
+
+    Yields:
+        The request's routing state, for `pin_after_write`.
+    """
+    replicas = _replicas()
+    # One replica per request, so all of its reads see the same data.
+    state = _RequestRoute(
+        replica=random.choice(replicas) if replicas else None,
+        pinned=DB_PIN_COOKIE in request.COOKIES,
+    )
+    token = _route.set(state)
+    try:
+        yield state
+    finally:
+        _route.reset(token)
+
+
+def pin_after_write(state: _RequestRoute, response):
+    """Pin the client to the primary if its request wrote."""
+    if state.wrote and state.replica is not None:
+        response.set_cookie(
+            DB_PIN_COOKIE, "1",
+            max_age=settings.DB_REPLICA_STICKY_SECONDS,
+            httponly=True, samesite="Lax",
+        )
+    return response
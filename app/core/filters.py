@@ -3,16 +3,18 @@ Filters for the Article model.
 """
 
 import django_filters as df
+from django.db.models import Exists, OuterRef
 from .models import Article
 
 
 class ArticleFilter(df.FilterSet):
     topic_ids = df.CharFilter(method="filter_topics_by_ids")
     topic_slugs = df.CharFilter(method="filter_topics_by_slugs")
+    collapse_duplicates = df.BooleanFilter(method="filter_collapse_duplicates")
 
     class Meta:
         model = Article
-        fields = ["topic_ids", "topic_slugs"]
+        fields = ["topic_ids", "topic_slugs", "collapse_duplicates"]
 
     def filter_topics_by_ids(self, queryset, name, value):
         try:
@@ -21,10 +23,32 @@ class ArticleFilter(df.FilterSet):
             return queryset.none()
         if not ids:
             return queryset
-        return queryset.filter(topics__id__in=ids).distinct()
+        return self._with_topics(queryset, topic_id__in=ids)
 
     def filter_topics_by_slugs(self, queryset, name, value):
         slugs = [v.strip().lower() for v in value.split(",") if v.strip()]
         if not slugs:
             return queryset
-        return queryset.filter(topics__slug__in=slugs).distinct()
+        return self._with_topics(queryset, topic__slug__in=slugs)
+
+    @staticmethod
+    def _with_topics(queryset, **lookups):
+        # A semi-join rather than a join: an article with several of the
+        # topics stays one row, so the page needs no DISTINCT over rows
+        # that include the joined body.
+        links = Article.topics.through.objects.filter(
+            article_id=OuterRef("pk"), **lookups)
+        return queryset.filter(Exists(links))
+
+    def filter_collapse_duplicates(self, queryset, name, value):
+        if not value:
+            return queryset
+        # Keep one article per near-duplicate cluster among the rows the
+        # other filters (declared before this one) let through: the
+        # oldest one, i.e. the cluster's root when it matches and still
+        # exists. Unclustered articles stand on their own. NOT EXISTS
+        # probes the cluster_id index row by row, so a page still stops
+        # after LIMIT rows instead of ranking the whole table.
+        older_match = queryset.filter(cluster_id=OuterRef("cluster_id"),
+                                      id__lt=OuterRef("id"))
+        return queryset.filter(~Exists(older_match))
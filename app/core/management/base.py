@@ -0,0 +1,152 @@
+"""
+Shared instrumentation for long-running management commands.
+
+`InstrumentedCommand` adds to every subclass:
+
+- progress lines on stderr every `--progress-interval` seconds, with
+  the throughput, the ETA when the total is known, and the time spent
+  per phase (see core.services.timing);
+- `--summary-json PATH` ("-" for stdout): a JSON summary at exit;
+- `--profile PATH`: a cProfile of the command's main thread.
+
+Subclasses report work with `self.progress.advance(n)` and may put the
+figures of their final message in `self.result`.
+"""
+import cProfile
+import json
+import time
+from typing import Callable
+
+from django.core.management.base import BaseCommand
+
+from core.services import timing
+
+
+class Progress:
+    """Throughput and ETA of a command, reported at a fixed interval."""
+
+    def __init__(self, write: Callable[[str], None], label: str, unit: str,
+                 interval: float, timer: timing.Timer | None = None):
+        self.write = write
+        self.label = label
+        self.unit = unit
+        self.interval = interval
+        self.timer = timer
+        self.done = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+        self._total: int | Callable[[], int] | None = None
+
+    def set_total(self, total: int | Callable[[], int] | None) -> None:
+        """
+        Set the expected number of items. A callable (e.g. a count
+        query) is only called once a progress line is due.
+        """
+        self._total = total
+
+    @property
+    def total(self) -> int | None:
+        if callable(self._total):
+            self._total = self._total()
+        return self._total
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def advance(self, n: int = 1) -> None:
+        self.done += n
+        now = time.monotonic()
+        if self.interval > 0 and now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> None:
+        rate = self.rate
+        total = self.total
+        if total:
+            line = (f"[{self.label}] {self.done}/{total} {self.unit} "
+                    f"({100 * self.done / total:.0f}%), {rate:.1f}/s")
+            if rate > 0:
+                line += f", ETA {max(0, total - self.done) / rate:.0f}s"
+        else:
+            line = f"[{self.label}] {self.done} {self.unit}, {rate:.1f}/s"
+        if self.timer is not None:
+            phases = ", ".join(
+                f"{name} {p['seconds']:.1f}s"
+                for name, p in self.timer.snapshot().items()
+            )
+            if phases:
+                line += f" ({phases})"
+        self.write(line)
+
+
+class InstrumentedCommand(BaseCommand):
+    """BaseCommand with progress, phase timing and profiling options."""
+    unit = "items"
+
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        parser.add_argument(
+            "--progress-interval",
+            type=float,
+            default=10.0,
+            help="Seconds between progress lines on stderr (0 disables)"
+            )
+        parser.add_argument(
+            "--summary-json",
+            metavar="PATH",
+            help="Write a JSON summary of the run to PATH ('-' for stdout)"
+            )
+        parser.add_argument(
+            "--profile",
+            metavar="PATH",
+            help="Write a cProfile of the run to PATH"
+            )
+        return parser
+
+    def execute(self, *args, **options):
+        self.result = {}
+        profiler = cProfile.Profile() if options.get("profile") else None
+        with timing.timer() as timer:
+            self.progress = Progress(
+                lambda line: self.stderr.write(line), self._name(), self.unit,
+                options.get("progress_interval", 10.0), timer,
+            )
+            if profiler is not None:
+                profiler.enable()
+            try:
+                return super().execute(*args, **options)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                    profiler.dump_stats(options["profile"])
+                if options.get("summary_json"):
+                    self._write_summary(options["summary_json"], timer)
+
+    def _name(self) -> str:
+        return self.__module__.rsplit(".", 1)[-1]
+
+    def summary(self, timer: timing.Timer) -> dict:
+        return {
+            "command": self._name(),
+            "unit": self.unit,
+            "items": self.progress.done,
+            "elapsed_seconds": round(self.progress.elapsed, 3),
+            "items_per_second": round(self.progress.rate, 2),
+            "phases": timer.snapshot(),
+            "result": self.result,
+        }
+
+    def _write_summary(self, path: str, timer: timing.Timer) -> None:
+        text = json.dumps(self.summary(timer))
+        if path == "-":
+            self.stdout.write(text)
+        else:
+            with open(path, "w") as f:
+                f.write(text + "\n")
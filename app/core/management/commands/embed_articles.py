@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from core.models import ArticleEmbedding
+from core.services.embeddings import build_index, embed_pending
+
+
+class Command(BaseCommand):
+    help = ("Embed articles without an embedding and rebuild the "
+            "related-articles index.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-embed all articles (default: only those without one)"
+            )
+
+    def handle(self, *args, **opts):
+        if opts["all"]:
+            ArticleEmbedding.objects.all().delete()
+
+        embedded = embed_pending(batch_size=opts["batch_size"])
+        indexed = build_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"Embedded {embedded} article(s); indexed {indexed} vector(s)."
+        ))
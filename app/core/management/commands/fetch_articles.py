@@ -1,25 +1,52 @@
-from django.core.management.base import BaseCommand
-from core.services.ingest import fetch_and_store_articles, NewsApiError
+from core.management.base import InstrumentedCommand
+from core.services.ingest import build_adapters, ingest_sources, SourceError
 from django.core.management.base import CommandError
 
 
-class Command(BaseCommand):
-    help = "Fetch articles from NewsAPI and upsert them by URL."
+class Command(InstrumentedCommand):
+    help = ("Fetch articles from NewsAPI and RSS/Atom feeds "
+            "and upsert them by URL.")
+    unit = "articles"
 
     def add_arguments(self, parser):
         parser.add_argument("--q", default="technology")
         parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--pages", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--sources",
+            default="newsapi",
+            help="Comma-separated sources to poll: newsapi, feeds"
+            )
+        parser.add_argument(
+            "--feed",
+            action="append",
+            default=[],
+            help="Extra RSS/Atom feed URL (repeatable)"
+            )
 
     def handle(self, *args, **opts):
-        q = opts["q"]
-        page_size = opts["page_size"]
+        sources = [s.strip() for s in opts["sources"].split(",") if s.strip()]
         try:
-            created, updated = fetch_and_store_articles(
-                keyword=q,
-                page_size=page_size
+            adapters = build_adapters(
+                sources,
+                keyword=opts["q"],
+                page_size=opts["page_size"],
+                pages=opts["pages"],
+                extra_feeds=opts["feed"]
                 )
-        except NewsApiError as exc:
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        try:
+            created, updated = ingest_sources(
+                adapters,
+                batch_size=opts["batch_size"],
+                on_batch=self.progress.advance,
+                )
+        except SourceError as exc:
             raise CommandError("Failed to fetch or store articles.") from exc
+        self.result = {"created": created, "updated": updated}
         self.stdout.write(self.style.SUCCESS(
             f"Created: {created}, Updated: {updated}"
             ))
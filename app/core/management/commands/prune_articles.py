@@ -0,0 +1,67 @@
+import gzip
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+from core.management.base import InstrumentedCommand
+from core.services.retention import cutoff_for, expired, prune_articles
+
+
+class Command(InstrumentedCommand):
+    help = ("Delete articles older than the retention window in small "
+            "batches, optionally archiving them first.")
+    unit = "articles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ARTICLE_RETENTION_DAYS,
+            help="Keep articles published in the last DAYS days "
+                 "(default: ARTICLE_RETENTION_DAYS)"
+            )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--archive",
+            metavar="PATH",
+            help="Append the deleted articles to PATH as JSON lines "
+                 "(gzipped if PATH ends with .gz)"
+            )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the articles that would be deleted"
+            )
+
+    def handle(self, *args, **opts):
+        if not opts["days"] or opts["days"] < 1:
+            raise CommandError(
+                "Set --days or ARTICLE_RETENTION_DAYS to a positive number.")
+        cutoff = cutoff_for(opts["days"])
+        if opts["dry_run"]:
+            count = expired(cutoff).count()
+            self.result = {"expired": count, "cutoff": cutoff.isoformat()}
+            self.stdout.write(
+                f"{count} article(s) published before {cutoff:%Y-%m-%d} "
+                "would be deleted.")
+            return
+
+        self.progress.set_total(expired(cutoff).count)
+        archive = None
+        if opts["archive"]:
+            path = opts["archive"]
+            archive = (gzip.open(path, "at", encoding="utf-8")
+                       if path.endswith(".gz")
+                       else open(path, "a", encoding="utf-8"))
+        try:
+            deleted = prune_articles(cutoff, batch_size=opts["batch_size"],
+                                     archive=archive,
+                                     on_batch=self.progress.advance)
+        finally:
+            if archive is not None:
+                archive.close()
+        self.result = {"deleted": deleted, "cutoff": cutoff.isoformat()}
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} article(s) published before "
+            f"{cutoff:%Y-%m-%d}."
+        ))
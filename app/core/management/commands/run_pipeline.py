@@ -0,0 +1,150 @@
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.services import jobs
+from core.services.pipeline import (
+    CHANGES_LISTS,
+    FETCH,
+    PRUNE,
+    UPGRADE,
+    WARM,
+    is_queued,
+)
+
+
+class Command(BaseCommand):
+    help = ("Run the background pipeline: fetch articles periodically and "
+            "work through queued tag, summarize and embed jobs, then warm "
+            "the page cache. Fallback summaries are upgraded periodically.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument(
+            "--fetch-interval",
+            type=int,
+            default=6 * 60 * 60,
+            help="Seconds between fetch jobs (0 disables fetching)"
+            )
+        parser.add_argument(
+            "--prune-interval",
+            type=int,
+            default=24 * 60 * 60,
+            help="Seconds between prune jobs when ARTICLE_RETENTION_DAYS "
+                 "is set (0 disables pruning)"
+            )
+        parser.add_argument(
+            "--upgrade-interval",
+            type=int,
+            default=15 * 60,
+            help="Seconds between jobs upgrading fallback summaries once "
+                 "the LLM is available (0 disables upgrades)"
+            )
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for more"
+            )
+        parser.add_argument("--q", default="technology")
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--sources", default="newsapi")
+
+    def _handle_signal(self, signum, frame):
+        self.stdout.write("Stopping after running jobs finish...")
+        self.stopping = True
+
+    def _run(self, job):
+        started = time.monotonic()
+        ok = jobs.run(job)
+        elapsed = time.monotonic() - started
+        status = "ok" if ok else f"failed (attempt {job.attempts})"
+        self.stdout.write(f"[pipeline] {job.kind} #{job.pk} {status} "
+                          f"in {elapsed:.2f}s")
+        return ok
+
+    def _run_in_thread(self, job):
+        # Worker threads hold their own connections; recycle them like
+        # Django does around each request.
+        close_old_connections()
+        try:
+            return self._run(job)
+        finally:
+            close_old_connections()
+
+    def handle(self, *args, **opts):
+        self.stopping = False
+        previous = {
+            sig: signal.signal(sig, self._handle_signal)
+            for sig in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            processed = self._loop(opts)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+        self.stdout.write(self.style.SUCCESS(
+            f"Pipeline stopped; processed {processed} job(s)."
+        ))
+
+    def _loop(self, opts):
+        concurrency = max(1, opts["concurrency"])
+        fetch_payload = {
+            "sources": [s.strip() for s in opts["sources"].split(",")
+                        if s.strip()],
+            "keyword": opts["q"],
+            "page_size": opts["page_size"],
+        }
+        next_fetch = next_prune = next_upgrade = time.monotonic()
+        prune_interval = (opts["prune_interval"]
+                          if settings.ARTICLE_RETENTION_DAYS else 0)
+        processed = 0
+        running = set()
+        # Set when a job changed the article lists; the page cache is
+        # warmed once the queue is idle again.
+        stale_lists = False
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while not self.stopping:
+                if not opts["once"]:
+                    close_old_connections()
+                if opts["fetch_interval"] and time.monotonic() >= next_fetch:
+                    if not is_queued(FETCH):
+                        jobs.enqueue(FETCH, fetch_payload)
+                    next_fetch = time.monotonic() + opts["fetch_interval"]
+                if prune_interval and time.monotonic() >= next_prune:
+                    if not is_queued(PRUNE):
+                        jobs.enqueue(
+                            PRUNE, {"days": settings.ARTICLE_RETENTION_DAYS})
+                    next_prune = time.monotonic() + prune_interval
+                if (opts["upgrade_interval"]
+                        and time.monotonic() >= next_upgrade):
+                    if not is_queued(UPGRADE):
+                        jobs.enqueue(UPGRADE)
+                    next_upgrade = time.monotonic() + opts["upgrade_interval"]
+
+                running = {f for f in running if not f.done()}
+                free = concurrency - len(running)
+                claimed = jobs.claim(free) if free else []
+                for job in claimed:
+                    processed += 1
+                    stale_lists = stale_lists or job.kind in CHANGES_LISTS
+                    if concurrency == 1:
+                        self._run(job)
+                    else:
+                        running.add(pool.submit(self._run_in_thread, job))
+
+                if not claimed and not running and stale_lists:
+                    if not is_queued(WARM):
+                        jobs.enqueue(WARM)
+                    stale_lists = False
+                    continue
+                if not claimed:
+                    if opts["once"] and not running:
+                        break
+                    time.sleep(opts["poll_interval"])
+        return processed
@@ -1,35 +1,41 @@
-from django.core.management.base import BaseCommand
-from core.models import Article, Summary
-from core.services.summarizer import summarize_text
+from core.management.base import InstrumentedCommand
+from core.models import Article
+from core.services import timing
+from core.services.summarizer import claim_articles, summarize_claimed
 import os
 
 MODEL_NAME = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Create Summaries for articles."
+    unit = "articles"
 
     def add_arguments(self, parser):
         parser.add_argument("--limit", type=int, default=5)
 
     def handle(self, *args, **opts):
-        qs = (
-            Article.objects
-            .filter(summary__isnull=True)
-            .only("id", "content")[:opts["limit"]]
-            )
-
         count = 0
-        for art in qs:
-            content = (art.content or "").strip()
-            if not content:
+        reused = 0
+        pending = Article.objects.filter(summarized_at__isnull=True)
+        self.progress.set_total(lambda: min(
+            opts["limit"], pending.count() + self.progress.done))
+        for _ in range(opts["limit"]):
+            # Claimed articles are marked in a short transaction, so no
+            # row lock or transaction is held across the LLM call.
+            with timing.phase("claim"):
+                claimed = claim_articles(pending, 1)
+            if not claimed:
+                break
+            outcome, = summarize_claimed(claimed)
+            self.progress.advance()
+            if outcome is None:
                 continue
-            txt = summarize_text(content)
-            Summary.objects.get_or_create(
-                article=art,
-                defaults={"text": txt, "model_name": MODEL_NAME},
-            )
             count += 1
+            reused += outcome == "reused"
+        self.result = {"summarized": count, "reused": reused,
+                       "model": MODEL_NAME}
         self.stdout.write(self.style.SUCCESS(
-            f"Summarized {count} article(s) using model '{MODEL_NAME}'."
+            f"Summarized {count} article(s) using model '{MODEL_NAME}' "
+            f"({reused} reused from near-duplicates)."
         ))
@@ -1,34 +1,61 @@
-from django.core.management.base import BaseCommand
+from itertools import islice
+
+from django.db import transaction
+from core.management.base import InstrumentedCommand
 from core.models import Article
-from core.services.tagger import tag_article
+from core.services import timing
+from core.services.tagger import tag_articles
 
 
-class Command(BaseCommand):
+class Command(InstrumentedCommand):
     help = "Auto-assign topics to articles based on simple keyword matching."
+    unit = "articles"
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--all",
             action="store_true",
-            help="Retag all articles (default: only those without topics)"
+            help="Retag all articles (default: only those not yet tagged)"
             )
+        parser.add_argument("--batch-size", type=int, default=100)
 
     def handle(self, *args, **opts):
-        if opts["all"]:
-            qs = Article.objects.only("id", "title", "content")
-        else:
-            qs = (
-                Article.objects.
-                filter(topics__isnull=True).
-                only("id", "title", "content")
-                )
-
         total = 0
         attached = 0
-        for a in qs.iterator():
-            total += 1
-            attached += tag_article(a)
+        if opts["all"]:
+            qs = (Article.objects.select_related("body")
+                  .only("id", "title", "body__content").order_by("pk"))
+            self.progress.set_total(qs.count)
+            rows = qs.iterator(chunk_size=opts["batch_size"])
+            while batch := list(islice(rows, opts["batch_size"])):
+                total += len(batch)
+                attached += tag_articles(batch)
+                self.progress.advance(len(batch))
+        else:
+            pending = Article.objects.filter(tagged_at__isnull=True)
+            self.progress.set_total(
+                lambda: pending.count() + self.progress.done)
+            # Claim pending rows with SKIP LOCKED so several workers can
+            # tag concurrently without processing the same article.
+            while True:
+                with transaction.atomic():
+                    with timing.phase("claim"):
+                        batch = list(
+                            pending
+                            .select_for_update(skip_locked=True, of=("self",))
+                            .select_related("body")
+                            .only("id", "title", "body__content")
+                            [:opts["batch_size"]]
+                            )
+                    if not batch:
+                        break
+                    total += len(batch)
+                    attached += tag_articles(batch)
+                self.progress.advance(len(batch))
+                if len(batch) < opts["batch_size"]:
+                    break
 
+        self.result = {"processed": total, "attached": attached}
         self.stdout.write(self.style.SUCCESS(
             f"Processed {total} article(s); attached {attached} topic(s)."
         ))
@@ -0,0 +1,31 @@
+from django.conf import settings
+
+from core.management.base import InstrumentedCommand
+from core.services.cache_warming import warm_pages
+
+
+class Command(InstrumentedCommand):
+    help = ("Recompute the cached first pages of the most requested "
+            "article list queries.")
+    unit = "pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--combinations",
+            type=int,
+            default=settings.CACHE_WARM_COMBINATIONS,
+            help="Number of parameter combinations to warm "
+                 "(default: CACHE_WARM_COMBINATIONS)"
+            )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=settings.CACHE_WARM_PAGES,
+            help="Pages to warm per combination (default: CACHE_WARM_PAGES)"
+            )
+
+    def handle(self, *args, **opts):
+        warmed = warm_pages(opts["combinations"], opts["pages"],
+                            on_page=self.progress.advance)
+        self.result = {"pages": warmed}
+        self.stdout.write(self.style.SUCCESS(f"Warmed {warmed} page(s)."))
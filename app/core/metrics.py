@@ -0,0 +1,122 @@
+"""
+Prometheus metrics for the API and the background pipeline.
+
+The collectors are process-local `prometheus_client` metrics: updating
+one is a lock-protected addition, cheap enough to leave on for every
+request. When PROMETHEUS_MULTIPROC_DIR is set (gunicorn with several
+workers), each process writes its samples there and `/metrics`
+aggregates them.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Latency buckets from 5 ms to 10 s, for requests and LLM calls alike.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Response cache lookups by cache and result (hit, stale or miss).",
+    ["cache", "result"],
+)
+
+THROTTLED_REQUESTS = Counter(
+    "throttled_requests_total",
+    "Requests rejected by the rate limits, by route.",
+    ["route"],
+)
+
+INGEST_ARTICLES = Counter(
+    "ingest_articles_total",
+    "Articles stored by ingest, by result (created or updated).",
+    ["result"],
+)
+INGEST_DURATION = Histogram(
+    "ingest_duration_seconds",
+    "Duration of an ingest run over all sources.",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800),
+)
+INGEST_BATCH_DURATION = Histogram(
+    "ingest_batch_duration_seconds",
+    "Time spent upserting one batch of articles.",
+    buckets=LATENCY_BUCKETS,
+)
+INGEST_HTTP_REQUESTS = Counter(
+    "ingest_http_requests_total",
+    "Ingest HTTP attempts by provider and result (ok, retry, error or "
+    "circuit_open).",
+    ["provider", "result"],
+)
+INGEST_ERRORS = Counter(
+    "ingest_source_errors_total",
+    "Source adapters that failed during ingest.",
+    ["source"],
+)
+
+ARTICLES_PRUNED = Counter(
+    "retention_articles_pruned_total",
+    "Articles deleted by the retention policy.",
+)
+
+TAGGER_ARTICLES = Counter(
+    "tagger_articles_total",
+    "Articles tagged.",
+)
+TAGGER_TOPICS = Counter(
+    "tagger_topics_total",
+    "Topics attached to articles.",
+)
+TAGGER_BATCH_DURATION = Histogram(
+    "tagger_batch_duration_seconds",
+    "Time spent tagging one batch of articles.",
+    buckets=LATENCY_BUCKETS,
+)
+
+SUMMARIES = Counter(
+    "summarizer_summaries_total",
+    "Summaries created, by source (llm, fallback or reused).",
+    ["source"],
+)
+SUMMARIZER_FALLBACKS = Counter(
+    "summarizer_fallbacks_total",
+    "Summaries that fell back to the extractive summary, by reason "
+    "(no_client, circuit_open, rate_limit, error, rejected or empty).",
+    ["reason"],
+)
+SUMMARIES_UPGRADED = Counter(
+    "summarizer_upgraded_total",
+    "Fallback summaries replaced by LLM summaries.",
+)
+SUMMARIZER_LATENCY = Histogram(
+    "summarizer_llm_duration_seconds",
+    "Latency of LLM summarization calls, failed ones included.",
+    buckets=LATENCY_BUCKETS,
+)
+SUMMARIZER_TOKENS = Counter(
+    "summarizer_tokens_total",
+    "Tokens used by LLM summarization calls, by kind (input or output).",
+    ["kind"],
+)
+
+
+def render() -> tuple[bytes, str]:
+    """Returns the exposition of all metrics and its content type."""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,229 @@
+"""
+Middleware for the news summary API.
+"""
+import random
+import time
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+
+from core import compression, db_router, metrics, profiling, throttling
+from core.views.responses import api_response
+
+
+class MetricsMiddleware:
+    """
+    Record the latency of every request per route (URL name), method
+    and status code. Works for both sync and async views.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, time.perf_counter() - started)
+        return response
+
+    def _observe(self, request, response, seconds):
+        match = request.resolver_match
+        route = (match.url_name or match.route) if match else "unmatched"
+        metrics.REQUEST_LATENCY.labels(
+            request.method, route, str(response.status_code)
+        ).observe(seconds)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip (core.compression). Responses
+    from the page cache are already compressed and pass through.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return compression.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return compression.compress(request, await self.get_response(request))
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route the reads of views marked with `db_router.use_replica` to a
+    replica, and pin clients to the primary for a while after they
+    write (see core.db_router).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with db_router.request_route(request) as route:
+            response = self.get_response(request)
+        return db_router.pin_after_write(route, response)
+
+    async def __acall__(self, request):
+        with db_router.request_route(request) as route:
+            response = await self.get_response(request)
+        return db_router.pin_after_write(route, response)
+
+
+class ThrottleMiddleware:
+    """
+    Sliding-window rate limits per client and route (core.throttling).
+
+    The request is checked and charged 1 before its view runs; throttled
+    requests get a 429 with Retry-After. Responses that missed the page
+    cache are charged their extra cost afterwards. Must come after
+    AuthenticationMiddleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        cost = self._extra_cost(request)
+        if cost:
+            throttling.charge(*request._throttle, cost)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        cost = self._extra_cost(request)
+        if cost:
+            await sync_to_async(throttling.charge)(*request._throttle, cost)
+        return response
+
+    def _extra_cost(self, request) -> int:
+        if getattr(request, "_throttle", None) is None:
+            return 0
+        return throttling.response_cost(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not settings.THROTTLE_ENABLED:
+            return None
+        match = request.resolver_match
+        route = match.url_name or match.route
+        rate = throttling.rate_for(route)
+        if rate is None:
+            return None
+        limit, window = rate
+        ident = throttling.client_ident(request, request.user)
+        allowed, wait = throttling.hit(route, ident, limit, window)
+        if allowed:
+            request._throttle = (route, ident, window)
+            return None
+
+        metrics.THROTTLED_REQUESTS.labels(route).inc()
+        response = api_response(
+            {"detail": "Request was throttled. "
+                       f"Expected available in {wait} seconds."},
+            status=429,
+        )
+        response["Retry-After"] = str(wait)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests on demand and store the profiles (core.profiling).
+
+    Staff users profile a request by sending the `X-Profile: 1` header
+    or the `profile=1` query parameter. A PROFILING_SAMPLE_RATE above
+    0 also profiles that fraction of all requests.
+
+    Must come after AuthenticationMiddleware. For async views, the
+    profile covers the event loop; the ORM work they hand to
+    sync_to_async threads shows up in the SQL timeline only.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _requested(self, request) -> bool:
+        return (request.headers.get("X-Profile") == "1"
+                or request.GET.get("profile") == "1")
+
+    def _sampled(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        user, trigger = None, None
+        if self._requested(request) and request.user.is_staff:
+            user, trigger = request.user, "staff"
+        elif self._sampled():
+            trigger = "sample"
+        if trigger is None:
+            return self.get_response(request)
+
+        with profiling.capture() as captured:
+            response = self.get_response(request)
+        if captured is not None:
+            profiling.save(
+                captured.to_profile(request, response, trigger, user))
+        return response
+
+    async def __acall__(self, request):
+        user, trigger = None, None
+        if self._requested(request):
+            user = await request.auser()
+            if user.is_staff:
+                trigger = "staff"
+            else:
+                user = None
+        if trigger is None and self._sampled():
+            trigger = "sample"
+        if trigger is None:
+            return await self.get_response(request)
+
+        with profiling.capture() as captured:
+            response = await self.get_response(request)
+        if captured is not None:
+            await sync_to_async(profiling.save)(
+                captured.to_profile(request, response, trigger, user))
+        return response
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_article_cluster_id_fingerprints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleEmbedding',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='core.article')),
+                ('vector', models.BinaryField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:44
+
+from django.db import migrations, models
+
+
+def mark_processed(apps, schema_editor):
+    """Mark articles that already went through a stage as processed."""
+    Article = apps.get_model('core', 'Article')
+    Article.objects.filter(topics__isnull=False).update(
+        tagged_at=models.F('created_at'))
+    Article.objects.filter(summary__isnull=False).update(
+        summarized_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='summarized_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='tagged_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('tagged_at__isnull', True)), fields=['published_at'], name='core_article_untagged_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('summarized_at__isnull', True)), fields=['published_at'], name='core_article_unsummarized_idx'),
+        ),
+        migrations.RunPython(mark_processed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_article_stage_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='published_at',
+            field=models.DateTimeField(),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_article_published_at_single_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleBody',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='body', serialize=False, to='core.article')),
+                ('content', models.TextField()),
+            ],
+        ),
+        # Set-based copy: one statement, no rows through Python.
+        migrations.RunSQL(
+            'INSERT INTO core_articlebody (article_id, content) '
+            'SELECT id, content FROM core_article',
+            reverse_sql=(
+                "UPDATE core_article SET content = COALESCE(("
+                "SELECT content FROM core_articlebody "
+                "WHERE core_articlebody.article_id = core_article.id), '')"
+            ),
+        ),
+        # A default lets the reverse migration re-add the column.
+        migrations.AlterField(
+            model_name='article',
+            name='content',
+            field=models.TextField(default=''),
+        ),
+        migrations.RemoveField(
+            model_name='article',
+            name='content',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_article_body'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='summary',
+            index=models.Index(condition=models.Q(('model_name', 'fallback')), fields=['article'], name='core_summary_fallback_idx'),
+        ),
+    ]
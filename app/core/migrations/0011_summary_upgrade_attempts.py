@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_summary_fallback_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summary',
+            name='upgrade_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
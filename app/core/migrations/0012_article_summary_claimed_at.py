@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_summary_upgrade_attempts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='summary_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
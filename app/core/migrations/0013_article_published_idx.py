@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_article_summary_claimed_at'),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name='article',
+            new_name='core_article_published_idx',
+            old_name='core_articl_publish_a6a48c_idx',
+        ),
+    ]
@@ -3,6 +3,7 @@ Core models for the news summary API.
 """
 from django.db import models
 
+from django.utils import timezone
 from django.utils.text import slugify
 
 
@@ -43,31 +44,197 @@ class Topic(TimeStamped):
         return self.name
 
 
+class ArticleQuerySet(models.QuerySet):
+    """
+    Bulk writes that also store the bodies of the articles (see
+    `Article.content`).
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        ArticleBody.store([a for a in objs if a.pk is not None])
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        fields = list(fields)
+        if "content" in fields:
+            fields.remove("content")
+            ArticleBody.store(objs)
+        if not fields:
+            return 0
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+
 class Article(TimeStamped):
-    """Article Object."""
+    """
+    Article Object.
+
+    The body lives in the 1:1 `ArticleBody` table, so that scans and
+    joins over articles read narrow rows. `content` reads it (one query
+    unless the body was loaded with `select_related("body")`, so every
+    queryset that reads `content` for many articles joins it) and
+    writing `content` stores it when the article is saved.
+    """
     title = models.CharField(max_length=255)
     url = models.URLField(max_length=1000, unique=True)
     source = models.ForeignKey(Source, on_delete=models.PROTECT,
                                related_name='articles')
-    published_at = models.DateTimeField(db_index=True)
+    published_at = models.DateTimeField()
     author = models.CharField(max_length=255, blank=True)
-    content = models.TextField(blank=False)
     topics = models.ManyToManyField(Topic, blank=True, related_name='articles')
+    cluster_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    # Per-stage status: NULL means the stage still has to process the
+    # article. The partial indexes keep finding work O(pending).
+    tagged_at = models.DateTimeField(null=True, blank=True)
+    summarized_at = models.DateTimeField(null=True, blank=True)
+    # Set while a worker summarizes the article; an old claim is taken
+    # over (see summarizer.claim_articles).
+    summary_claimed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        indexes = [models.Index(fields=['published_at'])]
+        indexes = [
+            # The list's order, and retention's oldest-first batches
+            # (core.services.retention.expired_batch).
+            models.Index(fields=['published_at'],
+                         name='core_article_published_idx'),
+            models.Index(fields=['published_at'],
+                         name='core_article_untagged_idx',
+                         condition=models.Q(tagged_at__isnull=True)),
+            models.Index(fields=['published_at'],
+                         name='core_article_unsummarized_idx',
+                         condition=models.Q(summarized_at__isnull=True)),
+        ]
         ordering = ['-published_at']
 
+    objects = ArticleQuerySet.as_manager()
+
+    @property
+    def content(self) -> str:
+        if "_content" in self.__dict__:
+            return self._content
+        try:
+            return self.body.content
+        except ArticleBody.DoesNotExist:
+            return ""
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self._content = value
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        ArticleBody.store([self])
+
     def __str__(self):
         return self.title[:120]
 
 
+class ArticleBody(models.Model):
+    """Body text of an article."""
+    article = models.OneToOneField(Article, on_delete=models.CASCADE,
+                                   primary_key=True, related_name='body')
+    content = models.TextField(blank=False)
+
+    @classmethod
+    def store(cls, articles) -> None:
+        """Upsert the pending `content` of saved articles."""
+        pending = [a for a in articles if "_content" in a.__dict__]
+        if not pending:
+            return
+        bodies = [cls(article=a, content=a.__dict__.pop("_content"))
+                  for a in pending]
+        cls.objects.bulk_create(bodies, update_conflicts=True,
+                                unique_fields=["article"],
+                                update_fields=["content"])
+
+
 class Summary(TimeStamped):
     """Summary Object."""
     article = models.OneToOneField(Article, on_delete=models.CASCADE,
                                    related_name='summary')
     text = models.TextField()
     model_name = models.CharField(max_length=255, default='baseline')
+    # Failed LLM attempts to replace a fallback summary.
+    upgrade_attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Extractive summaries waiting to be upgraded by the LLM.
+            models.Index(fields=['article'],
+                         name='core_summary_fallback_idx',
+                         condition=models.Q(model_name='fallback')),
+        ]
 
     def __str__(self):
         return f"Summary of {self.article.title[:120]}"
+
+
+class ArticleFingerprint(models.Model):
+    """MinHash signature of an article, used for near-duplicate checks."""
+    article = models.OneToOneField(Article, on_delete=models.CASCADE,
+                                   primary_key=True,
+                                   related_name='fingerprint')
+    signature = models.BinaryField()
+
+
+class LshBucket(models.Model):
+    """LSH band bucket of an article's MinHash signature."""
+    article = models.ForeignKey(Article, on_delete=models.CASCADE,
+                                related_name='lsh_buckets')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=['band', 'bucket'])]
+
+
+class ArticleEmbedding(models.Model):
+    """Embedding vector of an article, stored as raw float32 bytes."""
+    article = models.OneToOneField(Article, on_delete=models.CASCADE,
+                                   primary_key=True,
+                                   related_name='embedding')
+    vector = models.BinaryField()
+
+
+class FeedState(models.Model):
+    """Conditional-request validators of the last poll of a feed."""
+    url = models.URLField(max_length=1000, unique=True)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=255, blank=True)
+    checked_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.url
+
+
+class Job(TimeStamped):
+    """Background pipeline job, claimed by `run_pipeline` workers."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DEAD = 'dead'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DEAD, 'Dead'),
+    ]
+
+    kind = models.CharField(max_length=32)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES,
+                              default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['run_after'], name='core_job_pending_idx',
+                         condition=models.Q(status='pending')),
+            models.Index(fields=['locked_at'], name='core_job_running_idx',
+                         condition=models.Q(status='running')),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
@@ -1,6 +1,140 @@
+"""
+Pagination for the article list.
+
+An exact `COUNT(*)` over the filtered queryset costs more than
+fetching a page once the table is large. `DefaultPagination` counts
+like this instead:
+
+- on Postgres, the planner's estimate (`reltuples` for the unfiltered
+  table, the `EXPLAIN` row estimate for a filtered query) when it is at
+  least PAGINATION_COUNT_CAP rows;
+- otherwise, an exact count capped at PAGINATION_COUNT_CAP rows
+  (`SELECT COUNT(*) FROM (... LIMIT cap + 1)`), reported as the cap
+  when there are more.
+
+Responses carry `count_is_approximate`. With an approximate count, a
+page is fetched with one extra row to know whether there is a next one,
+and pages past the count are served as long as they have rows.
+"""
+import json
+
+from django.conf import settings
+from django.core.paginator import (
+    EmptyPage,
+    Page,
+    PageNotAnInteger,
+    Paginator,
+)
+from django.db import connections
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+def _planner_estimate(queryset) -> int | None:
+    """Returns the Postgres planner's row estimate for `queryset`."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class "
+                           "WHERE oid = %s::regclass",
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+            # -1 until the table is first vacuumed or analyzed.
+            if row and row[0] >= 0:
+                return row[0]
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(queryset, cap: int) -> tuple[int, bool]:
+    """
+    Count `queryset` without scanning more than `cap` + 1 rows.
+
+    Returns:
+        tuple[int, bool]: The count and whether it is approximate.
+    """
+    estimate = _planner_estimate(queryset)
+    if estimate is not None and estimate >= cap:
+        return estimate, True
+    count = queryset.order_by()[:cap + 1].count()
+    if count > cap:
+        return cap, True
+    return count, False
+
+
+class _ApproximatePage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class ApproximateCountPaginator(Paginator):
+    """Paginator that counts with `estimate_count`."""
+
+    @cached_property
+    def _count(self) -> tuple[int, bool]:
+        return estimate_count(self.object_list,
+                              settings.PAGINATION_COUNT_CAP)
+
+    @property
+    def count(self):
+        return self._count[0]
+
+    @property
+    def approximate(self) -> bool:
+        return self._count[1]
+
+    def validate_number(self, number):
+        if not self.approximate:
+            return super().validate_number(number)
+        # Pages past an approximate count may still have rows.
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        if not self.approximate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return _ApproximatePage(rows[:self.per_page], number, self,
+                                has_next=len(rows) > self.per_page)
 
 
 class DefaultPagination(PageNumberPagination):
     page_size = 20
     max_page_size = 100
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.page.paginator.count,
+            "count_is_approximate": self.page.paginator.approximate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_approximate"] = {
+            "type": "boolean",
+        }
+        return response_schema
@@ -0,0 +1,40 @@
+"""
+Permission classes shared by the views.
+"""
+import hmac
+import ipaddress
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+from rest_framework.throttling import BaseThrottle
+
+
+def _networks(entries):
+    return [ipaddress.ip_network(entry.strip(), strict=False)
+            for entry in entries if entry.strip()]
+
+
+class MetricsAccess(BasePermission):
+    """
+    Lets the Prometheus scraper read /metrics: requests bearing
+    METRICS_TOKEN, or coming from METRICS_ALLOWED_IPS (addresses or
+    CIDR ranges).
+    """
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        if token:
+            header = request.META.get("HTTP_AUTHORIZATION", "")
+            scheme, _, value = header.partition(" ")
+            if scheme.lower() == "bearer" and hmac.compare_digest(
+                    value.strip().encode(), token.encode()):
+                return True
+        # DRF's ident honours REST_FRAMEWORK["NUM_PROXIES"] for
+        # X-Forwarded-For.
+        ident = BaseThrottle().get_ident(request)
+        try:
+            address = ipaddress.ip_address(ident)
+        except ValueError:
+            return False
+        return any(address in network
+                   for network in _networks(settings.METRICS_ALLOWED_IPS))
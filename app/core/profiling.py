@@ -0,0 +1,142 @@
+"""
+Per-request profiles: a cProfile of the request plus its SQL timeline.
+
+`ProfilingMiddleware` (core.middleware) decides which requests to
+profile and calls `capture`; profiles are kept in the default cache
+(Redis in production) so every worker sees them, the newest
+PROFILING_MAX_PROFILES of them for PROFILING_TTL seconds.
+
+SQL is recorded by a wrapper that `install()` adds to every database
+connection. It looks up the active recorder in a context variable, so
+queries that async views run in sync_to_async threads are recorded
+too; for all other requests it costs one context variable lookup.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+INDEX_KEY = "profiles:index"
+STATS_LINES = 60
+
+_queries: ContextVar[list | None] = ContextVar("profiled_queries",
+                                               default=None)
+# cProfile hooks one thread at a time and a second profiler would
+# silently replace the first, so a process profiles one request at once.
+_running = threading.Lock()
+
+
+def _record_query(execute, sql, params, many, context):
+    queries = _queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        queries.append((started, time.perf_counter() - started, sql))
+
+
+def _add_wrapper(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def install() -> None:
+    """Record the queries of profiled requests on every DB connection."""
+    connection_created.connect(_add_wrapper,
+                               dispatch_uid="core.profiling.install")
+
+
+class Capture:
+    """Profiler and SQL timeline of one request."""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.queries = []
+        self.started = 0.0
+        self.duration = 0.0
+
+    def to_profile(self, request, response, trigger: str,
+                   user=None) -> dict:
+        """Returns the stored form of the capture."""
+        out = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(STATS_LINES)
+        match = request.resolver_match
+        return {
+            "id": uuid.uuid4().hex[:12],
+            "captured_at": timezone.now().isoformat(),
+            "method": request.method,
+            "path": request.get_full_path(),
+            "route": (match.url_name or match.route) if match else None,
+            "status": response.status_code,
+            "trigger": trigger,
+            "user": user.get_username() if user is not None else None,
+            "duration_ms": round(self.duration * 1000, 2),
+            "query_count": len(self.queries),
+            "db_ms": round(sum(q[1] for q in self.queries) * 1000, 2),
+            "queries": [
+                {"start_ms": round((start - self.started) * 1000, 2),
+                 "duration_ms": round(seconds * 1000, 2),
+                 "sql": sql}
+                for start, seconds, sql in self.queries
+            ],
+            "stats": out.getvalue(),
+            "pstats": marshal.dumps(stats.stats),
+        }
+
+
+@contextmanager
+def capture():
+    """
+    Profile the block and record its queries.
+
+    Yields None, and profiles nothing, while another request of this
+    process is being profiled.
+    """
+    if not _running.acquire(blocking=False):
+        yield None
+        return
+    result = Capture()
+    token = _queries.set(result.queries)
+    result.started = time.perf_counter()
+    result.profiler.enable()
+    try:
+        yield result
+    finally:
+        result.profiler.disable()
+        result.duration = time.perf_counter() - result.started
+        _queries.reset(token)
+        _running.release()
+
+
+def save(profile: dict) -> None:
+    """Store a profile and add it to the index, dropping the oldest."""
+    timeout = settings.PROFILING_TTL
+    cache.set(f"profiles:{profile['id']}", profile, timeout)
+    summary = {k: v for k, v in profile.items()
+               if k not in ("queries", "stats", "pstats")}
+    # Last writer wins; concurrent saves may drop an index entry, which
+    # is acceptable for a diagnostics feature.
+    index = [summary] + cache.get(INDEX_KEY, [])
+    cache.set(INDEX_KEY, index[:settings.PROFILING_MAX_PROFILES], timeout)
+
+
+def list_profiles() -> list[dict]:
+    """Returns the summaries of the stored profiles, newest first."""
+    return cache.get(INDEX_KEY, [])
+
+
+def get_profile(profile_id: str) -> dict | None:
+    return cache.get(f"profiles:{profile_id}")
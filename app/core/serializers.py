@@ -41,6 +41,15 @@ class SummarySerializer(serializers.ModelSerializer):
         })
 
 
+class ArticleSummarySerializer(SummarySerializer):
+    """Serializer for Summary model, keyed by its article id."""
+    article_id = serializers.IntegerField(read_only=True)
+
+    class Meta(SummarySerializer.Meta):
+        fields = ['article_id', 'text', 'model_name']
+        read_only_fields = ['article_id', 'text', 'model_name']
+
+
 class ArticleSerializer(serializers.ModelSerializer):
     source = SourceSerializer(read_only=True)
     source_id = serializers.PrimaryKeyRelatedField(
@@ -59,6 +68,8 @@ class ArticleSerializer(serializers.ModelSerializer):
     )
 
     summary = SummarySerializer(read_only=True)
+    # Stored in ArticleBody; see Article.content.
+    content = serializers.CharField()
 
     class Meta:
         model = Article
@@ -74,3 +85,11 @@ class ArticleSerializer(serializers.ModelSerializer):
             "content",
         ]
         read_only_fields = ["id", "summary"]
+
+
+class ArticleListSerializer(ArticleSerializer):
+    """ArticleSerializer without the body, for lists of articles."""
+    content = None
+
+    class Meta(ArticleSerializer.Meta):
+        fields = [f for f in ArticleSerializer.Meta.fields if f != "content"]
@@ -0,0 +1,75 @@
+"""
+Warming of the page cache after new articles or summaries land.
+
+The most requested parameter combinations of cached pages (access
+statistics kept by core.cache) are requested again in-process with a
+refresh flag, so the page cache recomputes and stores their first pages
+before a user asks for them. Page 1 is the URL without `page`, and the
+next pages are built like DRF's `next` links.
+"""
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import Resolver404, resolve
+from rest_framework.utils.urls import replace_query_param
+
+from core import cache as page_cache
+
+
+def page_url(path: str, query: str, page: int) -> str:
+    """Returns the URL of a page of a parameter combination."""
+    url = f"{path}?{query}" if query else path
+    return url if page == 1 else replace_query_param(url, "page", page)
+
+
+def warm_page(scheme: str, host: str, url: str, headers: dict) -> int:
+    """
+    Recompute one cached page and store it.
+
+    Returns:
+        int: The response status (404 past the last page).
+    """
+    # django.test is only loaded by the worker that warms the cache.
+    from django.test import RequestFactory
+
+    request = RequestFactory().get(
+        url, secure=scheme == "https",
+        headers={**headers, "Host": host},
+    )
+    request._cache_refresh = True
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return 404
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, "render") and callable(response.render):
+        response.render()
+    return response.status_code
+
+
+def warm_pages(combinations: int | None = None, pages: int | None = None,
+               on_page: Callable[[int], None] | None = None) -> int:
+    """
+    Refresh the first `pages` pages of the `combinations` most requested
+    parameter combinations.
+
+    Returns:
+        int: Number of pages stored.
+    """
+    combinations = combinations or settings.CACHE_WARM_COMBINATIONS
+    pages = pages or settings.CACHE_WARM_PAGES
+    warmed = 0
+    # The backend itself, not the `cache` proxy: on Redis the statistics
+    # are sorted sets that only the Redis branch of hot_pages reads.
+    backend = caches[settings.CACHE_MIDDLEWARE_ALIAS]
+    for hot in page_cache.hot_pages(backend, combinations):
+        for page in range(1, pages + 1):
+            url = page_url(hot["path"], hot["query"], page)
+            if warm_page(hot["scheme"], hot["host"], url,
+                         hot["headers"]) != 200:
+                break
+            warmed += 1
+            if on_page is not None:
+                on_page(1)
+    return warmed
@@ -0,0 +1,86 @@
+"""
+Circuit breakers for calls to external providers.
+
+A circuit is closed (calls go through), open (calls fail at once) or
+half-open (one call probes the provider). It opens once, within a fixed
+window of `window` seconds, at least `threshold` calls failed and they
+are at least `error_rate` of the calls made; it stays open for
+`cooldown` seconds, after which one call at a time may probe the
+provider until one succeeds and closes the circuit.
+
+The state lives in the cache (Redis in production), so every worker
+and process shares the circuit of a provider.
+"""
+import time
+
+from django.core.cache import cache
+
+
+class CircuitBreaker:
+    """
+    Circuit of one provider, kept in the cache.
+
+    Keys: `calls` and `failures` count the calls of the current window;
+    `open` holds the time at which the circuit may be probed, and stays
+    until a call succeeds; `probe` is taken by the call allowed while
+    half-open.
+    """
+
+    def __init__(self, name: str, *, threshold: int, window: int,
+                 cooldown: int, error_rate: float = 0.0):
+        self.name = name
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.error_rate = error_rate
+        base = f"circuit:{name}"
+        self._open = f"{base}:open"
+        self._probe = f"{base}:probe"
+        self._base = base
+
+    def _counter(self, kind: str) -> str:
+        return f"{self._base}:{kind}:{int(time.time() // self.window)}"
+
+    def _incr(self, key: str) -> int:
+        cache.add(key, 0, self.window * 2)
+        return cache.incr(key)
+
+    @property
+    def state(self) -> str:
+        retry_at = cache.get(self._open)
+        if retry_at is None:
+            return "closed"
+        return "open" if time.time() < retry_at else "half-open"
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        return cache.add(self._probe, 1, self.cooldown)
+
+    def _trip(self) -> None:
+        cache.set(self._open, time.time() + self.cooldown, None)
+        cache.delete(self._probe)
+
+    def record_success(self) -> None:
+        if cache.get(self._open) is not None:
+            cache.delete_many([self._open, self._probe,
+                               self._counter("calls"),
+                               self._counter("failures")])
+        elif self.error_rate:
+            self._incr(self._counter("calls"))
+
+    def record_failure(self) -> None:
+        if cache.get(self._open) is not None:
+            # A failed probe (or a late failure): open again.
+            self._trip()
+            return
+        failures = self._incr(self._counter("failures"))
+        calls = (self._incr(self._counter("calls")) if self.error_rate
+                 else failures)
+        if (failures >= self.threshold
+                and failures >= self.error_rate * calls):
+            self._trip()
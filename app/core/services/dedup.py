@@ -0,0 +1,175 @@
+"""
+Service to cluster near-duplicate articles using MinHash and LSH.
+
+Each article gets a MinHash signature over its word shingles. The
+signature is split into bands; articles sharing any band bucket are
+candidate duplicates and are confirmed by comparing signatures.
+"""
+import re
+import struct
+import hashlib
+from collections import defaultdict
+
+import numpy as np
+from django.db.models import Q
+
+from core.models import Article, ArticleFingerprint, LshBucket
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"\w+")
+
+# Coefficients of the hash permutations (a * h + b) mod p. They are kept
+# small enough for a * h + b to fit in uint64 for 32-bit shingle hashes.
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, 1 << 31, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64)
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(),
+                          "little")
+
+
+def _shingles(text: str) -> set[bytes]:
+    """Returns the set of word n-grams of the text."""
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words).encode()} if words else set()
+    return {
+        " ".join(words[i:i + SHINGLE_SIZE]).encode()
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(text: str) -> list[int]:
+    """Returns the MinHash signature of the text."""
+    shingles = _shingles(text)
+    if not shingles:
+        return [_MAX_HASH] * NUM_PERM
+    hashes = np.fromiter((_hash64(s) & _MAX_HASH for s in shingles),
+                         dtype=np.uint64, count=len(shingles))
+    perms = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (perms.min(axis=1) & _MAX_HASH).tolist()
+
+
+def similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimates the Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / NUM_PERM
+
+
+def band_buckets(signature: list[int]) -> list[int]:
+    """Returns one signed 64-bit bucket hash per band of the signature."""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<{ROWS}I", *rows),
+                                 digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def _pack(signature: list[int]) -> bytes:
+    return struct.pack(f"<{NUM_PERM}I", *signature)
+
+
+def _unpack(data: bytes) -> list[int]:
+    return list(struct.unpack(f"<{NUM_PERM}I", bytes(data)))
+
+
+def assign_clusters(items: list[tuple[Article, str]]) -> None:
+    """
+    Fingerprint a batch of articles and attach each one to a
+    near-duplicate cluster, using one candidate query for the batch.
+
+    The cluster id is the id of the first article ingested in the
+    cluster, so an article that matches nothing gets its own id.
+    Articles earlier in the batch count as already ingested.
+    """
+    if not items:
+        return
+    signatures = {a.pk: minhash(text) for a, text in items}
+    buckets = {pk: band_buckets(sig) for pk, sig in signatures.items()}
+    batch_ids = set(signatures)
+
+    # One `band = b AND bucket IN (...)` term per band, so each term is
+    # a range of the (band, bucket) index rather than a table scan.
+    by_band = defaultdict(set)
+    for bs in buckets.values():
+        for band, bucket in enumerate(bs):
+            by_band[band].add(bucket)
+    pairs = Q()
+    for band, values in by_band.items():
+        pairs |= Q(band=band, bucket__in=values)
+
+    # (band, bucket) -> ids of articles already in that bucket
+    index = defaultdict(list)
+    rows = (
+        LshBucket.objects
+        .filter(pairs)
+        .exclude(article_id__in=batch_ids)
+        .values_list("article_id", "band", "bucket")
+    )
+    for article_id, band, bucket in rows:
+        index[band, bucket].append(article_id)
+    stored = {
+        article_id: (_unpack(data), cluster_id)
+        for article_id, data, cluster_id in (
+            ArticleFingerprint.objects
+            .filter(article_id__in={i for ids in index.values()
+                                    for i in ids})
+            .values_list("article_id", "signature", "article__cluster_id")
+        )
+    }
+
+    for article, _ in items:
+        signature = signatures[article.pk]
+        candidates = {
+            candidate_id
+            for band, bucket in enumerate(buckets[article.pk])
+            for candidate_id in index[band, bucket]
+        }
+        best_id, best_score = None, SIMILARITY_THRESHOLD
+        for candidate_id in candidates:
+            score = similarity(signature, stored[candidate_id][0])
+            if score >= best_score:
+                best_id, best_score = candidate_id, score
+        if best_id is None:
+            article.cluster_id = article.pk
+        else:
+            article.cluster_id = stored[best_id][1] or best_id
+
+        stored[article.pk] = (signature, article.cluster_id)
+        for band, bucket in enumerate(buckets[article.pk]):
+            index[band, bucket].append(article.pk)
+
+    articles = [a for a, _ in items]
+    ArticleFingerprint.objects.filter(article_id__in=batch_ids).delete()
+    LshBucket.objects.filter(article_id__in=batch_ids).delete()
+    ArticleFingerprint.objects.bulk_create(
+        ArticleFingerprint(article=a, signature=_pack(signatures[a.pk]))
+        for a in articles
+    )
+    LshBucket.objects.bulk_create(
+        LshBucket(article=a, band=band, bucket=bucket)
+        for a in articles
+        for band, bucket in enumerate(buckets[a.pk])
+    )
+    Article.objects.bulk_update(articles, ["cluster_id"])
+
+
+def assign_cluster(article: Article, text: str) -> int:
+    """
+    Fingerprint an article and attach it to a near-duplicate cluster.
+
+    Returns:
+        int: The cluster id assigned to the article.
+    """
+    assign_clusters([(article, text)])
+    return article.cluster_id
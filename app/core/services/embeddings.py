@@ -0,0 +1,271 @@
+"""
+Service to embed articles and look up semantically related ones.
+
+Articles are embedded as hashed term-frequency vectors (float32). The
+index build weights them by IDF, groups them into inverted lists around
+coarse centroids and writes everything as .npy files that are
+memory-mapped at query time, so a lookup only scans a few lists.
+
+Vectors are streamed from the database into memory-mapped files, so a
+build holds only the ids, one cluster assignment per vector and a
+training sample in memory. Each build goes to its own directory, and
+the `CURRENT` file, replaced atomically once the build is complete,
+names the directory to serve: readers never mix arrays of two builds.
+"""
+import os
+import re
+import json
+import shutil
+import hashlib
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from core.models import Article, ArticleEmbedding
+
+DIM = 256
+MAX_CENTROIDS = 4096
+TRAIN_SAMPLE = 20000
+KMEANS_ITERATIONS = 5
+ASSIGN_CHUNK = 65536
+# Builds kept on disk: the current one and the one before, which
+# workers that have not seen the switch yet may still be opening.
+KEEP_BUILDS = 2
+POINTER = "CURRENT"
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9]+")
+STOPWORDS = frozenset(
+    "the and for that with this from are was were has have had not but "
+    "its his her they their them you your our out who what when where "
+    "which will would can could about into than then there also been "
+    "more said says after over".split()
+)
+
+
+def _index_dir() -> Path:
+    return Path(settings.EMBEDDING_INDEX_DIR)
+
+
+def embed_text(text: str) -> np.ndarray:
+    """Returns the L2-normalized hashed term-frequency vector of text."""
+    vec = np.zeros(DIM, dtype=np.float32)
+    counts = Counter(w for w in _WORD_RE.findall((text or "").lower())
+                     if w not in STOPWORDS)
+    for word, count in counts.items():
+        h = int.from_bytes(
+            hashlib.blake2b(word.encode(), digest_size=8).digest(), "little"
+        )
+        sign = 1.0 if h & 1 else -1.0
+        vec[(h >> 1) % DIM] += sign * (1.0 + np.log(count))
+    return _normalize(vec)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def to_bytes(vec: np.ndarray) -> bytes:
+    return np.asarray(vec, dtype=np.float32).tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(bytes(data), dtype=np.float32)
+
+
+def embed_pending(batch_size: int = 500) -> int:
+    """
+    Embed all articles that have no embedding yet, in batches.
+
+    Returns:
+        int: Number of articles embedded.
+    """
+    embedded = 0
+    while True:
+        batch = list(
+            Article.objects
+            .filter(embedding__isnull=True)
+            .select_related("body")
+            .only("id", "title", "body__content")
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            return embedded
+        ArticleEmbedding.objects.bulk_create([
+            ArticleEmbedding(
+                article=a,
+                vector=to_bytes(embed_text(f"{a.title}\n{a.content}")),
+            )
+            for a in batch
+        ])
+        embedded += len(batch)
+
+
+def _train_centroids(sample: np.ndarray, count: int) -> np.ndarray:
+    """Spherical k-means on a sample of the vectors."""
+    rng = np.random.default_rng(0)
+    centroids = sample[rng.choice(len(sample), count, replace=False)]
+    for _ in range(KMEANS_ITERATIONS):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(count):
+            members = sample[assign == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+        centroids = _normalize(centroids)
+    return centroids
+
+
+def _array(path: Path, shape: tuple[int, int]) -> np.ndarray:
+    """A float32 array of `shape` backed by a new .npy file."""
+    if not shape[0]:
+        # Empty files cannot be memory-mapped.
+        return np.empty(shape, dtype=np.float32)
+    return np.lib.format.open_memmap(path, mode="w+", dtype=np.float32,
+                                     shape=shape)
+
+
+def _switch(root: Path, build: Path) -> None:
+    """Point readers at `build`, then drop the builds before the last ones."""
+    tmp = root / f"{POINTER}.tmp"
+    tmp.write_text(build.name)
+    os.replace(tmp, root / POINTER)
+    builds = sorted(p for p in root.glob("build-*") if p.is_dir())
+    for old in builds[:-KEEP_BUILDS]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def build_index() -> int:
+    """
+    Rebuild the on-disk index from all stored embeddings.
+
+    Returns:
+        int: Number of vectors indexed.
+    """
+    root = _index_dir()
+    build = root / f"build-{time.time_ns()}"
+    build.mkdir(parents=True)
+
+    total = ArticleEmbedding.objects.count()
+    ids = np.empty(total, dtype=np.int64)
+    raw = _array(build / "raw.npy", (total, DIM))
+    df = np.zeros(DIM, dtype=np.int64)
+    rows = ArticleEmbedding.objects.values_list("article_id", "vector")
+    n = 0
+    for article_id, data in rows.iterator(chunk_size=2000):
+        if n == total:
+            break
+        ids[n] = article_id
+        raw[n] = from_bytes(data)
+        df += raw[n] != 0
+        n += 1
+    ids = ids[:n]
+
+    idf = (np.log((n + 1) / (df + 1)) + 1).astype(np.float32)
+    for start in range(0, n, ASSIGN_CHUNK):
+        end = min(n, start + ASSIGN_CHUNK)
+        raw[start:end] = _normalize(raw[start:end] * idf)
+
+    count = max(1, min(MAX_CENTROIDS, int(np.sqrt(n))))
+    if n:
+        rng = np.random.default_rng(0)
+        sample = raw[np.sort(rng.choice(n, min(n, TRAIN_SAMPLE),
+                                        replace=False))]
+        centroids = _train_centroids(sample, min(count, len(sample)))
+    else:
+        centroids = np.zeros((1, DIM), dtype=np.float32)
+
+    assign = np.empty(n, dtype=np.int64)
+    for start in range(0, n, ASSIGN_CHUNK):
+        end = min(n, start + ASSIGN_CHUNK)
+        assign[start:end] = np.argmax(raw[start:end] @ centroids.T, axis=1)
+    order = np.argsort(assign, kind="stable")
+    offsets = np.searchsorted(assign[order],
+                              np.arange(len(centroids) + 1))
+
+    vectors = _array(build / "vectors.npy", (n, DIM))
+    for start in range(0, n, ASSIGN_CHUNK):
+        vectors[start:start + ASSIGN_CHUNK] = raw[
+            order[start:start + ASSIGN_CHUNK]]
+    if isinstance(vectors, np.memmap):
+        vectors.flush()
+    else:
+        np.save(build / "vectors.npy", vectors)
+    del raw, vectors
+    (build / "raw.npy").unlink(missing_ok=True)
+
+    np.save(build / "ids.npy", ids[order])
+    np.save(build / "centroids.npy", centroids.astype(np.float32))
+    np.save(build / "offsets.npy", offsets.astype(np.int64))
+    np.save(build / "idf.npy", idf)
+    (build / "manifest.json").write_text(json.dumps({
+        "count": n, "dim": DIM, "lists": len(centroids)}))
+    _switch(root, build)
+    return n
+
+
+class EmbeddingIndex:
+    """Memory-mapped inverted-file index over article vectors."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        load = {"mmap_mode": "r"}
+        self.ids = np.load(path / "ids.npy", **load)
+        self.vectors = np.load(path / "vectors.npy", **load)
+        self.centroids = np.load(path / "centroids.npy")
+        self.offsets = np.load(path / "offsets.npy")
+        self.idf = np.load(path / "idf.npy")
+
+    def search(self, raw: np.ndarray, k: int = 10, nprobe: int = 8,
+               exclude: int | None = None) -> list[int]:
+        """Returns the ids of the k nearest vectors to a raw embedding."""
+        query = _normalize(raw * self.idf)
+        nprobe = min(nprobe, len(self.centroids))
+        lists = np.argsort(self.centroids @ query)[::-1][:nprobe]
+        ids, scores = [], []
+        for c in lists:
+            start, end = self.offsets[c], self.offsets[c + 1]
+            if start == end:
+                continue
+            ids.append(self.ids[start:end])
+            scores.append(self.vectors[start:end] @ query)
+        if not ids:
+            return []
+        ids, scores = np.concatenate(ids), np.concatenate(scores)
+        if exclude is not None:
+            scores[ids == exclude] = -np.inf
+        top = np.argsort(scores)[::-1][:k]
+        return [int(ids[i]) for i in top if np.isfinite(scores[i])]
+
+
+_index = None
+
+
+def get_index() -> EmbeddingIndex | None:
+    """Returns the current on-disk index, reloading it after a rebuild."""
+    global _index
+    root = _index_dir()
+    try:
+        # Resolved once: every array then comes from the same build.
+        path = root / (root / POINTER).read_text().strip()
+    except FileNotFoundError:
+        return None
+    if _index is None or _index.path != path:
+        _index = EmbeddingIndex(path)
+    return _index
+
+
+def related_article_ids(article_id: int, k: int = 10) -> list[int]:
+    """Returns ids of articles related to the given one, best first."""
+    index = get_index()
+    data = (
+        ArticleEmbedding.objects
+        .filter(article_id=article_id)
+        .values_list("vector", flat=True)
+        .first()
+    )
+    if index is None or data is None:
+        return []
+    return index.search(from_bytes(data), k=k, exclude=article_id)
@@ -0,0 +1,134 @@
+"""
+HTTP client for ingest sources.
+
+All source adapters share one `requests.Session` with a keep-alive
+connection pool, so repeated polls of a provider reuse their TCP and
+TLS connections. `get` adds on top of it:
+
+- short connect and read timeouts (INGEST_HTTP_CONNECT_TIMEOUT,
+  INGEST_HTTP_READ_TIMEOUT) instead of a flat 30 seconds;
+- retries of connection errors, timeouts, 429 and 5xx responses with
+  exponential backoff and full jitter, waiting for `Retry-After` when
+  the provider sends one (a wait longer than INGEST_HTTP_BACKOFF_MAX
+  is not worth holding a worker for: the response is returned as is);
+- a circuit breaker per provider (core.services.circuit). After
+  INGEST_CIRCUIT_THRESHOLD failed calls within INGEST_CIRCUIT_WINDOW
+  seconds, calls fail at once with `CircuitOpenError` for
+  INGEST_CIRCUIT_COOLDOWN seconds; then one call probes the provider
+  and either closes the circuit or opens it again.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from core import metrics
+from core.services.circuit import CircuitBreaker
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Host pools kept by the session, and connections kept per host (one per
+# ingest worker thread).
+POOL_HOSTS = 32
+POOL_SIZE = 8
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of calling a provider whose circuit is open."""
+    pass
+
+
+def session() -> requests.Session:
+    """Returns the process-wide pooled session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                # Retries are done by `get`, which knows about the breaker.
+                adapter = HTTPAdapter(pool_connections=POOL_HOSTS,
+                                      pool_maxsize=POOL_SIZE, max_retries=0)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def breaker_for(provider: str) -> CircuitBreaker:
+    """Returns the circuit breaker of an ingest provider."""
+    return CircuitBreaker(provider,
+                          threshold=settings.INGEST_CIRCUIT_THRESHOLD,
+                          window=settings.INGEST_CIRCUIT_WINDOW,
+                          cooldown=settings.INGEST_CIRCUIT_COOLDOWN)
+
+
+def retry_after(response) -> float | None:
+    """Returns the seconds a response asks to wait (`Retry-After`)."""
+    value = (response.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp()
+                   - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(attempt: int) -> float:
+    """Returns a full-jitter delay before retry number `attempt` + 1."""
+    ceiling = min(settings.INGEST_HTTP_BACKOFF_MAX,
+                  settings.INGEST_HTTP_BACKOFF * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def get(url: str, provider: str, **kwargs) -> requests.Response:
+    """
+    GET `url` through the pooled session with retries and the circuit
+    breaker of `provider`. Keyword arguments go to `Session.get`.
+
+    The last response is returned whatever its status, for the caller
+    to check; it counts as a failure of the provider when it is a 429
+    or 5xx.
+
+    Raises CircuitOpenError while the circuit is open, or the
+    requests.RequestException of the last attempt.
+    """
+    breaker = breaker_for(provider)
+    if not breaker.allow():
+        metrics.INGEST_HTTP_REQUESTS.labels(provider, "circuit_open").inc()
+        raise CircuitOpenError(f"Circuit of {provider} is open.")
+    kwargs.setdefault("timeout", (settings.INGEST_HTTP_CONNECT_TIMEOUT,
+                                  settings.INGEST_HTTP_READ_TIMEOUT))
+    retries = settings.INGEST_HTTP_RETRIES
+    for attempt in range(retries + 1):
+        try:
+            response = session().get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                metrics.INGEST_HTTP_REQUESTS.labels(provider, "error").inc()
+                breaker.record_failure()
+                raise
+            delay = backoff(attempt)
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                metrics.INGEST_HTTP_REQUESTS.labels(provider, "ok").inc()
+                breaker.record_success()
+                return response
+            delay = retry_after(response)
+            if delay is None:
+                delay = backoff(attempt)
+            if attempt == retries or delay > settings.INGEST_HTTP_BACKOFF_MAX:
+                metrics.INGEST_HTTP_REQUESTS.labels(provider, "error").inc()
+                breaker.record_failure()
+                return response
+            response.close()
+        metrics.INGEST_HTTP_REQUESTS.labels(provider, "retry").inc()
+        time.sleep(delay)
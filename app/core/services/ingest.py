@@ -1,27 +1,222 @@
 """
-Service to ingest articles from an external news API.
+Service to ingest articles from external sources.
+
+The ingest path is a generator pipeline: source adapters fetch and
+stream-parse their items concurrently in worker threads, and the
+calling thread upserts the normalized rows in batches. Only a bounded
+queue of rows and one batch are held in memory at a time.
 """
-import os
-import requests
+import queue
+import time
 import logging
-from typing import Tuple
-from urllib.parse import urlparse
-from django.utils.dateparse import parse_datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Tuple
+from django.db import transaction
+from core import metrics
 from core.models import Source, Article
+from core.services import timing
+from core.services.dedup import assign_clusters
+from django.conf import settings
+from core.services.sources import (
+    FeedAdapter,
+    NewsApiAdapter,
+    NewsApiError,
+    SourceAdapter,
+    SourceError,
+)
 
-NEWS_API_KEY = os.environ["NEWS_API_KEY"]
-NEWS_API_URL = "https://newsapi.org/v2/everything"
+ARTICLE_FIELDS = ["title", "source", "published_at", "author", "content"]
+SOURCES = ("newsapi", "feeds")
+MAX_WORKERS = 8
 
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "NewsApiError",
+    "SourceError",
+    "build_adapters",
+    "fetch_and_store_articles",
+    "ingest_sources",
+    "upsert_articles",
+]
+
+_DONE = object()
+
+
+def build_adapters(sources: Iterable[str], keyword: str = "technology",
+                   page_size: int = 50, pages: int = 1,
+                   extra_feeds: Iterable[str] = ()) -> list[SourceAdapter]:
+    """
+    Build adapters for the named sources: "newsapi" and/or "feeds"
+    (the RSS_FEEDS setting). Extra feed URLs are always polled.
+
+    Raises ValueError on an unknown source name.
+    """
+    sources = set(sources)
+    unknown = sources - set(SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(sorted(unknown))}")
+    adapters = []
+    if "newsapi" in sources:
+        adapters.append(NewsApiAdapter(keyword=keyword, page_size=page_size,
+                                       pages=pages))
+    feeds = list(settings.RSS_FEEDS) if "feeds" in sources else []
+    adapters.extend(FeedAdapter(url) for url in feeds + list(extra_feeds))
+    return adapters
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+@timing.phase("db_write")
+@transaction.atomic
+def upsert_articles(rows: list[dict],
+                    on_created: Callable[[list[int]], None] | None = None
+                    ) -> Tuple[int, int]:
+    """
+    Upsert a batch of normalized rows by URL.
+
+    `on_created` is called with the ids of the new articles inside the
+    same transaction, so follow-up work is recorded atomically with them.
+
+    Returns a tuple: (created_count, updated_count).
+    """
+    started = time.perf_counter()
+    rows = list({row["url"]: row for row in rows}.values())
+
+    sources = {
+        s.name: s for s in
+        Source.objects.filter(name__in={row["source_name"] for row in rows})
+    }
+    for row in rows:
+        if row["source_name"] not in sources:
+            sources[row["source_name"]], _ = Source.objects.get_or_create(
+                name=row["source_name"],
+                defaults={"homepage": row["homepage"]}
+                )
 
-class NewsApiError(Exception):
-    """Raised when NewsAPI fetch/parsing fails."""
-    pass
+    existing = Article.objects.in_bulk([row["url"] for row in rows],
+                                       field_name="url")
+    to_create, to_update = [], []
+    for row in rows:
+        article = existing.get(row["url"]) or Article(url=row["url"])
+        article.title = row["title"]
+        article.source = sources[row["source_name"]]
+        article.published_at = row["published_at"]
+        article.author = row["author"]
+        article.content = row["content"]
+        (to_update if article.pk else to_create).append(article)
+
+    Article.objects.bulk_update(to_update, ARTICLE_FIELDS)
+    created = Article.objects.bulk_create(to_create)
+    with timing.phase("dedup"):
+        assign_clusters([(a, f"{a.title}\n{a.content}") for a in created])
+    if on_created is not None and created:
+        on_created([a.pk for a in created])
+
+    metrics.INGEST_ARTICLES.labels("created").inc(len(created))
+    metrics.INGEST_ARTICLES.labels("updated").inc(len(to_update))
+    metrics.INGEST_BATCH_DURATION.observe(time.perf_counter() - started)
+    return len(created), len(to_update)
+
+
+def _put(out: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put an item unless the consumer has stopped; False if it has."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(adapter: SourceAdapter, out: queue.Queue,
+             stop: threading.Event) -> None:
+    try:
+        for row in adapter.fetch():
+            if not _put(out, (adapter, row), stop):
+                return
+    except Exception as exc:
+        _put(out, (adapter, exc), stop)
+        return
+    _put(out, (adapter, _DONE), stop)
+
+
+def ingest_sources(adapters: list[SourceAdapter],
+                   batch_size: int = 100,
+                   on_created: Callable[[list[int]], None] | None = None,
+                   on_batch: Callable[[int], None] | None = None
+                   ) -> Tuple[int, int]:
+    """
+    Poll all adapters concurrently and upsert their rows in batches,
+    and return a tuple: (created_count, updated_count).
+
+    `on_created` is passed through to `upsert_articles` for each batch;
+    `on_batch` is called with the number of rows of each stored batch.
+
+    A failing adapter does not stop the others; once every adapter has
+    finished, the first failure is re-raised.
+    """
+    started = time.perf_counter()
+    for adapter in adapters:
+        adapter.load_state()
+
+    out = queue.Queue(maxsize=batch_size * 2)
+    stop = threading.Event()
+    pending = len(adapters)
+    errors = []
+    created, updated = 0, 0
+    batch = []
+
+    def flush():
+        nonlocal created, updated
+        if batch:
+            c, u = upsert_articles(batch, on_created=on_created)
+            created += c
+            updated += u
+            if on_batch is not None:
+                on_batch(len(batch))
+            batch.clear()
+
+    workers = max(1, min(MAX_WORKERS, len(adapters)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for adapter in adapters:
+            pool.submit(_produce, adapter, out, stop)
+        try:
+            while pending:
+                adapter, item = out.get()
+                if item is _DONE:
+                    pending -= 1
+                    flush()
+                    adapter.save_state()
+                elif isinstance(item, Exception):
+                    pending -= 1
+                    errors.append(item)
+                    metrics.INGEST_ERRORS.labels(adapter.name).inc()
+                else:
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        flush()
+            flush()
+        finally:
+            stop.set()
+
+    metrics.INGEST_DURATION.observe(time.perf_counter() - started)
+    if errors:
+        raise errors[0]
+    return created, updated
 
 
 def fetch_and_store_articles(keyword: str = "technology",
-                             page_size: int = 50) -> Tuple[int, int]:
+                             page_size: int = 50,
+                             pages: int = 1,
+                             batch_size: int = 100) -> Tuple[int, int]:
     """
     Fetch articles from NewsAPI,
     store/update them in the database,
@@ -29,52 +224,6 @@ def fetch_and_store_articles(keyword: str = "technology",
 
     Raises NewsApiError on failure.
     """
-    params = {
-        "q": keyword,
-        "pageSize": page_size,
-        "language": "en",
-        "sortBy": "publishedAt",
-        "apiKey": NEWS_API_KEY,
-    }
-    try:
-        r = requests.get(NEWS_API_URL, params=params, timeout=30)
-        r.raise_for_status()
-        data = r.json()
-    except (requests.RequestException, ValueError) as exc:
-        logger.error("Failed to fetch or parse NewsAPI response.",
-                     exc_info=exc)
-        raise NewsApiError(
-            "Failed to fetch or parse articles from NewsAPI."
-        ) from exc
-    created, updated = 0, 0
-    for item in data.get("articles", []):
-        url = item.get("url")
-        if not url:
-            continue
-        parsed = urlparse(url)
-
-        if parsed.scheme and parsed.netloc:
-            homepage = f"{parsed.scheme}://{parsed.netloc}"
-        else:
-            homepage = ""
-
-        src_name = (item.get("source") or {}).get("name") or "Unknown"
-        source, _ = Source.objects.get_or_create(
-            name=src_name,
-            defaults={"homepage": homepage}
-            )
-
-        defaults = {
-            "title": item.get("title") or "",
-            "source": source,
-            "published_at": parse_datetime(item.get("publishedAt")) or None,
-            "author": item.get("author") or "",
-            "content": item.get("content") or (item.get("description") or ""),
-        }
-        _, was_created = Article.objects.update_or_create(
-            url=url,
-            defaults=defaults
-            )
-        created += 1 if was_created else 0
-        updated += 0 if was_created else 1
-    return created, updated
+    adapter = NewsApiAdapter(keyword=keyword, page_size=page_size,
+                             pages=pages)
+    return ingest_sources([adapter], batch_size=batch_size)
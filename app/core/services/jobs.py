@@ -0,0 +1,164 @@
+"""
+Postgres-backed job queue for the background pipeline.
+
+Jobs are rows in `core_job`. Workers claim due jobs with
+`SELECT ... FOR UPDATE SKIP LOCKED`, so several workers (threads or
+processes) never run the same job. Failed jobs are retried with
+exponential backoff and jitter; after `max_attempts` they are kept as
+dead letters for inspection. Successful jobs are deleted.
+
+A claimed job is leased for LEASE_SECONDS; while it runs, a heartbeat
+thread renews the lease every HEARTBEAT_SECONDS, so only jobs whose
+worker died are claimed again, however long the others take.
+"""
+import random
+import logging
+import threading
+import traceback
+from datetime import timedelta
+from typing import Callable
+
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import Job
+
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+LEASE_SECONDS = 15 * 60
+HEARTBEAT_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+HANDLERS: dict[str, Callable] = {}
+
+
+def register(kind: str):
+    """Decorator registering the handler for a job kind."""
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind: str, payload: dict | None = None, *, delay: float = 0,
+            max_attempts: int = 5) -> Job:
+    """Add a job to the queue."""
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim(limit: int = 1) -> list[Job]:
+    """
+    Claim up to `limit` due jobs and mark them running.
+
+    Running jobs whose lease has expired (their worker died) are
+    claimed again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Job.PENDING, run_after__lte=now)
+                | Q(status=Job.RUNNING,
+                    locked_at__lt=now - timedelta(seconds=LEASE_SECONDS))
+            )
+            .order_by("run_after")[:limit]
+        )
+        ids = [job.pk for job in jobs]
+        Job.objects.filter(pk__in=ids).update(
+            status=Job.RUNNING, locked_at=now, attempts=F("attempts") + 1
+        )
+    for job in jobs:
+        job.status, job.locked_at = Job.RUNNING, now
+        job.attempts += 1
+    return jobs
+
+
+def _retry_delay(attempts: int) -> float:
+    delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def renew_lease(job: Job) -> bool:
+    """
+    Extend the lease of a running job, unless another worker has
+    claimed it since.
+
+    Returns:
+        bool: True if the lease was renewed.
+    """
+    now = timezone.now()
+    renewed = Job.objects.filter(
+        pk=job.pk, status=Job.RUNNING, locked_at=job.locked_at
+    ).update(locked_at=now)
+    if renewed:
+        job.locked_at = now
+    return bool(renewed)
+
+
+class _Heartbeat(threading.Thread):
+    """Renews the lease of a job until it is stopped."""
+
+    def __init__(self, job: Job):
+        super().__init__(name=f"job-{job.pk}-heartbeat", daemon=True)
+        self.job = job
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(HEARTBEAT_SECONDS):
+                try:
+                    renew_lease(self.job)
+                except DatabaseError as exc:
+                    logger.warning("Could not renew the lease of job %s.",
+                                   self.job, exc_info=exc)
+        finally:
+            connections.close_all()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run(job: Job) -> bool:
+    """
+    Run a claimed job, then delete it, reschedule it or dead-letter it.
+
+    Returns:
+        bool: True if the handler succeeded.
+    """
+    heartbeat = _Heartbeat(job)
+    heartbeat.start()
+    try:
+        handler = HANDLERS[job.kind]
+        try:
+            handler(**job.payload)
+        finally:
+            heartbeat.stop()
+    except Exception as exc:
+        error = "".join(traceback.format_exception(exc))
+        if job.attempts >= job.max_attempts:
+            logger.error("Job %s failed permanently.", job, exc_info=exc)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.DEAD, locked_at=None, last_error=error
+            )
+        else:
+            logger.warning("Job %s failed; will retry.", job, exc_info=exc)
+            run_after = timezone.now() + timedelta(
+                seconds=_retry_delay(job.attempts)
+            )
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.PENDING, locked_at=None, last_error=error,
+                run_after=run_after
+            )
+        return False
+    Job.objects.filter(pk=job.pk).delete()
+    return True
@@ -0,0 +1,106 @@
+"""
+Background pipeline jobs: fetch, tag, summarize, upgrade, embed, prune
+and warm.
+
+A fetch job enqueues tag and summarize jobs for exactly the articles it
+created, in the same transaction that stores them, plus one embed job
+to refresh the related-articles index. Once the jobs that change the
+article lists have run, the worker enqueues a warm job that refreshes
+their most requested cached pages. Upgrade jobs replace the summaries
+made by the offline fallback while the LLM was unavailable.
+"""
+from django.db import transaction
+
+from core.models import Article, Job
+from core.services import jobs
+from core.services.cache_warming import warm_pages
+from core.services.embeddings import build_index, embed_pending
+from core.services.ingest import build_adapters, ingest_sources
+from core.services.retention import cutoff_for, prune_articles
+from core.services.summarizer import (
+    claim_articles,
+    summarize_claimed,
+    upgrade_fallback_summaries,
+)
+from core.services.tagger import tag_articles
+
+FETCH = "fetch"
+TAG = "tag"
+SUMMARIZE = "summarize"
+UPGRADE = "upgrade"
+EMBED = "embed"
+PRUNE = "prune"
+WARM = "warm"
+
+# Jobs after which the cached article lists are out of date.
+CHANGES_LISTS = {FETCH, TAG, SUMMARIZE, UPGRADE, PRUNE}
+
+# Summaries call the LLM, so they are split into small jobs that
+# workers can run concurrently and retry independently.
+SUMMARIZE_CHUNK = 10
+
+
+def enqueue_followups(article_ids: list[int]) -> None:
+    """Enqueue tag and summarize jobs for newly created articles."""
+    jobs.enqueue(TAG, {"article_ids": article_ids})
+    for i in range(0, len(article_ids), SUMMARIZE_CHUNK):
+        jobs.enqueue(SUMMARIZE,
+                     {"article_ids": article_ids[i:i + SUMMARIZE_CHUNK]})
+
+
+def is_queued(kind: str) -> bool:
+    """Returns True if a job of this kind is pending or running."""
+    return Job.objects.filter(
+        kind=kind, status__in=[Job.PENDING, Job.RUNNING]
+    ).exists()
+
+
+@jobs.register(FETCH)
+def fetch(sources=("newsapi",), keyword="technology", page_size=50,
+          pages=1):
+    adapters = build_adapters(sources, keyword=keyword,
+                              page_size=page_size, pages=pages)
+    created, _ = ingest_sources(adapters, on_created=enqueue_followups)
+    if created and not is_queued(EMBED):
+        jobs.enqueue(EMBED)
+
+
+@jobs.register(TAG)
+def tag(article_ids):
+    # Tagging is local and quick, so the rows stay locked while it runs;
+    # retried jobs and other workers skip articles already tagged.
+    with transaction.atomic():
+        tag_articles(list(
+            Article.objects
+            .filter(pk__in=article_ids, tagged_at__isnull=True)
+            .select_for_update(skip_locked=True, of=("self",))
+            .select_related("body")
+            .only("id", "title", "body__content")
+        ))
+
+
+@jobs.register(SUMMARIZE)
+def summarize(article_ids):
+    qs = Article.objects.filter(pk__in=article_ids)
+    summarize_claimed(claim_articles(qs, len(article_ids)))
+
+
+@jobs.register(UPGRADE)
+def upgrade(limit=50):
+    upgrade_fallback_summaries(limit)
+
+
+@jobs.register(EMBED)
+def embed():
+    embed_pending()
+    build_index()
+
+
+@jobs.register(PRUNE)
+def prune(days):
+    prune_articles(cutoff_for(days))
+
+
+@jobs.register(WARM)
+def warm():
+    warm_pages()
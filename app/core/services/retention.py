@@ -0,0 +1,87 @@
+"""
+Retention of old articles.
+
+Articles older than the retention window are deleted in small batches,
+oldest first, each batch in its own short transaction: no long-running
+DELETE holds locks or bloats the table in one go, and autovacuum can
+reclaim the space as the prune goes. A batch can first be archived as
+JSON lines (article, source, topics and summary).
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Callable, TextIO
+
+from django.db import transaction
+from django.utils import timezone
+
+from core import metrics
+from core.models import Article
+
+
+def cutoff_for(days: int) -> datetime:
+    """Returns the oldest `published_at` kept by a `days` retention."""
+    return timezone.now() - timedelta(days=days)
+
+
+def expired(cutoff: datetime):
+    """Returns the articles published before `cutoff`."""
+    return Article.objects.filter(published_at__lt=cutoff)
+
+
+def expired_batch(cutoff: datetime, batch_size: int):
+    """
+    Returns the `batch_size` oldest articles published before `cutoff`:
+    a range scan of the `published_at` index that stops after the batch.
+    """
+    return expired(cutoff).order_by("published_at")[:batch_size]
+
+
+def _archive_row(article: Article) -> dict:
+    summary = getattr(article, "summary", None)
+    return {
+        "id": article.pk,
+        "url": article.url,
+        "title": article.title,
+        "source": article.source.name,
+        "published_at": article.published_at.isoformat(),
+        "author": article.author,
+        "content": article.content,
+        "topics": [t.name for t in article.topics.all()],
+        "summary": summary.text if summary is not None else None,
+    }
+
+
+def prune_articles(cutoff: datetime, batch_size: int = 1000,
+                   archive: TextIO | None = None,
+                   on_batch: Callable[[int], None] | None = None) -> int:
+    """
+    Delete the articles published before `cutoff`, with their summaries,
+    topic links, fingerprints and embeddings, `batch_size` at a time.
+
+    With `archive`, each batch is written there as JSON lines first.
+
+    Returns:
+        int: Number of articles deleted.
+    """
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            batch = expired_batch(cutoff, batch_size)
+            if archive is not None:
+                rows = list(batch.select_related("source", "summary", "body")
+                            .prefetch_related("topics"))
+                for article in rows:
+                    archive.write(json.dumps(_archive_row(article)) + "\n")
+                ids = [a.pk for a in rows]
+            else:
+                ids = list(batch.values_list("pk", flat=True))
+            if not ids:
+                break
+            Article.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
+        metrics.ARTICLES_PRUNED.inc(len(ids))
+        if on_batch is not None:
+            on_batch(len(ids))
+        if len(ids) < batch_size:
+            break
+    return deleted
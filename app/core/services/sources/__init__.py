@@ -0,0 +1,18 @@
+"""
+Ingest source adapters.
+
+Every adapter yields normalized article rows, which the ingest pipeline
+upserts in batches regardless of where they came from.
+"""
+from core.services.sources.base import SourceAdapter, SourceError
+from core.services.sources.feeds import FeedAdapter, FeedError
+from core.services.sources.newsapi import NewsApiAdapter, NewsApiError
+
+__all__ = [
+    "SourceAdapter",
+    "SourceError",
+    "FeedAdapter",
+    "FeedError",
+    "NewsApiAdapter",
+    "NewsApiError",
+]
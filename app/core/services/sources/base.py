@@ -0,0 +1,41 @@
+"""
+Base class for ingest source adapters.
+"""
+from typing import Iterator
+from urllib.parse import urlparse
+
+
+class SourceError(Exception):
+    """Raised when a source cannot be fetched or parsed."""
+    pass
+
+
+class SourceAdapter:
+    """
+    Produces normalized article rows from one external source.
+
+    `fetch` runs in a worker thread and must not touch the database;
+    `load_state` and `save_state` run on the ingest thread before and
+    after a successful fetch, for adapters that persist poll state.
+
+    A row is a dict with the keys: url, source_name, homepage, title,
+    published_at, author and content.
+    """
+    name = "source"
+
+    def load_state(self) -> None:
+        pass
+
+    def save_state(self) -> None:
+        pass
+
+    def fetch(self) -> Iterator[dict]:
+        raise NotImplementedError
+
+
+def homepage_of(url: str) -> str:
+    """Returns the scheme and host of a URL, or '' if it has none."""
+    parsed = urlparse(url or "")
+    if parsed.scheme and parsed.netloc:
+        return f"{parsed.scheme}://{parsed.netloc}"
+    return ""
@@ -0,0 +1,192 @@
+"""
+NewsAPI source adapter.
+
+Result pages are streamed and their `articles` array is parsed
+incrementally, so only one response chunk is held in memory at a time.
+"""
+import os
+import json
+import codecs
+import logging
+import requests
+from typing import Iterable, Iterator
+from django.utils.dateparse import parse_datetime
+from core.services import http_client, timing
+from core.services.sources.base import SourceAdapter, SourceError, homepage_of
+
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+
+CHUNK_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class NewsApiError(SourceError):
+    """Raised when NewsAPI fetch/parsing fails."""
+    pass
+
+
+class _JsonStream:
+    """Incremental reader over a stream of JSON text chunks."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            while (self.pos < len(self.buf)
+                   and self.buf[self.pos] in _WHITESPACE):
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON stream.")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number at the end of the buffer may still be cut off.
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_json_array(chunks: Iterable[str], key: str) -> Iterator:
+    """
+    Yield the elements of the array under `key` in a top-level JSON
+    object, parsing the text incrementally. Other members are skipped.
+
+    Raises ValueError on malformed JSON.
+    """
+    stream = _JsonStream(chunks)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        name = stream.value()
+        stream.expect(":")
+        if name == key and stream.peek() == "[":
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.pos += 1
+            else:
+                while True:
+                    yield stream.value()
+                    if stream.peek() != ",":
+                        break
+                    stream.pos += 1
+                stream.expect("]")
+        else:
+            stream.value()
+        if stream.peek() != ",":
+            break
+        stream.pos += 1
+    stream.expect("}")
+
+
+def _iter_text(response) -> Iterator[str]:
+    """Decode a streamed response body chunk by chunk."""
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+    for chunk in timing.timed_iter(chunks, "http"):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def normalize_item(item: dict) -> dict | None:
+    """Map a raw NewsAPI item to article fields, or None to skip it."""
+    if not isinstance(item, dict):
+        return None
+    url = item.get("url")
+    published_at = parse_datetime(item.get("publishedAt") or "")
+    if not url or published_at is None:
+        return None
+    return {
+        "url": url,
+        "source_name": (item.get("source") or {}).get("name") or "Unknown",
+        "homepage": homepage_of(url),
+        "title": item.get("title") or "",
+        "published_at": published_at,
+        "author": item.get("author") or "",
+        "content": item.get("content") or (item.get("description") or ""),
+    }
+
+
+class NewsApiAdapter(SourceAdapter):
+    """Articles matching a keyword from the NewsAPI `everything` search."""
+    name = "newsapi"
+
+    def __init__(self, keyword: str = "technology", page_size: int = 50,
+                 pages: int = 1, api_key: str | None = None,
+                 url: str | None = None):
+        self.keyword = keyword
+        self.page_size = page_size
+        self.pages = pages
+        self.api_key = api_key
+        self.url = url or NEWS_API_URL
+
+    def _iter_items(self) -> Iterator[dict]:
+        """Fetch result pages and stream their raw article items."""
+        api_key = self.api_key or os.getenv("NEWS_API_KEY")
+        if not api_key:
+            raise NewsApiError("NEWS_API_KEY is not set.")
+        for page in range(1, self.pages + 1):
+            params = {
+                "q": self.keyword,
+                "pageSize": self.page_size,
+                "page": page,
+                "language": "en",
+                "sortBy": "publishedAt",
+                "apiKey": api_key,
+            }
+            count = 0
+            try:
+                with timing.phase("http"):
+                    r = http_client.get(self.url, self.name, params=params,
+                                        stream=True)
+                with r:
+                    r.raise_for_status()
+                    items = iter_json_array(_iter_text(r), "articles")
+                    for item in timing.timed_iter(items, "parse"):
+                        count += 1
+                        yield item
+            except (requests.RequestException, ValueError) as exc:
+                logger.error("Failed to fetch or parse NewsAPI response.",
+                             exc_info=exc)
+                raise NewsApiError(
+                    "Failed to fetch or parse articles from NewsAPI."
+                ) from exc
+            if count < self.page_size:
+                return
+
+    def fetch(self) -> Iterator[dict]:
+        return filter(None, map(normalize_item, self._iter_items()))
@@ -1,16 +1,68 @@
 """
 Service to summarize article text using OpenAI API.
+
+The OpenAI SDK is slow to import, so it is only loaded, and the client
+only built, the first time a summary is requested.
+
+LLM calls go through a circuit breaker shared by all workers
+(core.services.circuit): when too many of them fail, summaries come
+straight from the offline extractor until a probe call succeeds.
+Extractive summaries are stored with FALLBACK_MODEL_NAME, and
+`upgrade_fallback_summaries` replaces them once the LLM is back.
 """
 import os
+import time
 import logging
-from openai import OpenAI, APIError, RateLimitError
+from datetime import timedelta
+from functools import cache
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from core import metrics
+from core.services import timing
+from core.services.circuit import CircuitBreaker
+from core.models import Article, Summary
 
 MODEL_NAME = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-API_KEY = os.getenv("OPENAI_API_KEY")
+# `model_name` of summaries made by the offline extractor.
+FALLBACK_MODEL_NAME = "fallback"
+# Fallback reasons that mean the LLM is unavailable, as opposed to
+# failing on one text ("rejected" or "empty").
+UNAVAILABLE_REASONS = {"no_client", "circuit_open", "rate_limit", "error"}
+# Failed LLM attempts after which a fallback summary is left as it is.
+MAX_UPGRADE_ATTEMPTS = 3
 
 logger = logging.getLogger(__name__)
 
-client = OpenAI(api_key=API_KEY) if API_KEY else None
+
+@cache
+def get_client():
+    """Returns the OpenAI client, or None if OPENAI_API_KEY is not set."""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    from openai import OpenAI
+    # The SDK defaults (10 minutes, 2 retries) would hold a worker for
+    # long before the breaker sees the failure.
+    return OpenAI(api_key=api_key, timeout=settings.SUMMARIZER_LLM_TIMEOUT,
+                  max_retries=settings.SUMMARIZER_LLM_RETRIES)
+
+
+def breaker() -> CircuitBreaker:
+    """Returns the circuit breaker of the LLM."""
+    return CircuitBreaker("llm",
+                          threshold=settings.SUMMARIZER_CIRCUIT_THRESHOLD,
+                          error_rate=settings.SUMMARIZER_CIRCUIT_ERROR_RATE,
+                          window=settings.SUMMARIZER_CIRCUIT_WINDOW,
+                          cooldown=settings.SUMMARIZER_CIRCUIT_COOLDOWN)
+
+
+def _provider_failure(exc: Exception) -> bool:
+    """Whether an LLM error says the provider, not the request, failed."""
+    from openai import APIConnectionError, InternalServerError, RateLimitError
+    return isinstance(exc, (APIConnectionError, InternalServerError,
+                            RateLimitError))
 
 
 def _fallback_summary(text: str) -> str:
@@ -19,28 +71,227 @@ def _fallback_summary(text: str) -> str:
     return ". ".join(sentences[:5]) + ("." if sentences else "")
 
 
-def summarize_text(text: str) -> str:
-    """
-    Return a 4–6 sentence summary of the given text.
+def _fallback(text: str, reason: str) -> tuple[str, str, str]:
+    metrics.SUMMARIES.labels("fallback").inc()
+    metrics.SUMMARIZER_FALLBACKS.labels(reason).inc()
+    return _fallback_summary(text), FALLBACK_MODEL_NAME, reason
 
-    Falls back to a simple extraction summary if OpenAI
-    is unavailable or if the API call fails.
-    """
+
+def _summarize(text: str) -> tuple[str, str, str | None]:
+    """Returns the summary, its model and why it fell back (or None)."""
+    client = get_client()
     if client is None:
-        return _fallback_summary(text)
+        return _fallback(text, "no_client")
+    circuit = breaker()
+    if not circuit.allow():
+        return _fallback(text, "circuit_open")
 
     prompt = (
         "Summarize the following news article in 4–6 sentences. "
         "Keep it factual and neutral, no bullet points:\n\n" + text
     )
+    started = time.perf_counter()
     try:
         # client = OpenAI(api_key=...)
         # initializes a lightweight HTTP client
         # client.responses.create(...)
         # sends an HTTP request to OpenAI’s API
-        resp = client.responses.create(model=MODEL_NAME, input=prompt)
-        return (resp.output_text or "").strip() or _fallback_summary(text)
-    except (RateLimitError, APIError, Exception) as exc:
+        with timing.phase("llm"):
+            resp = client.responses.create(model=MODEL_NAME, input=prompt)
+    except Exception as exc:
+        from openai import RateLimitError
+        metrics.SUMMARIZER_LATENCY.observe(time.perf_counter() - started)
         logger.warning("Summarization failed; using fallback summary.",
                        exc_info=exc)
-        return _fallback_summary(text)
+        if isinstance(exc, RateLimitError):
+            reason = "rate_limit"
+        elif _provider_failure(exc):
+            reason = "error"
+        else:
+            reason = "rejected"
+        if reason != "rejected":
+            circuit.record_failure()
+        return _fallback(text, reason)
+    metrics.SUMMARIZER_LATENCY.observe(time.perf_counter() - started)
+    circuit.record_success()
+
+    usage = getattr(resp, "usage", None)
+    if usage is not None:
+        metrics.SUMMARIZER_TOKENS.labels("input").inc(
+            usage.input_tokens or 0)
+        metrics.SUMMARIZER_TOKENS.labels("output").inc(
+            usage.output_tokens or 0)
+    summary = (resp.output_text or "").strip()
+    if not summary:
+        return _fallback(text, "empty")
+    metrics.SUMMARIES.labels("llm").inc()
+    return summary, MODEL_NAME, None
+
+
+def summarize(text: str) -> tuple[str, str]:
+    """
+    Summarize text in 4–6 sentences.
+
+    Falls back to a simple extraction summary if OpenAI is unavailable,
+    its circuit is open, or the API call fails.
+
+    Returns:
+        tuple[str, str]: The summary and the model that made it
+        (FALLBACK_MODEL_NAME for the extraction summary).
+    """
+    return _summarize(text)[:2]
+
+
+def summarize_text(text: str) -> str:
+    """Return a 4–6 sentence summary of the given text (see `summarize`)."""
+    return summarize(text)[0]
+
+
+def claim_articles(queryset, limit: int) -> list[Article]:
+    """
+    Claim up to `limit` unsummarized articles of `queryset`.
+
+    They are locked with SKIP LOCKED and stamped `summary_claimed_at` in
+    one short transaction, so other workers skip them while the LLM
+    calls run outside any transaction (no idle-in-transaction
+    connection or row lock is held across them). A claim expires after
+    SUMMARIZER_CLAIM_TIMEOUT seconds: an article whose worker died
+    before saving its summary is claimed again. Pass the ones left
+    unsummarized after an error to `release_articles`.
+    """
+    now = timezone.now()
+    expired = now - timedelta(seconds=settings.SUMMARIZER_CLAIM_TIMEOUT)
+    with transaction.atomic():
+        articles = list(
+            queryset
+            .filter(Q(summary_claimed_at__isnull=True)
+                    | Q(summary_claimed_at__lt=expired),
+                    summarized_at__isnull=True)
+            .select_for_update(skip_locked=True, of=("self",))
+            .select_related("body")
+            .only("id", "cluster_id", "body__content")
+            [:limit]
+        )
+        if articles:
+            Article.objects.filter(pk__in=[a.pk for a in articles]).update(
+                summary_claimed_at=now)
+    return articles
+
+
+def release_articles(articles: list[Article]) -> None:
+    """Return claimed articles that were not summarized to the queue."""
+    Article.objects.filter(pk__in=[a.pk for a in articles]).update(
+        summary_claimed_at=None)
+
+
+def summarize_claimed(articles: list[Article]) -> list[str | None]:
+    """
+    Summarize claimed articles one by one, releasing the remaining ones
+    if summarizing fails.
+
+    Returns:
+        list[str | None]: The outcome of each article
+        (see `summarize_article`).
+    """
+    outcomes = []
+    try:
+        for article in articles:
+            outcomes.append(summarize_article(article))
+    except BaseException:
+        release_articles(articles[len(outcomes):])
+        raise
+    return outcomes
+
+
+def _mark_summarized(article: Article) -> None:
+    article.summarized_at = timezone.now()
+    Article.objects.filter(pk=article.pk).update(
+        summarized_at=article.summarized_at)
+
+
+def summarize_article(article: Article) -> str | None:
+    """
+    Create the summary of an article and mark it as summarized once the
+    summary is stored. Near-duplicates share one summary per cluster,
+    so an existing summary from the article's cluster is reused instead
+    of calling the model again.
+
+    Returns:
+        str | None: "reused" or "summarized", or None if the article
+        has no content.
+    """
+    content = (article.content or "").strip()
+    if not content:
+        _mark_summarized(article)
+        return None
+    sibling = None
+    if article.cluster_id is not None:
+        sibling = (
+            Summary.objects
+            .filter(article__cluster_id=article.cluster_id)
+            .only("text", "model_name")
+            .first()
+        )
+    if sibling is not None:
+        txt, model_name, outcome = sibling.text, sibling.model_name, "reused"
+        metrics.SUMMARIES.labels("reused").inc()
+    else:
+        txt, model_name = summarize(content)
+        outcome = "summarized"
+    with timing.phase("db_write"):
+        Summary.objects.get_or_create(
+            article=article,
+            defaults={"text": txt, "model_name": model_name},
+        )
+        _mark_summarized(article)
+    return outcome
+
+
+def upgrade_fallback_summaries(limit: int = 50) -> int:
+    """
+    Replace up to `limit` extractive summaries with LLM ones, newest
+    articles first. Stops as soon as the LLM turns out unavailable; a
+    summary the LLM fails on by itself (a rejected request or empty
+    output) is skipped, and left as it is after MAX_UPGRADE_ATTEMPTS
+    failures. Near-duplicates sharing a fallback summary get the new
+    one as well.
+
+    Returns:
+        int: Number of summaries upgraded.
+    """
+    if get_client() is None or breaker().state == "open":
+        return 0
+    pending = (
+        Summary.objects
+        .filter(model_name=FALLBACK_MODEL_NAME,
+                upgrade_attempts__lt=MAX_UPGRADE_ATTEMPTS)
+        .select_related("article__body")
+        .only("id", "article__cluster_id", "article__body__content")
+        .order_by("-article__published_at")
+    )
+    upgraded = 0
+    done_clusters = set()
+    for summary in pending[:limit]:
+        cluster_id = summary.article.cluster_id
+        content = (summary.article.content or "").strip()
+        if not content or cluster_id in done_clusters:
+            continue
+        txt, model_name, reason = _summarize(content)
+        if reason in UNAVAILABLE_REASONS:
+            break
+        with timing.phase("db_write"):
+            if reason is not None:
+                Summary.objects.filter(pk=summary.pk).update(
+                    upgrade_attempts=F("upgrade_attempts") + 1)
+                continue
+            same = Q(pk=summary.pk)
+            if cluster_id is not None:
+                same |= Q(article__cluster_id=cluster_id)
+                done_clusters.add(cluster_id)
+            upgraded += (
+                Summary.objects
+                .filter(same, model_name=FALLBACK_MODEL_NAME)
+                .update(text=txt, model_name=model_name)
+            )
+    metrics.SUMMARIES_UPGRADED.inc(upgraded)
+    return upgraded
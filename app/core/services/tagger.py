@@ -1,4 +1,10 @@
+import time
+
+from django.utils import timezone
+
+from core import metrics
 from core.models import Topic, Article
+from core.services import timing
 
 TOPIC_KEYWORDS = {
     "AI": ["ai", "artificial intelligence", "machine learning", "ml", "llm"],
@@ -23,21 +29,52 @@ def _guess_topics(text: str) -> list[str]:
     return matched
 
 
-def tag_article(article: Article, max_topics: int = 5) -> int:
+def tag_articles(articles: list[Article], max_topics: int = 5) -> int:
     """
-    Assign keyword-based topics to an article.
+    Assign keyword-based topics to a batch of articles and mark them as
+    tagged, using a fixed number of queries for the whole batch.
 
     Returns:
         int: Number of topics attached.
     """
-    blob = f"{article.title}\n{article.content or ''}"
-    names = _guess_topics(blob)[:max_topics]
-    if not names:
+    if not articles:
         return 0
-    topics = []
-    for name in names:
-        topic, _ = Topic.objects.get_or_create(name=name)
-        topics.append(topic)
-    if topics:
-        article.topics.add(*topics)
-    return len(topics)
+    started = time.perf_counter()
+    with timing.phase("match"):
+        names = {
+            a.pk: _guess_topics(f"{a.title}\n{a.content or ''}")
+            [:max_topics]
+            for a in articles
+        }
+    with timing.phase("db_write"):
+        wanted = {name for ns in names.values() for name in ns}
+        topics = {t.name: t for t in Topic.objects.filter(name__in=wanted)}
+        for name in wanted - topics.keys():
+            topics[name], _ = Topic.objects.get_or_create(name=name)
+
+        Through = Article.topics.through
+        Through.objects.bulk_create(
+            [Through(article_id=pk, topic_id=topics[name].pk)
+             for pk, ns in names.items() for name in ns],
+            ignore_conflicts=True,
+        )
+        now = timezone.now()
+        Article.objects.filter(pk__in=names).update(tagged_at=now)
+    for article in articles:
+        article.tagged_at = now
+
+    attached = sum(len(ns) for ns in names.values())
+    metrics.TAGGER_ARTICLES.inc(len(articles))
+    metrics.TAGGER_TOPICS.inc(attached)
+    metrics.TAGGER_BATCH_DURATION.observe(time.perf_counter() - started)
+    return attached
+
+
+def tag_article(article: Article, max_topics: int = 5) -> int:
+    """
+    Assign keyword-based topics to an article and mark it as tagged.
+
+    Returns:
+        int: Number of topics attached.
+    """
+    return tag_articles([article], max_topics=max_topics)
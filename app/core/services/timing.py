@@ -0,0 +1,99 @@
+"""
+Phase timing for long-running commands.
+
+Services wrap their expensive steps in `phase(name)` ("http", "parse",
+"db_write", "llm", ...). While a `Timer` is active (see
+core.management.base.InstrumentedCommand), the time spent in each phase
+is summed across all threads; otherwise `phase` only checks a global.
+
+Phases nest: a phase is charged its own time only, so "parse" time
+excludes the "http" reads it triggers.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+_active: "Timer | None" = None
+_local = threading.local()
+
+
+class Timer:
+    """Total time and number of calls per phase."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.seconds[name] += seconds
+            self.calls[name] += 1
+
+    def snapshot(self) -> dict:
+        """Returns {phase: {"seconds": ..., "calls": ...}}, slowest first."""
+        with self._lock:
+            return {
+                name: {"seconds": round(seconds, 3),
+                       "calls": self.calls[name]}
+                for name, seconds in sorted(self.seconds.items(),
+                                            key=lambda kv: -kv[1])
+            }
+
+
+@contextmanager
+def timer() -> Iterator[Timer]:
+    """Activate a new Timer for the block."""
+    global _active
+    previous, _active = _active, Timer()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+@contextmanager
+def phase(name: str):
+    """Charge the time spent in the block to phase `name`."""
+    active = _active
+    if active is None:
+        yield
+        return
+    stack = _local.__dict__.setdefault("stack", [])
+    frame = [0.0]  # time spent in nested phases
+    stack.append(frame)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stack.pop()
+        if stack:
+            stack[-1][0] += elapsed
+        active.add(name, elapsed - frame[0])
+
+
+def timed_iter(iterable: Iterable, name: str) -> Iterator:
+    """Yield from `iterable`, charging the time to produce each item."""
+    it = iter(iterable)
+    while True:
+        with phase(name):
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+        yield item
+
+
+class TimedReader:
+    """File-like wrapper charging `read` calls to a phase."""
+
+    def __init__(self, stream, name: str):
+        self.stream = stream
+        self.name = name
+
+    def read(self, size: int = -1):
+        with phase(self.name):
+            return self.stream.read(size)
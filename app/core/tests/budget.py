@@ -0,0 +1,134 @@
+"""
+Query and latency budgets for tests.
+
+`measure()` records every SQL query (count and DB time) and the time
+spent in DRF serializers while a block runs. `BudgetTestMixin` fails a
+test when the measurement exceeds a declared `Budget`.
+
+Time limits are meant to catch order-of-magnitude regressions, not to
+benchmark; scale them on slow machines with BUDGET_TIME_FACTOR. Set
+BUDGET_REPORT=1 to print every measurement.
+"""
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from unittest.mock import patch
+
+from django.db import connection
+from rest_framework.serializers import BaseSerializer
+
+TIME_FACTOR = float(os.environ.get("BUDGET_TIME_FACTOR", "1"))
+REPORT = bool(os.environ.get("BUDGET_REPORT"))
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Upper limits for one endpoint or command run."""
+    queries: int
+    db_ms: float | None = None
+    serialization_ms: float | None = None
+
+
+@dataclass
+class Measurement:
+    """What a measured block did: queries, DB time, serializer time."""
+    queries: list[tuple[str, float]] = field(default_factory=list)
+    serialization: float = 0.0
+
+    @property
+    def query_count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def db_ms(self) -> float:
+        return sum(seconds for _, seconds in self.queries) * 1000
+
+    @property
+    def serialization_ms(self) -> float:
+        return self.serialization * 1000
+
+    def __str__(self):
+        return (f"{self.query_count} queries, {self.db_ms:.1f} ms in the "
+                f"DB, {self.serialization_ms:.1f} ms serializing")
+
+
+@contextmanager
+def measure():
+    """
+    Record the queries and serializer time of the block.
+
+    Serializer time excludes queries run while serializing (lazy
+    relations), which are counted as queries instead.
+    """
+    m = Measurement()
+    depth = 0
+    query_time_in_serializer = 0.0
+
+    def record(execute, sql, params, many, context):
+        nonlocal query_time_in_serializer
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            seconds = time.perf_counter() - started
+            m.queries.append((sql, seconds))
+            if depth:
+                query_time_in_serializer += seconds
+
+    data = BaseSerializer.data
+
+    def timed_data(serializer):
+        nonlocal depth, query_time_in_serializer
+        if depth:
+            return data.fget(serializer)
+        depth += 1
+        query_time_in_serializer = 0.0
+        started = time.perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            depth -= 1
+            m.serialization += (time.perf_counter() - started
+                                - query_time_in_serializer)
+
+    with connection.execute_wrapper(record), \
+            patch.object(BaseSerializer, "data", property(timed_data)):
+        yield m
+
+
+class BudgetTestMixin:
+    """Assertions for `Budget`s; mix into a TestCase."""
+
+    def assertWithinBudget(self, measurement: Measurement, budget: Budget,
+                           label: str = ""):
+        if REPORT:
+            print(f"\n[budget] {label or 'block'}: {measurement}")
+        problems = []
+        if measurement.query_count > budget.queries:
+            problems.append(
+                f"{measurement.query_count} queries > {budget.queries}")
+        if (budget.db_ms is not None
+                and measurement.db_ms > budget.db_ms * TIME_FACTOR):
+            problems.append(f"{measurement.db_ms:.1f} ms in the DB > "
+                            f"{budget.db_ms * TIME_FACTOR:.1f} ms")
+        if (budget.serialization_ms is not None
+                and measurement.serialization_ms
+                > budget.serialization_ms * TIME_FACTOR):
+            problems.append(
+                f"{measurement.serialization_ms:.1f} ms serializing > "
+                f"{budget.serialization_ms * TIME_FACTOR:.1f} ms")
+        if problems:
+            queries = "\n".join(
+                f"  {i}. {sql}"
+                for i, (sql, _) in enumerate(measurement.queries, 1)
+            )
+            self.fail(f"{label or 'Block'} is over budget: "
+                      f"{'; '.join(problems)}.\nQueries:\n{queries}")
+
+    @contextmanager
+    def assertBudget(self, budget: Budget, label: str = ""):
+        """Measure the block and assert it stays within `budget`."""
+        with measure() as m:
+            yield m
+        self.assertWithinBudget(m, budget, label)
@@ -0,0 +1,67 @@
+"""
+Shared fixtures for the tests.
+"""
+import json
+from unittest.mock import MagicMock
+
+from django.utils import timezone
+
+from core.models import Article
+
+# A django-redis cache that is never connected to: tests of the Redis
+# code paths mock its client (`caches["default"].client.get_client`).
+REDIS_CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://127.0.0.1:6379/1",
+        "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+        "KEY_PREFIX": "test",
+    }
+}
+
+
+def make_article(source, key, **fields):
+    """
+    An article of `source` whose title, URL and content are unique per
+    `key`, published now; `fields` override any of them.
+    """
+    return Article.objects.create(**{
+        "source": source,
+        "title": f"Story {key}",
+        "url": f"https://x/{key}",
+        "published_at": timezone.now(),
+        "content": f"Story {key} happened. It matters.",
+        **fields,
+    })
+
+
+def newsapi_item(i, **overrides):
+    """A NewsAPI article item, unique per `i`."""
+    item = {
+        "source": {"id": None, "name": "Wire"},
+        "author": "Reporter",
+        "title": f"Story {i}",
+        "url": f"https://wire.example.com/story-{i}",
+        "publishedAt": "2025-11-10T08:00:00Z",
+        "content": f"Unique body number {i} about topic {i * 7}.",
+    }
+    item.update(overrides)
+    return item
+
+
+def newsapi_payload(items):
+    """A NewsAPI /everything response body with `items`."""
+    return json.dumps({"status": "ok", "totalResults": len(items),
+                       "articles": items})
+
+
+def streamed_response(body, chunk_size=7):
+    """A streamed response stub that yields the body in small chunks."""
+    response = MagicMock()
+    response.encoding = "utf-8"
+    data = body.encode()
+    response.iter_content.return_value = [
+        data[i:i + chunk_size] for i in range(0, len(data), chunk_size)
+    ]
+    response.__enter__.return_value = response
+    return response
@@ -0,0 +1,168 @@
+"""
+Query and latency budgets of the API endpoints and management commands.
+"""
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Article, Source, Summary, Topic
+from core.tests.budget import Budget, BudgetTestMixin
+from core.tests.helpers import (
+    newsapi_item,
+    newsapi_payload,
+    streamed_response,
+)
+
+# The budgets hold on SQLite (local runs) and Postgres (CI); where the
+# query counts differ, both are spelled out.
+POSTGRES = connection.vendor == "postgresql"
+
+# A page costs a capped count, the page itself and one prefetch of its
+# topics, whatever the page number or filters. On Postgres the count
+# starts with the planner's estimate: `reltuples` and, for a filtered
+# query or a table not analyzed yet (a fresh test database), an EXPLAIN.
+LIST_BUDGET = Budget(queries=5 if POSTGRES else 3, db_ms=100,
+                     serialization_ms=200)
+# The article joined with its source, summary and body, and its topics.
+DETAIL_BUDGET = Budget(queries=2, db_ms=50, serialization_ms=50)
+SUMMARY_BUDGET = Budget(queries=1, db_ms=50, serialization_ms=20)
+BULK_SUMMARIES_BUDGET = Budget(queries=1, db_ms=50, serialization_ms=50)
+# The article's id, the related articles (joined) and their topics.
+RELATED_BUDGET = Budget(queries=3, db_ms=50, serialization_ms=100)
+# Per claimed batch: savepoint, claim, topics, links, status, release.
+# SQLite ignores FOR UPDATE SKIP LOCKED but still runs the claim.
+TAG_COMMAND_BUDGET = Budget(queries=6, db_ms=200)
+# Per upserted batch, including clustering, independent of its size on
+# both backends as long as SQLite does not split the bulk inserts (see
+# test_fetch_articles_budget_per_batch).
+FETCH_COMMAND_BUDGET = Budget(queries=12, db_ms=300)
+
+
+class EndpointBudgetTests(BudgetTestMixin, APITestCase):
+    """Test that endpoints stay within their query and time budgets."""
+
+    @classmethod
+    def setUpTestData(cls):
+        source = Source.objects.create(name="Wire")
+        topics = [Topic.objects.create(name=f"Topic {i}") for i in range(3)]
+        cls.articles = []
+        for i in range(60):
+            article = Article.objects.create(
+                source=source, title=f"Story {i}", url=f"https://x/{i}",
+                published_at=timezone.now(), content="Body. " * 200,
+                cluster_id=None,
+            )
+            article.topics.add(*topics[:i % 3 + 1])
+            Summary.objects.create(article=article, text=f"Summary {i}")
+            cls.articles.append(article)
+
+    def setUp(self):
+        cache.clear()
+
+    def _get(self, budget, label, url, params=None):
+        with self.assertBudget(budget, label):
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res
+
+    def test_list_budget_independent_of_page(self):
+        """Test that a list page costs the same whatever its number."""
+        for page in (1, 3):
+            res = self._get(LIST_BUDGET, f"list (page={page})",
+                            reverse("article-list"), {"page": page})
+            self.assertEqual(len(res.data["results"]), 20)
+
+    def test_list_budget_with_filters(self):
+        """Test that filtered list pages stay within the list budget."""
+        for params in ({"topic_slugs": "topic-0,topic-1"},
+                       {"collapse_duplicates": "true"},
+                       {"ordering": "published_at", "page": 2}):
+            self._get(LIST_BUDGET, f"list {params}",
+                      reverse("article-list"), params)
+
+    def test_detail_budget(self):
+        """Test the article detail budget."""
+        self._get(DETAIL_BUDGET, "detail",
+                  reverse("article-detail", args=[self.articles[0].pk]))
+
+    def test_summary_budget(self):
+        """Test the article summary budget."""
+        self._get(SUMMARY_BUDGET, "summary",
+                  reverse("article-summary", args=[self.articles[0].pk]))
+
+    def test_bulk_summaries_budget(self):
+        """Test the bulk summaries budget."""
+        ids = ",".join(str(a.pk) for a in self.articles[:50])
+        self._get(BULK_SUMMARIES_BUDGET, "bulk summaries",
+                  reverse("summary-list"), {"article_ids": ids})
+
+    def test_related_budget(self):
+        """Test that related articles are loaded with their relations."""
+        ids = [a.pk for a in self.articles[1:21]]
+        with patch("core.services.embeddings.related_article_ids",
+                   return_value=ids):
+            res = self._get(RELATED_BUDGET, "related",
+                            reverse("article-related",
+                                    args=[self.articles[0].pk]),
+                            {"limit": 20})
+        self.assertEqual(len(res.data["results"]), 20)
+
+
+class CommandBudgetTests(BudgetTestMixin, APITestCase):
+    """Test that management commands do a fixed amount of work per batch."""
+
+    def setUp(self):
+        self.source = Source.objects.create(name="Wire")
+        for name in ("AI", "Python", "Cloud"):
+            Topic.objects.create(name=name)
+
+    def _pending(self, count):
+        Article.objects.bulk_create(
+            Article(source=self.source, title=f"Story {i}",
+                    url=f"https://x/{count}/{i}",
+                    published_at=timezone.now(),
+                    content="New AI tooling for Python in the cloud.")
+            for i in range(count)
+        )
+
+    def test_tag_articles_budget_per_batch(self):
+        """Test that tagging a batch costs the same for any batch size."""
+        counts = []
+        for count in (10, 60):
+            self._pending(count)
+            with self.assertBudget(TAG_COMMAND_BUDGET,
+                                   f"tag_articles ({count} articles)") as m:
+                call_command("tag_articles", batch_size=100,
+                             stdout=StringIO())
+            counts.append(m.query_count)
+        self.assertEqual(counts[0], counts[1])
+        self.assertFalse(Article.objects.filter(tagged_at=None).exists())
+
+    @patch.dict("os.environ", {"NEWS_API_KEY": "test-key"})
+    @patch("core.services.http_client.requests.Session.get")
+    def test_fetch_articles_budget_per_batch(self, patched_get):
+        """Test that storing a batch costs the same for any batch size."""
+        counts = []
+        # Sizes stay under SQLite's limit of 999 bind parameters, past
+        # which Django splits bulk inserts into several statements;
+        # Postgres has no such limit.
+        for count in (5, 20):
+            Article.objects.all().delete()
+            items = [newsapi_item(i) for i in range(count)]
+            patched_get.return_value = streamed_response(
+                newsapi_payload(items), chunk_size=4096)
+            with self.assertBudget(FETCH_COMMAND_BUDGET,
+                                   f"fetch_articles ({count} items)") as m:
+                call_command("fetch_articles", page_size=count,
+                             batch_size=100, stdout=StringIO())
+            counts.append(m.query_count)
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(Article.objects.count(), 20)
@@ -0,0 +1,337 @@
+"""
+Tests for the page cache, its access statistics and the cache warmer.
+"""
+import asyncio
+import gzip
+import json
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+from django.core.cache import cache, caches
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app import settings as app_settings
+from core import async_cache
+from core.cache import (
+    _InstrumentedCacheMiddleware,
+    cache_page,
+    hot_pages,
+    record_access,
+)
+from core.models import Source
+from core.pagination import DefaultPagination
+from core.services.cache_warming import page_url, warm_pages
+from core.tests.helpers import REDIS_CACHES, make_article
+
+
+class CachePageTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.calls = 0
+
+    def _view(self, delay=0.0, **options):
+        @cache_page(60, **options)
+        def view(request):
+            self.calls += 1
+            time.sleep(delay)
+            return HttpResponse(str(self.calls))
+        return view
+
+    def _get(self, view):
+        return view(self.factory.get("/articles/"))
+
+    def test_fresh_copy_is_served(self):
+        """Test that a page is computed once within its soft TTL."""
+        view = self._view(hard_timeout=600)
+
+        self.assertEqual(self._get(view).content, b"1")
+        self.assertEqual(self._get(view).content, b"1")
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_copy_is_served_while_another_request_refreshes(self):
+        """Test that a stale page is served when the lock is taken."""
+        view = self._view(hard_timeout=600)
+        self._get(view)
+        later = time.time() + 120
+
+        with patch("core.cache.time.time", return_value=later):
+            with patch.object(_InstrumentedCacheMiddleware, "_acquire",
+                              return_value=False):
+                self.assertEqual(self._get(view).content, b"1")
+            self.assertEqual(self._get(view).content, b"2")
+            self.assertEqual(self._get(view).content, b"2")
+        self.assertEqual(self.calls, 2)
+
+    def test_without_hard_timeout_pages_expire(self):
+        """Test that pages are not served stale by default."""
+        view = self._view()
+        self._get(view)
+
+        with patch("core.cache.time.time", return_value=time.time() + 120):
+            self.assertEqual(self._get(view).content, b"2")
+
+    def test_concurrent_misses_compute_the_page_once(self):
+        """Test that requests missing together wait for one computation."""
+        view = self._view(delay=0.3)
+        responses = []
+
+        def get():
+            responses.append(self._get(view).content)
+
+        threads = [threading.Thread(target=get) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(responses, [b"1"] * 4)
+
+    def test_variants_do_not_wait_for_each_other(self):
+        """Test that a miss of another Accept-Encoding is not blocked."""
+        view = self._view(delay=0.3, lock_timeout=30)
+        durations = {}
+
+        def get(encoding):
+            started = time.monotonic()
+            view(self.factory.get("/articles/",
+                                  headers={"accept-encoding": encoding}))
+            durations[encoding] = time.monotonic() - started
+
+        threads = [threading.Thread(target=get, args=(encoding,))
+                   for encoding in ("gzip", "identity")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 2)
+        self.assertLess(max(durations.values()), 5)
+
+    def test_waiters_stop_when_nothing_is_stored(self):
+        """Test that a response that is not cached ends the wait."""
+        @cache_page(60, lock_timeout=30)
+        def not_found(request):
+            self.calls += 1
+            time.sleep(0.3)
+            return HttpResponse(status=404)
+
+        responses = []
+
+        def get():
+            responses.append(not_found(self.factory.get("/articles/")))
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=get) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual([r.status_code for r in responses], [404, 404])
+        self.assertEqual(self.calls, 2)
+
+    def test_lock_is_released_after_an_error(self):
+        """Test that a failed computation lets the next request retry."""
+        @cache_page(60, lock_timeout=30)
+        def failing(request):
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            failing(self.factory.get("/articles/"))
+
+        started = time.monotonic()
+        with self.assertRaises(RuntimeError):
+            failing(self.factory.get("/articles/"))
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class CacheWarmingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # One article per page, so three articles make three pages.
+        patcher = patch.object(DefaultPagination, "page_size", 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.source = Source.objects.create(name="Wire")
+        for i in range(3):
+            make_article(self.source, i)
+
+    def test_hot_pages_counts_combinations_without_page(self):
+        """Test that access statistics group pages of the same query."""
+        url = reverse("article-list")
+        oldest = {"ordering": "published_at"}
+        for params in ({}, {}, oldest, {**oldest, "page": 2},
+                       {**oldest, "page": 3}):
+            self.client.get(url, params)
+
+        hot = hot_pages(cache, 10)
+
+        self.assertEqual([(h["query"], h["hits"]) for h in hot],
+                         [("ordering=published_at", 3), ("", 2)])
+        self.assertEqual(hot[0]["path"], url)
+        self.assertEqual(hot[0]["host"], "testserver")
+
+    def test_warm_pages_refreshes_the_hot_pages(self):
+        """Test that warming stores fresh copies of the first pages."""
+        url = reverse("article-list")
+        self.client.get(url, {"ordering": "published_at"})
+        self.client.get(url, {"ordering": "published_at", "page": 2})
+        make_article(self.source, 3)
+
+        self.assertEqual(warm_pages(combinations=5, pages=3), 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, {"ordering": "published_at"})
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(res.json()["count"], 4)
+
+    def test_warmed_pages_match_the_clients_headers(self):
+        """Test that warming reuses the Accept-Encoding of the clients."""
+        url = reverse("article-list")
+        headers = {"accept-encoding": "gzip"}
+        self.client.get(url, headers=headers)
+        make_article(self.source, 3)
+
+        with override_settings(COMPRESSION_MIN_SIZE=0):
+            warm_pages(combinations=5, pages=1)
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.get(url, headers=headers)
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(res.content))["count"], 4)
+
+    def test_warming_stops_at_the_last_page(self):
+        """Test that pages past the end of a query are not stored."""
+        self.client.get(reverse("article-list"))
+
+        self.assertEqual(warm_pages(combinations=5, pages=5), 3)
+
+    def test_page_url(self):
+        """Test that page 1 has no page parameter, like the front page."""
+        self.assertEqual(page_url("/articles/", "", 1), "/articles/")
+        self.assertEqual(page_url("/articles/", "topic_slugs=ai", 2),
+                         "/articles/?page=2&topic_slugs=ai")
+
+
+class _FakeRedis:
+    """The sorted-set commands of redis-py used by the page statistics."""
+
+    def __init__(self):
+        self.zsets: dict[str, dict[bytes, float]] = {}
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.results = []
+
+    def zincrby(self, key, amount, member):
+        zset = self.redis.zsets.setdefault(key, {})
+        member = member.encode()
+        zset[member] = zset.get(member, 0) + amount
+        self.results.append(zset[member])
+
+    def expire(self, key, seconds):
+        self.results.append(True)
+
+    def zrevrange(self, key, start, end, withscores=False):
+        rows = sorted(self.redis.zsets.get(key, {}).items(),
+                      key=lambda row: -row[1])
+        self.results.append(rows[start:end + 1])
+
+    def execute(self):
+        results, self.results = self.results, []
+        return results
+
+
+@override_settings(CACHES=REDIS_CACHES)
+class RedisCacheWarmingTests(SimpleTestCase):
+    """Test the sorted-set statistics against a fake Redis client."""
+
+    def setUp(self):
+        self.redis = _FakeRedis()
+        patcher = patch.object(caches["default"].client, "get_client",
+                               return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_warming_reads_the_recorded_sorted_sets(self):
+        """Test that hot_pages and warm_pages see what record_access wrote."""
+        factory = RequestFactory()
+        for query in ("", "topic_slugs=ai", "topic_slugs=ai&page=2"):
+            record_access(caches["default"],
+                          factory.get(f"/articles/?{query}"))
+
+        self.assertEqual(len(self.redis.zsets), 1)
+        self.assertEqual([(h["query"], h["hits"])
+                          for h in hot_pages(caches["default"], 10)],
+                         [("topic_slugs=ai", 2), ("", 1)])
+
+        with patch("core.services.cache_warming.warm_page",
+                   return_value=200) as warm_page:
+            self.assertEqual(warm_pages(combinations=5, pages=1), 2)
+        self.assertEqual([c.args[2] for c in warm_page.call_args_list],
+                         ["/articles/?topic_slugs=ai", "/articles/"])
+
+
+@override_settings(CACHES=app_settings.CACHES)
+class AsyncCacheTests(SimpleTestCase):
+    """Test the asyncio Redis client with the production cache settings."""
+
+    def test_client_connects_to_the_configured_location(self):
+        """Test that the client is built from the LOCATION URL."""
+        async def build():
+            return async_cache._client()
+
+        client = asyncio.run(build())
+
+        kwargs = client.connection_pool.connection_kwargs
+        self.assertEqual((kwargs["host"], kwargs["port"], kwargs["db"]),
+                         ("redis", 6379, 1))
+
+    def test_values_use_the_backend_keys_and_serializer(self):
+        """Test that aget and aset match the sync backend's format."""
+        backend = caches["default"]
+        redis = AsyncMock()
+        redis.get.return_value = backend.client.encode({"a": 1})
+
+        async def roundtrip():
+            await async_cache.aset("key", {"a": 1}, 60)
+            return await async_cache.aget("key")
+
+        with patch("core.async_cache._client", return_value=redis), \
+                patch.object(async_cache, "ASGI", True):
+            self.assertEqual(asyncio.run(roundtrip()), {"a": 1})
+
+        key = backend.client.make_key("key")
+        self.assertEqual(key, "newsapi:1:key")
+        redis.set.assert_awaited_once_with(
+            key, backend.client.encode({"a": 1}), ex=60)
+        redis.get.assert_awaited_once_with(key)
+
+    def test_wsgi_uses_the_backend(self):
+        """Test that outside ASGI the asyncio client is not used."""
+        with patch("core.async_cache._client") as client, \
+                patch.object(caches["default"], "aget",
+                             AsyncMock(return_value=1)) as aget:
+            self.assertEqual(asyncio.run(async_cache.aget("key")), 1)
+
+        client.assert_not_called()
+        aget.assert_awaited_once_with("key", None)
@@ -1,13 +1,29 @@
 """
 Test custom Django management commands.
 """
+import json
+import os
+import pstats
+import tempfile
+import time
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
 from django.core.management import call_command
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from core.models import Article, Source, Summary, Topic
+from core.services import timing
+from core.tests.helpers import (
+    make_article,
+    newsapi_item,
+    newsapi_payload,
+    streamed_response,
+)
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -32,3 +48,116 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_sleep.call_count, 5)
         patched_check.assert_called_with(databases=['default'])
+
+
+class StageStatusCommandTests(TestCase):
+    """Test that tag/summarize commands only process pending articles."""
+
+    def setUp(self):
+        self.source = Source.objects.create(name="S")
+        Topic.objects.create(name="AI", slug="ai")
+
+    def test_tag_articles_marks_untagged_articles(self):
+        """Test that tagging marks articles even when no topic matched."""
+        matched = make_article(self.source, 1,
+                               content="New AI models were released.")
+        unmatched = make_article(self.source, 2,
+                                 content="Nothing relevant here.")
+
+        call_command("tag_articles", batch_size=1, stdout=StringIO())
+
+        matched.refresh_from_db()
+        unmatched.refresh_from_db()
+        self.assertIsNotNone(matched.tagged_at)
+        self.assertIsNotNone(unmatched.tagged_at)
+        self.assertEqual(list(matched.topics.values_list("slug", flat=True)),
+                         ["ai"])
+
+        with patch("core.management.commands.tag_articles.tag_articles") \
+                as tag:
+            call_command("tag_articles", stdout=StringIO())
+        tag.assert_not_called()
+
+    @patch("core.services.summarizer.summarize_article")
+    def test_summarize_articles_skips_processed(self, summarize):
+        """Test that summarizing only picks articles not yet summarized."""
+        done = make_article(self.source, 1, summarized_at=timezone.now())
+        Summary.objects.create(article=done, text="s", model_name="m")
+        pending = make_article(self.source, 2, content="Needs a summary.")
+
+        def mark(article):
+            Article.objects.filter(pk=article.pk).update(
+                summarized_at=timezone.now())
+            return "summarized"
+        summarize.side_effect = mark
+
+        out = StringIO()
+        call_command("summarize_articles", limit=5, stdout=out)
+
+        self.assertEqual([c.args[0].pk for c in summarize.call_args_list],
+                         [pending.pk])
+        self.assertIn("Summarized 1 article(s)", out.getvalue())
+
+
+class InstrumentedCommandTests(TestCase):
+    """Test progress, phase timing and profiling of long commands."""
+
+    def setUp(self):
+        source = Source.objects.create(name="S")
+        Article.objects.bulk_create(
+            Article(source=source, title=f"Title {n}", url=f"https://x/{n}",
+                    published_at=timezone.now(), content="AI and Python.")
+            for n in range(5)
+        )
+
+    def test_progress_lines_and_json_summary(self):
+        """Test that progress goes to stderr and the summary to stdout."""
+        out, err = StringIO(), StringIO()
+        call_command("tag_articles", batch_size=2, progress_interval=1e-9,
+                     summary_json="-", stdout=out, stderr=err)
+
+        self.assertIn("[tag_articles] 2/5 articles (40%)", err.getvalue())
+        self.assertIn("ETA", err.getvalue())
+        summary = json.loads(out.getvalue().splitlines()[-1])
+        self.assertEqual(summary["command"], "tag_articles")
+        self.assertEqual(summary["items"], 5)
+        self.assertEqual(summary["result"],
+                         {"processed": 5, "attached": 10})
+        self.assertEqual(set(summary["phases"]),
+                         {"claim", "match", "db_write"})
+        self.assertEqual(summary["phases"]["claim"]["calls"], 3)
+
+    @patch.dict("os.environ", {"NEWS_API_KEY": "test-key"})
+    @patch("core.services.http_client.requests.Session.get")
+    def test_fetch_phases(self, patched_get):
+        """Test that fetching times HTTP, parsing and DB writes."""
+        patched_get.return_value = streamed_response(
+            newsapi_payload([newsapi_item(i) for i in range(3)]))
+        out = StringIO()
+        call_command("fetch_articles", page_size=10, summary_json="-",
+                     stdout=out)
+
+        summary = json.loads(out.getvalue().splitlines()[-1])
+        self.assertEqual(summary["result"], {"created": 3, "updated": 0})
+        self.assertEqual(summary["items"], 3)
+        self.assertTrue({"http", "parse", "db_write", "dedup"}
+                        <= set(summary["phases"]))
+
+    def test_profile_is_written(self):
+        """Test that --profile dumps a cProfile file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tag.prof")
+            call_command("tag_articles", profile=path, stdout=StringIO())
+            stats = pstats.Stats(path)
+        self.assertTrue(any(name == "tag_articles"
+                            for _, _, name in stats.stats))
+
+    def test_nested_phases_are_charged_their_own_time(self):
+        """Test that an outer phase excludes the time of inner phases."""
+        with timing.timer() as timer:
+            with timing.phase("outer"):
+                with timing.phase("inner"):
+                    time.sleep(0.02)
+        phases = timer.snapshot()
+        self.assertGreaterEqual(phases["inner"]["seconds"], 0.02)
+        self.assertLess(phases["outer"]["seconds"], 0.01)
@@ -0,0 +1,80 @@
+"""
+Tests for the read-replica router.
+"""
+from asgiref.sync import async_to_sync
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.db_router import DB_PIN_COOKIE, use_replica
+from core.middleware import ReplicaRoutingMiddleware
+from core.models import Article
+
+
+def _read_view(request):
+    return HttpResponse(router.db_for_read(Article))
+
+
+def _write_view(request):
+    router.db_for_write(Article)
+    return HttpResponse(router.db_for_read(Article))
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"],
+                   DB_REPLICA_STICKY_SECONDS=5)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _call(self, view, **cookies):
+        request = self.factory.get("/")
+        request.COOKIES.update(cookies)
+        return ReplicaRoutingMiddleware(view)(request)
+
+    def test_marked_views_read_from_a_replica(self):
+        """Test that reads in a use_replica view go to the replica."""
+        res = self._call(use_replica(_read_view))
+
+        self.assertEqual(res.content, b"replica_0")
+        self.assertNotIn(DB_PIN_COOKIE, res.cookies)
+
+    def test_other_views_read_from_the_primary(self):
+        """Test that unmarked views keep reading from the primary."""
+        self.assertEqual(self._call(_read_view).content, b"default")
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        """Test that a write switches reads to the primary and pins."""
+        res = self._call(use_replica(_write_view))
+
+        self.assertEqual(res.content, b"default")
+        self.assertEqual(res.cookies[DB_PIN_COOKIE]["max-age"], 5)
+
+    def test_pinned_clients_read_from_the_primary(self):
+        """Test that the pin cookie sends reads to the primary."""
+        res = self._call(use_replica(_read_view), **{DB_PIN_COOKIE: "1"})
+
+        self.assertEqual(res.content, b"default")
+
+    def test_async_views(self):
+        """Test that async views are routed like sync ones."""
+        @use_replica
+        async def view(request):
+            return _read_view(request)
+
+        request = self.factory.get("/")
+        res = async_to_sync(ReplicaRoutingMiddleware(view))(request)
+
+        self.assertEqual(res.content, b"replica_0")
+
+    def test_reads_outside_requests_use_the_primary(self):
+        """Test that commands and the pipeline read from the primary."""
+        self.assertEqual(router.db_for_read(Article), "default")
+        self.assertFalse(router.allow_migrate("replica_0", "core"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        """Test that nothing changes when no replica is configured."""
+        res = self._call(use_replica(_write_view))
+
+        self.assertEqual(res.content, b"default")
+        self.assertNotIn(DB_PIN_COOKIE, res.cookies)
@@ -0,0 +1,85 @@
+"""
+Tests for near-duplicate detection.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import Source, Article, Summary
+from core.services.dedup import (
+    assign_cluster,
+    assign_clusters,
+    minhash,
+    similarity,
+)
+from core.tests.helpers import make_article
+
+WIRE_STORY = (
+    "The central bank raised interest rates by a quarter point on "
+    "Wednesday, citing persistent inflation in housing and services. "
+    "Officials signalled that further increases remain possible if price "
+    "growth does not slow over the coming months, while markets had "
+    "largely expected the move after strong employment figures."
+)
+
+
+class DedupTests(TestCase):
+    def setUp(self):
+        self.source = Source.objects.create(
+            name="Wire",
+            homepage="https://wire.example.com",
+        )
+
+    def _clustered(self, slug, content):
+        article = make_article(self.source, slug, content=content)
+        assign_cluster(article, content)
+        return article
+
+    def test_similarity_of_identical_text(self):
+        """Test that identical text has a similarity of 1."""
+        self.assertEqual(similarity(minhash(WIRE_STORY),
+                                    minhash(WIRE_STORY)), 1.0)
+
+    def test_near_duplicates_share_cluster(self):
+        """Test that lightly edited copies join the first copy's cluster."""
+        first = self._clustered("a", WIRE_STORY)
+        copy = self._clustered("b", WIRE_STORY.replace(
+            "Wednesday", "Wednesday afternoon"))
+
+        self.assertEqual(first.cluster_id, first.id)
+        self.assertEqual(copy.cluster_id, first.id)
+
+    def test_near_duplicates_within_one_batch(self):
+        """Test that duplicates in the same batch share a cluster."""
+        articles = [make_article(self.source, f"batch-{i}", content=WIRE_STORY)
+                    for i in range(3)]
+        assign_clusters([(a, WIRE_STORY) for a in articles])
+
+        self.assertEqual(
+            set(Article.objects.values_list("cluster_id", flat=True)),
+            {articles[0].id},
+        )
+
+    def test_unrelated_articles_get_own_cluster(self):
+        """Test that unrelated articles are not clustered together."""
+        self._clustered("a", WIRE_STORY)
+        other = self._clustered(
+            "b", "A new open source database engine was released today "
+                 "with support for vector search and columnar storage."
+        )
+
+        self.assertEqual(other.cluster_id, other.id)
+
+    def test_summarize_reuses_cluster_summary(self):
+        """Test that summarize_articles reuses a duplicate's summary."""
+        first = self._clustered("a", WIRE_STORY)
+        copy = self._clustered("b", WIRE_STORY + " Reporting by staff.")
+        Summary.objects.create(article=first, text="Rates went up.",
+                               model_name="gpt")
+
+        call_command("summarize_articles", stdout=StringIO())
+
+        summary = Summary.objects.get(article=copy)
+        self.assertEqual(summary.text, "Rates went up.")
+        self.assertEqual(summary.model_name, "gpt")
@@ -0,0 +1,131 @@
+"""
+Tests for article embeddings and the related-articles index.
+"""
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+import numpy as np
+
+from core.models import Source, Article, ArticleEmbedding
+from core.services.embeddings import (
+    DIM,
+    KEEP_BUILDS,
+    POINTER,
+    build_index,
+    embed_pending,
+    embed_text,
+    get_index,
+    related_article_ids,
+)
+
+TEXTS = {
+    "gpu": "Nvidia unveiled a new GPU for training large language models "
+           "with more memory bandwidth and faster tensor cores.",
+    "gpu-2": "A new GPU from Nvidia promises faster training for large "
+             "language models thanks to tensor cores and memory bandwidth.",
+    "soccer": "The football club won the league title after a late goal "
+              "in the final match of the season.",
+}
+
+
+def related_url(pk):
+    return reverse("article-related", args=[pk])
+
+
+class EmbeddingTests(TestCase):
+    def test_embed_text_is_normalized_float32(self):
+        """Test that embeddings are unit-length float32 vectors."""
+        vec = embed_text(TEXTS["gpu"])
+        self.assertEqual(vec.dtype, np.float32)
+        self.assertEqual(vec.shape, (DIM,))
+        self.assertAlmostEqual(float(np.linalg.norm(vec)), 1.0, places=5)
+
+    def test_embed_empty_text(self):
+        """Test that empty text embeds to a zero vector."""
+        self.assertFalse(embed_text("").any())
+
+
+class RelatedArticlesTests(APITestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        override = override_settings(EMBEDDING_INDEX_DIR=self.tmp.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        source = Source.objects.create(name="Src",
+                                       homepage="https://src.example.com")
+        self.articles = {
+            slug: Article.objects.create(
+                title=slug,
+                url=f"https://src.example.com/{slug}",
+                source=source,
+                published_at=timezone.now(),
+                content=text,
+            )
+            for slug, text in TEXTS.items()
+        }
+
+    def test_embed_articles_command(self):
+        """Test that embed_articles embeds every article and indexes it."""
+        out = StringIO()
+        call_command("embed_articles", stdout=out)
+
+        self.assertEqual(ArticleEmbedding.objects.count(), len(TEXTS))
+        self.assertIn("indexed 3 vector(s)", out.getvalue())
+
+    def test_related_ranks_similar_article_first(self):
+        """Test that the most similar article is returned first."""
+        call_command("embed_articles", stdout=StringIO())
+
+        ids = related_article_ids(self.articles["gpu"].id, k=2)
+        self.assertEqual(ids[0], self.articles["gpu-2"].id)
+        self.assertNotIn(self.articles["gpu"].id, ids)
+
+    def test_related_endpoint(self):
+        """Test the related-articles endpoint."""
+        call_command("embed_articles", stdout=StringIO())
+
+        res = self.client.get(related_url(self.articles["gpu"].id),
+                              {"limit": 1})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["title"] for row in res.data["results"]],
+                         ["gpu-2"])
+
+    def test_related_without_index(self):
+        """Test that related is empty before any index is built."""
+        res = self.client.get(related_url(self.articles["gpu"].id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [])
+
+    def test_rebuild_switches_to_a_complete_build(self):
+        """Test that readers switch builds at once and old ones go."""
+        embed_pending()
+        build_index()
+        first = get_index()
+
+        for _ in range(KEEP_BUILDS + 1):
+            build_index()
+
+        root = Path(self.tmp.name)
+        builds = sorted(p.name for p in root.glob("build-*"))
+        self.assertEqual(len(builds), KEEP_BUILDS)
+        self.assertEqual((root / POINTER).read_text(), builds[-1])
+        current = get_index()
+        self.assertEqual(current.path.name, builds[-1])
+        self.assertNotEqual(current.path, first.path)
+        self.assertEqual(len(current.ids), len(TEXTS))
+
+    def test_empty_index(self):
+        """Test that an index without vectors builds and finds nothing."""
+        self.assertEqual(build_index(), 0)
+        self.assertEqual(get_index().search(embed_text(TEXTS["gpu"])), [])
@@ -0,0 +1,302 @@
+"""
+Tests for the article ingest pipeline.
+"""
+import time
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.models import Article, FeedState, Source
+from core.services import http_client
+from core.services.ingest import (
+    NewsApiError,
+    fetch_and_store_articles,
+    ingest_sources,
+)
+from core.services.sources import FeedAdapter, FeedError, NewsApiAdapter
+from core.services.sources.newsapi import iter_json_array
+from core.tests.helpers import (
+    newsapi_item,
+    newsapi_payload,
+    streamed_response,
+)
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel>
+    <title>Feed Times</title>
+    <link>https://feed.example.com</link>
+    <item>
+      <title>Rss story</title>
+      <link>https://feed.example.com/rss-story</link>
+      <pubDate>Mon, 10 Nov 2025 08:00:00 GMT</pubDate>
+      <dc:creator>Feed Reporter</dc:creator>
+      <description>&lt;p&gt;Body of the RSS story.&lt;/p&gt;</description>
+    </item>
+    <item>
+      <title>No date</title>
+      <link>https://feed.example.com/no-date</link>
+    </item>
+  </channel>
+</rss>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom Daily</title>
+  <entry>
+    <title>Atom story</title>
+    <link rel="alternate" href="https://atom.example.com/atom-story"/>
+    <updated>2025-11-10T09:30:00Z</updated>
+    <author><name>Atom Writer</name></author>
+    <summary>Body of the Atom story.</summary>
+  </entry>
+</feed>
+"""
+
+
+def _feed_response(body, status_code=200, headers=None):
+    """A streamed feed response stub."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.raw = BytesIO(body)
+    response.__enter__.return_value = response
+    return response
+
+
+class IterJsonArrayTests(SimpleTestCase):
+    def _chunks(self, text, size):
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def test_yields_items_across_chunk_boundaries(self):
+        """Test that items split over many chunks are parsed."""
+        items = [newsapi_item(i) for i in range(5)]
+        for size in (1, 3, 64):
+            parsed = list(iter_json_array(
+                self._chunks(newsapi_payload(items), size), "articles"
+            ))
+            self.assertEqual(parsed, items)
+
+    def test_numbers_are_not_cut_at_chunk_end(self):
+        """Test that a number split across chunks is read whole."""
+        text = '{"totalResults": 12345, "articles": [1, 22, 333]}'
+        self.assertEqual(list(iter_json_array(self._chunks(text, 2),
+                                              "articles")), [1, 22, 333])
+
+    def test_missing_or_empty_array(self):
+        """Test that a missing or empty array yields nothing."""
+        self.assertEqual(list(iter_json_array(['{"status": "ok"}'],
+                                              "articles")), [])
+        self.assertEqual(list(iter_json_array(['{"articles": []}'],
+                                              "articles")), [])
+
+    def test_malformed_json_raises(self):
+        """Test that truncated JSON raises ValueError."""
+        with self.assertRaises(ValueError):
+            list(iter_json_array(['{"articles": [{"a": 1}'], "articles"))
+
+
+def _status(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+@override_settings(INGEST_HTTP_RETRIES=2, INGEST_CIRCUIT_THRESHOLD=2,
+                   INGEST_CIRCUIT_COOLDOWN=60)
+@patch("core.services.http_client.time.sleep")
+@patch("core.services.http_client.requests.Session.get")
+class HttpClientTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_retries_honor_retry_after(self, patched_get, sleep):
+        """Test that 429/5xx are retried after the Retry-After delay."""
+        patched_get.side_effect = [_status(429, {"Retry-After": "7"}),
+                                   _status(503), _status(200)]
+
+        response = http_client.get("https://x/", "test")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(patched_get.call_count, 3)
+        self.assertEqual(sleep.call_args_list[0].args, (7.0,))
+        self.assertLessEqual(sleep.call_args_list[1].args[0], 1.0)
+
+    def test_long_retry_after_is_not_waited_for(self, patched_get, sleep):
+        """Test that a Retry-After past the backoff cap returns at once."""
+        patched_get.return_value = _status(429, {"Retry-After": "3600"})
+
+        response = http_client.get("https://x/", "test")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(patched_get.call_count, 1)
+        sleep.assert_not_called()
+
+    def test_circuit_opens_and_fails_fast(self, patched_get, sleep):
+        """Test that failed calls open the circuit for the cooldown."""
+        patched_get.side_effect = requests.ConnectionError
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                http_client.get("https://x/", "test")
+        self.assertEqual(patched_get.call_count, 6)
+
+        with self.assertRaises(http_client.CircuitOpenError):
+            http_client.get("https://x/", "test")
+        self.assertEqual(patched_get.call_count, 6)
+        # Other providers have their own circuit.
+        patched_get.side_effect = None
+        patched_get.return_value = _status(200)
+        self.assertEqual(http_client.get("https://y/", "other").status_code,
+                         200)
+
+    def test_one_probe_closes_the_circuit(self, patched_get, sleep):
+        """Test that after the cooldown one call probes the provider."""
+        breaker = http_client.breaker_for("test")
+        breaker.record_failure()
+        breaker.record_failure()
+        patched_get.return_value = _status(200)
+        later = time.time() + 61
+
+        with patch("core.services.http_client.time.time",
+                   return_value=later):
+            self.assertEqual(breaker.state, "half-open")
+            self.assertTrue(breaker.allow())
+            self.assertFalse(breaker.allow())
+            http_client.breaker_for("test").record_success()
+            self.assertEqual(breaker.state, "closed")
+            self.assertEqual(
+                http_client.get("https://x/", "test").status_code, 200)
+
+    @patch.dict("os.environ", {"NEWS_API_KEY": "test-key"})
+    def test_open_circuit_fails_ingest(self, patched_get, sleep):
+        """Test that an open NewsAPI circuit raises NewsApiError."""
+        breaker = http_client.breaker_for("newsapi")
+        breaker.record_failure()
+        breaker.record_failure()
+
+        with self.assertRaises(NewsApiError):
+            list(NewsApiAdapter().fetch())
+        patched_get.assert_not_called()
+
+
+@patch.dict("os.environ", {"NEWS_API_KEY": "test-key"})
+@patch("core.services.http_client.requests.Session.get")
+class FetchAndStoreTests(TestCase):
+    def test_creates_and_updates_in_batches(self, patched_get):
+        """Test that items are upserted by URL across batches."""
+        Source.objects.create(name="Wire", homepage="https://wire.example.com")
+        items = [newsapi_item(i) for i in range(5)]
+        patched_get.return_value = streamed_response(newsapi_payload(items))
+
+        created, updated = fetch_and_store_articles(page_size=10,
+                                                    batch_size=2)
+        self.assertEqual((created, updated), (5, 0))
+
+        items[0]["title"] = "Story 0 (updated)"
+        patched_get.return_value = streamed_response(newsapi_payload(items))
+        created, updated = fetch_and_store_articles(page_size=10,
+                                                    batch_size=2)
+        self.assertEqual((created, updated), (0, 5))
+        self.assertTrue(Article.objects.filter(
+            title="Story 0 (updated)").exists())
+
+    def test_skips_items_without_url_or_date(self, patched_get):
+        """Test that unusable items are skipped."""
+        items = [newsapi_item(0), newsapi_item(1, url=None),
+                 newsapi_item(2, publishedAt=None)]
+        patched_get.return_value = streamed_response(newsapi_payload(items))
+
+        created, _ = fetch_and_store_articles(page_size=10)
+        self.assertEqual(created, 1)
+
+    def test_follows_pages_until_short_page(self, patched_get):
+        """Test that paging stops at the first short page."""
+        patched_get.side_effect = [
+            streamed_response(
+                newsapi_payload([newsapi_item(0), newsapi_item(1)])),
+            streamed_response(newsapi_payload([newsapi_item(2)])),
+        ]
+
+        created, _ = fetch_and_store_articles(page_size=2, pages=5)
+        self.assertEqual(created, 3)
+        self.assertEqual(patched_get.call_count, 2)
+
+    def test_malformed_response_raises(self, patched_get):
+        """Test that a malformed body raises NewsApiError."""
+        patched_get.return_value = streamed_response('{"articles": [')
+
+        with self.assertRaises(NewsApiError):
+            fetch_and_store_articles()
+
+    @patch.dict("os.environ", {"NEWS_API_KEY": ""})
+    def test_missing_api_key_raises(self, patched_get):
+        """Test that a missing NEWS_API_KEY raises NewsApiError."""
+        with self.assertRaises(NewsApiError):
+            fetch_and_store_articles()
+        patched_get.assert_not_called()
+
+
+@patch("core.services.http_client.requests.Session.get")
+class FeedAdapterTests(TestCase):
+    def test_ingests_rss_and_atom(self, patched_get):
+        """Test that RSS items and Atom entries are ingested."""
+        bodies = {"https://feed.example.com/rss": RSS,
+                  "https://atom.example.com/atom": ATOM}
+        patched_get.side_effect = lambda url, **kw: _feed_response(
+            bodies[url])
+
+        created, _ = ingest_sources([
+            FeedAdapter("https://feed.example.com/rss"),
+            FeedAdapter("https://atom.example.com/atom"),
+        ])
+
+        self.assertEqual(created, 2)
+        rss = Article.objects.get(url="https://feed.example.com/rss-story")
+        self.assertEqual(rss.source.name, "Feed Times")
+        self.assertEqual(rss.author, "Feed Reporter")
+        self.assertEqual(rss.content, "Body of the RSS story.")
+        atom = Article.objects.get(url="https://atom.example.com/atom-story")
+        self.assertEqual(atom.source.name, "Atom Daily")
+        self.assertEqual(atom.author, "Atom Writer")
+
+    def test_conditional_request_uses_persisted_validators(self,
+                                                           patched_get):
+        """Test that validators are stored and sent on the next poll."""
+        url = "https://feed.example.com/rss"
+        patched_get.return_value = _feed_response(
+            RSS, headers={"ETag": '"v1"', "Last-Modified": "Mon, 10 Nov"}
+        )
+        ingest_sources([FeedAdapter(url)])
+
+        state = FeedState.objects.get(url=url)
+        self.assertEqual(state.etag, '"v1"')
+
+        patched_get.return_value = _feed_response(b"", status_code=304)
+        created, updated = ingest_sources([FeedAdapter(url)])
+
+        self.assertEqual((created, updated), (0, 0))
+        headers = patched_get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Mon, 10 Nov")
+
+    def test_failing_feed_does_not_stop_others(self, patched_get):
+        """Test that one broken feed still lets the others ingest."""
+        bodies = {"https://broken.example.com/rss": b"<rss><channel>",
+                  "https://atom.example.com/atom": ATOM}
+        patched_get.side_effect = lambda url, **kw: _feed_response(
+            bodies[url])
+
+        with self.assertRaises(FeedError):
+            ingest_sources([
+                FeedAdapter("https://broken.example.com/rss"),
+                FeedAdapter("https://atom.example.com/atom"),
+            ])
+        self.assertTrue(Article.objects.filter(
+            url="https://atom.example.com/atom-story").exists())
+        self.assertFalse(FeedState.objects.filter(
+            url="https://broken.example.com/rss").exists())
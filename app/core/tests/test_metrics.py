@@ -0,0 +1,139 @@
+"""
+Tests for the Prometheus metrics and the /metrics endpoint.
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from core.models import Source
+from core.services.ingest import upsert_articles
+from core.services.summarizer import summarize_text
+from core.services.tagger import tag_articles
+from core.tests.helpers import make_article
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.source = Source.objects.create(name="Wire")
+
+    def test_metrics_endpoint_exposes_request_latency(self):
+        """Test that /metrics reports the latency of earlier requests."""
+        before = _value("http_request_duration_seconds_count",
+                        method="GET", route="article-list", status="200")
+        self.client.get(reverse("article-list"))
+
+        res = self.client.get(reverse("metrics"))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(b"http_request_duration_seconds_bucket", res.content)
+        self.assertEqual(
+            _value("http_request_duration_seconds_count",
+                   method="GET", route="article-list", status="200"),
+            before + 1,
+        )
+
+    def test_metrics_rejects_other_clients(self):
+        """Test that clients outside the allow-list get 403."""
+        res = self.client.get(reverse("metrics"), REMOTE_ADDR="203.0.113.7")
+
+        self.assertEqual(res.status_code, 403)
+        self.assertNotIn(b"http_request_duration_seconds", res.content)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_metrics_accepts_the_bearer_token(self):
+        """Test that METRICS_TOKEN grants access from any address."""
+        url = reverse("metrics")
+
+        ok = self.client.get(url, REMOTE_ADDR="203.0.113.7",
+                             HTTP_AUTHORIZATION="Bearer s3cret")
+        wrong = self.client.get(url, REMOTE_ADDR="203.0.113.7",
+                                HTTP_AUTHORIZATION="Bearer guess")
+
+        self.assertEqual(ok.status_code, 200)
+        self.assertEqual(wrong.status_code, 403)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.0/8"])
+    def test_metrics_allows_cidr_ranges(self):
+        """Test that METRICS_ALLOWED_IPS entries may be networks."""
+        url = reverse("metrics")
+
+        inside = self.client.get(url, REMOTE_ADDR="10.1.2.3")
+        outside = self.client.get(url, REMOTE_ADDR="127.0.0.1")
+
+        self.assertEqual(inside.status_code, 200)
+        self.assertEqual(outside.status_code, 403)
+
+    def test_page_cache_hits_and_misses(self):
+        """Test that the cached list counts a miss, then a hit."""
+        miss = _value("cache_requests_total", cache="page", result="miss")
+        hit = _value("cache_requests_total", cache="page", result="hit")
+
+        self.client.get(reverse("article-list"))
+        self.client.get(reverse("article-list"))
+
+        self.assertEqual(_value("cache_requests_total", cache="page",
+                                result="miss"), miss + 1)
+        self.assertEqual(_value("cache_requests_total", cache="page",
+                                result="hit"), hit + 1)
+
+    def test_summarizer_fallback_and_tokens(self):
+        """Test that LLM calls, tokens and fallbacks are counted."""
+        no_client = _value("summarizer_fallbacks_total", reason="no_client")
+        with patch("core.services.summarizer.get_client", return_value=None):
+            summarize_text("One. Two.")
+        self.assertEqual(_value("summarizer_fallbacks_total",
+                                reason="no_client"), no_client + 1)
+
+        llm = _value("summarizer_summaries_total", source="llm")
+        tokens = _value("summarizer_tokens_total", kind="output")
+        client = MagicMock()
+        client.responses.create.return_value = SimpleNamespace(
+            output_text="A summary.",
+            usage=SimpleNamespace(input_tokens=100, output_tokens=20),
+        )
+        with patch("core.services.summarizer.get_client",
+                   return_value=client):
+            self.assertEqual(summarize_text("One. Two."), "A summary.")
+        self.assertEqual(_value("summarizer_summaries_total", source="llm"),
+                         llm + 1)
+        self.assertEqual(_value("summarizer_tokens_total", kind="output"),
+                         tokens + 20)
+
+    def test_tagger_counts(self):
+        """Test that tagged articles and attached topics are counted."""
+        articles = [make_article(self.source, i,
+                                 content="Python and Django news.")
+                    for i in range(3)]
+        tagged = _value("tagger_articles_total")
+        topics = _value("tagger_topics_total")
+
+        linked = tag_articles(articles)
+
+        self.assertEqual(_value("tagger_articles_total"), tagged + 3)
+        self.assertEqual(_value("tagger_topics_total"), topics + linked)
+
+    def test_ingest_counts(self):
+        """Test that created and updated articles are counted."""
+        row = {"url": "https://x/ingest", "source_name": "Wire",
+               "homepage": "", "title": "Story", "author": "",
+               "content": "Body.", "published_at": timezone.now()}
+        created = _value("ingest_articles_total", result="created")
+        updated = _value("ingest_articles_total", result="updated")
+
+        upsert_articles([row])
+        upsert_articles([dict(row, title="Story (updated)")])
+
+        self.assertEqual(_value("ingest_articles_total", result="created"),
+                         created + 1)
+        self.assertEqual(_value("ingest_articles_total", result="updated"),
+                         updated + 1)
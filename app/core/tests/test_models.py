@@ -6,7 +6,7 @@ from django.db import IntegrityError
 from django.db.models import ProtectedError
 from django.utils import timezone
 
-from core.models import Source, Topic, Article, Summary
+from core.models import Source, Topic, Article, ArticleBody, Summary
 
 
 class ModelTests(TestCase):
@@ -178,3 +178,41 @@ class ModelTests(TestCase):
                                    text="short text",
                                    model_name="baseline")
         self.assertIn("The Title", str(s))
+
+    # --- ArticleBody ---
+
+    def test_article_content_is_stored_in_body(self):
+        """Test that content is saved to and read from ArticleBody."""
+        art = Article.objects.create(
+            title="Body",
+            url="https://example.com/body",
+            source=self.bbc,
+            published_at=timezone.now(),
+            content="First body.",
+        )
+        self.assertEqual(ArticleBody.objects.get(article=art).content,
+                         "First body.")
+
+        art.content = "Second body."
+        art.save()
+        fresh = Article.objects.select_related("body").get(pk=art.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(fresh.content, "Second body.")
+
+    def test_bulk_writes_store_bodies(self):
+        """Test that bulk_create and bulk_update write the bodies."""
+        arts = Article.objects.bulk_create(
+            Article(title=f"Bulk {i}", url=f"https://example.com/b{i}",
+                    source=self.bbc, published_at=timezone.now(),
+                    content=f"Body {i}.")
+            for i in range(3)
+        )
+        self.assertEqual(ArticleBody.objects.count(), 3)
+
+        for art in arts:
+            art.content = art.content.upper()
+        Article.objects.bulk_update(arts, ["title", "content"])
+        self.assertEqual(
+            sorted(ArticleBody.objects.values_list("content", flat=True)),
+            ["BODY 0.", "BODY 1.", "BODY 2."],
+        )
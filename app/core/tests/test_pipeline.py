@@ -0,0 +1,369 @@
+"""
+Tests for the background job queue and pipeline worker.
+"""
+import time
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from openai import APIConnectionError
+
+from core.models import Article, Job, Source, Summary, Topic
+from core.services import jobs
+from core.services.pipeline import SUMMARIZE, TAG, UPGRADE, fetch
+from core.services.summarizer import (
+    FALLBACK_MODEL_NAME,
+    MAX_UPGRADE_ATTEMPTS,
+    MODEL_NAME,
+    breaker,
+    claim_articles,
+    summarize,
+    summarize_article,
+    summarize_claimed,
+)
+from core.services.sources import SourceAdapter
+from core.tests.helpers import make_article
+
+
+class RowsAdapter(SourceAdapter):
+    """Adapter stub yielding prepared rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetch(self):
+        return iter(self.rows)
+
+
+def _run_pipeline():
+    call_command("run_pipeline", "--once", "--concurrency", "1",
+                 "--fetch-interval", "0", stdout=StringIO())
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        jobs.register("test-ok")(lambda **kw: self.calls.append(kw))
+
+        def fail(**kw):
+            raise RuntimeError("boom")
+        jobs.register("test-fail")(fail)
+        self.addCleanup(jobs.HANDLERS.pop, "test-ok")
+        self.addCleanup(jobs.HANDLERS.pop, "test-fail")
+
+    def test_successful_job_runs_and_is_deleted(self):
+        """Test that a successful job is removed from the queue."""
+        jobs.enqueue("test-ok", {"x": 1})
+
+        _run_pipeline()
+
+        self.assertEqual(self.calls, [{"x": 1}])
+        self.assertFalse(Job.objects.exists())
+
+    def test_delayed_job_is_not_claimed_early(self):
+        """Test that jobs are only claimed once due."""
+        jobs.enqueue("test-ok", delay=60)
+
+        self.assertEqual(jobs.claim(10), [])
+
+    def test_failed_job_is_retried_later(self):
+        """Test that a failed job is rescheduled with backoff."""
+        job = jobs.enqueue("test-fail", max_attempts=3)
+
+        _run_pipeline()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("boom", job.last_error)
+
+    def test_exhausted_job_is_dead_lettered(self):
+        """Test that a job failing max_attempts times is dead-lettered."""
+        job = jobs.enqueue("test-fail", max_attempts=2)
+
+        for _ in range(2):
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            _run_pipeline()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DEAD)
+        self.assertEqual(job.attempts, 2)
+
+
+class JobLeaseTests(TransactionTestCase):
+    def test_running_job_is_not_reclaimed(self):
+        """Test that the heartbeat keeps a long job's lease."""
+        reclaimed = []
+
+        def slow(**kw):
+            time.sleep(0.6)
+            reclaimed.extend(jobs.claim(10))
+        jobs.register("test-slow")(slow)
+        self.addCleanup(jobs.HANDLERS.pop, "test-slow")
+        job = jobs.enqueue("test-slow")
+
+        with patch("core.services.jobs.LEASE_SECONDS", 0.3), \
+                patch("core.services.jobs.HEARTBEAT_SECONDS", 0.05):
+            self.assertTrue(jobs.run(jobs.claim(1)[0]))
+
+        self.assertEqual(reclaimed, [])
+        self.assertFalse(Job.objects.filter(pk=job.pk).exists())
+
+    def test_expired_lease_is_reclaimed(self):
+        """Test that a job whose worker stopped renewing is claimed."""
+        job = jobs.enqueue("test-slow")
+        (claimed,) = jobs.claim(1)
+
+        with patch("core.services.jobs.LEASE_SECONDS", 0):
+            self.assertEqual([j.pk for j in jobs.claim(1)], [job.pk])
+        # The first worker no longer holds the lease.
+        self.assertFalse(jobs.renew_lease(claimed))
+
+
+class PipelineTests(TestCase):
+    def setUp(self):
+        self.source = Source.objects.create(name="Src",
+                                            homepage="https://src.example")
+
+    def _row(self, i):
+        return {
+            "url": f"https://src.example/{i}",
+            "source_name": "Src",
+            "homepage": "https://src.example",
+            "title": f"Python release {i}",
+            "published_at": timezone.now(),
+            "author": "",
+            "content": f"Python {i} ships faster startup number {i * 13}.",
+        }
+
+    @patch("core.services.pipeline.build_adapters")
+    def test_fetch_enqueues_jobs_for_new_articles(self, patched_build):
+        """Test that fetch enqueues tag/summarize jobs for new articles."""
+        patched_build.return_value = [
+            RowsAdapter([self._row(i) for i in range(3)])
+        ]
+
+        fetch()
+
+        ids = sorted(Article.objects.values_list("id", flat=True))
+        tag_job = Job.objects.get(kind=TAG)
+        self.assertEqual(sorted(tag_job.payload["article_ids"]), ids)
+        summarize_ids = [
+            i for job in Job.objects.filter(kind=SUMMARIZE)
+            for i in job.payload["article_ids"]
+        ]
+        self.assertEqual(sorted(summarize_ids), ids)
+
+    def test_tag_and_summarize_jobs(self):
+        """Test that queued jobs tag and summarize their articles."""
+        article = Article.objects.create(
+            title="Python news",
+            url="https://src.example/python",
+            source=self.source,
+            published_at=timezone.now(),
+            content="Python 4 is out. It is fast.",
+        )
+        jobs.enqueue(TAG, {"article_ids": [article.id]})
+        jobs.enqueue(SUMMARIZE, {"article_ids": [article.id]})
+
+        with patch("core.services.summarizer.get_client", return_value=None):
+            _run_pipeline()
+
+        self.assertIn(Topic.objects.get(name="Python"),
+                      article.topics.all())
+        self.assertEqual(article.summary.text, "Python 4 is out. It is fast.")
+        self.assertFalse(Job.objects.exists())
+
+    def test_tag_job_skips_tagged_articles(self):
+        """Test that a retried tag job does not re-tag articles."""
+        tagged = make_article(self.source, 1, tagged_at=timezone.now())
+        pending = make_article(self.source, 2)
+        jobs.enqueue(TAG, {"article_ids": [tagged.id, pending.id]})
+
+        with patch("core.services.pipeline.tag_articles") as patched:
+            _run_pipeline()
+
+        self.assertEqual([a.pk for a in patched.call_args.args[0]],
+                         [pending.pk])
+
+    def test_failed_summarize_job_releases_its_articles(self):
+        """Test that articles left unsummarized by an error are released."""
+        articles = [make_article(self.source, i) for i in range(3)]
+        seen = []
+
+        def summarize(article):
+            # Claimed articles are marked before the LLM is called.
+            self.assertIsNotNone(Article.objects.get(
+                pk=article.pk).summary_claimed_at)
+            seen.append(article.pk)
+            if len(seen) == 2:
+                raise RuntimeError("boom")
+            return "summarized"
+
+        jobs.enqueue(SUMMARIZE, {"article_ids": [a.pk for a in articles]})
+        with patch("core.services.summarizer.summarize_article",
+                   side_effect=summarize):
+            _run_pipeline()
+
+        released = set(Article.objects.filter(summary_claimed_at__isnull=True)
+                       .values_list("pk", flat=True))
+        self.assertEqual(released, {a.pk for a in articles} - {seen[0]})
+
+    def test_crashed_summarize_claims_expire(self):
+        """Test that articles of a worker killed mid-claim are redone."""
+        article = make_article(self.source, 1)
+        qs = Article.objects.filter(pk=article.pk)
+        # The worker dies after claiming: nothing is saved or released.
+        self.assertEqual(len(claim_articles(qs, 1)), 1)
+        article.refresh_from_db()
+        self.assertIsNone(article.summarized_at)
+
+        self.assertEqual(claim_articles(qs, 1), [])
+        later = timezone.now() + timedelta(
+            seconds=settings.SUMMARIZER_CLAIM_TIMEOUT + 1)
+        with patch("core.services.summarizer.timezone.now",
+                   return_value=later):
+            claimed = claim_articles(qs, 1)
+        with patch("core.services.summarizer.get_client", return_value=None):
+            self.assertEqual(summarize_claimed(claimed), ["summarized"])
+
+        article.refresh_from_db()
+        self.assertIsNotNone(article.summarized_at)
+        self.assertEqual(article.summary.text,
+                         "Story 1 happened. It matters.")
+
+    def test_page_cache_is_warmed_after_list_changes(self):
+        """Test that the worker warms the page cache once it is idle."""
+        jobs.enqueue(TAG, {"article_ids": []})
+
+        with patch("core.services.pipeline.warm_pages") as warm:
+            _run_pipeline()
+
+        warm.assert_called_once_with()
+        self.assertFalse(Job.objects.exists())
+
+
+def _llm(text="An LLM summary."):
+    client = MagicMock()
+    client.responses.create.return_value = SimpleNamespace(
+        output_text=text, usage=None)
+    return client
+
+
+def _down():
+    client = MagicMock()
+    client.responses.create.side_effect = APIConnectionError(
+        request=httpx.Request("POST", "https://api.openai.com/v1/responses"))
+    return client
+
+
+@override_settings(SUMMARIZER_CIRCUIT_THRESHOLD=2,
+                   SUMMARIZER_CIRCUIT_ERROR_RATE=0.5)
+class SummarizerCircuitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.source = Source.objects.create(name="Wire")
+
+    def test_failing_llm_opens_the_circuit(self):
+        """Test that once the LLM keeps failing it is no longer called."""
+        client = _down()
+        with patch("core.services.summarizer.get_client",
+                   return_value=client):
+            for _ in range(3):
+                self.assertEqual(summarize("One. Two.")[1],
+                                 FALLBACK_MODEL_NAME)
+
+        self.assertEqual(client.responses.create.call_count, 2)
+        self.assertEqual(breaker().state, "open")
+
+    def test_occasional_errors_keep_the_circuit_closed(self):
+        """Test that the circuit trips on the error rate, not a count."""
+        with patch("core.services.summarizer.get_client",
+                   return_value=_llm()):
+            for _ in range(6):
+                summarize("One. Two.")
+        with patch("core.services.summarizer.get_client",
+                   return_value=_down()):
+            for _ in range(3):
+                summarize("One. Two.")
+
+        self.assertEqual(breaker().state, "closed")
+
+    def test_fallback_summaries_are_tagged(self):
+        """Test that extractive summaries are stored as fallbacks."""
+        article = make_article(self.source, 1)
+        with patch("core.services.summarizer.get_client", return_value=None):
+            summarize_article(article)
+
+        self.assertEqual(article.summary.model_name, FALLBACK_MODEL_NAME)
+
+    def test_upgrade_job_replaces_fallback_summaries(self):
+        """Test that fallbacks, shared ones included, get LLM summaries."""
+        first, duplicate = (make_article(self.source, 1, cluster_id=7),
+                            make_article(self.source, 2, cluster_id=7))
+        other = make_article(self.source, 3)
+        for article in (first, duplicate, other):
+            Summary.objects.create(article=article, text="Extract.",
+                                   model_name=FALLBACK_MODEL_NAME)
+        jobs.enqueue(UPGRADE)
+
+        client = _llm()
+        with patch("core.services.summarizer.get_client",
+                   return_value=client):
+            _run_pipeline()
+
+        self.assertEqual(client.responses.create.call_count, 2)
+        self.assertFalse(Summary.objects.filter(
+            model_name=FALLBACK_MODEL_NAME).exists())
+        self.assertEqual(Summary.objects.get(article=duplicate).text,
+                         "An LLM summary.")
+        self.assertEqual(Summary.objects.get(article=other).model_name,
+                         MODEL_NAME)
+
+    def test_upgrade_stops_while_the_llm_fails(self):
+        """Test that upgrading gives up at the first fallback."""
+        for i in range(3):
+            Summary.objects.create(article=make_article(self.source, i),
+                                   text="Extract.",
+                                   model_name=FALLBACK_MODEL_NAME)
+        client = _down()
+        with patch("core.services.summarizer.get_client",
+                   return_value=client):
+            _run_pipeline()
+
+        self.assertEqual(client.responses.create.call_count, 1)
+        self.assertEqual(Summary.objects.filter(
+            model_name=FALLBACK_MODEL_NAME).count(), 3)
+
+    def test_upgrade_skips_summaries_the_llm_fails_on(self):
+        """Test that one failing article does not block the others."""
+        poison = make_article(self.source, 9)
+        for article in (make_article(self.source, 1), poison):
+            Summary.objects.create(article=article, text="Extract.",
+                                   model_name=FALLBACK_MODEL_NAME)
+        client = _llm()
+        client.responses.create.side_effect = lambda model, input: (
+            SimpleNamespace(output_text="" if "Story 9" in input
+                            else "An LLM summary.", usage=None))
+
+        with patch("core.services.summarizer.get_client",
+                   return_value=client):
+            for _ in range(MAX_UPGRADE_ATTEMPTS + 1):
+                jobs.enqueue(UPGRADE)
+                _run_pipeline()
+
+        self.assertEqual(
+            list(Summary.objects.filter(model_name=FALLBACK_MODEL_NAME)
+                 .values_list("article_id", "upgrade_attempts")),
+            [(poison.pk, MAX_UPGRADE_ATTEMPTS)])
+        # Gives up on it after MAX_UPGRADE_ATTEMPTS calls.
+        self.assertEqual(client.responses.create.call_count,
+                         1 + MAX_UPGRADE_ATTEMPTS)
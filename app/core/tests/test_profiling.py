@@ -0,0 +1,108 @@
+"""
+Tests for per-request profiling.
+"""
+import marshal
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Article, Source
+
+ARTICLES_URL = reverse("article-list")
+PROFILES_URL = reverse("profile-list")
+
+
+class ProfilingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        source = Source.objects.create(name="Wire")
+        self.article = Article.objects.create(
+            source=source, title="Story", url="https://x/1",
+            published_at=timezone.now(), content="Body.",
+        )
+        User = get_user_model()
+        self.staff = User.objects.create_user("staff", password="pw",
+                                              is_staff=True)
+        self.user = User.objects.create_user("reader", password="pw")
+
+    def _profiles(self):
+        self.client.force_login(self.staff)
+        res = self.client.get(PROFILES_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data["results"]
+
+    def test_staff_request_is_profiled(self):
+        """Test that a staff request with X-Profile stores a profile."""
+        self.client.force_login(self.staff)
+        self.client.get(ARTICLES_URL, HTTP_X_PROFILE="1")
+
+        [summary] = self._profiles()
+        self.assertEqual(summary["route"], "article-list")
+        self.assertEqual(summary["user"], "staff")
+        self.assertEqual(summary["trigger"], "staff")
+        self.assertGreater(summary["query_count"], 0)
+
+        res = self.client.get(reverse("profile-detail",
+                                      args=[summary["id"]]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("cumulative", res.data["stats"])
+        self.assertIn("core_article", res.data["queries"][-1]["sql"])
+
+        res = self.client.get(reverse("profile-pstats",
+                                      args=[summary["id"]]))
+        self.assertIsInstance(marshal.loads(res.content), dict)
+
+    def test_async_view_queries_are_recorded(self):
+        """Test that queries run by async views are in the timeline."""
+        client = AsyncClient()
+        self.client.force_login(self.staff)
+        client.cookies = self.client.cookies
+
+        async def get():
+            return await client.get(
+                reverse("article-detail", args=[self.article.pk]),
+                {"profile": "1"},
+            )
+        self.assertEqual(async_to_sync(get)().status_code, 200)
+
+        [summary] = self._profiles()
+        self.assertEqual(summary["route"], "article-detail")
+        self.assertGreater(summary["query_count"], 0)
+
+    def test_other_users_are_not_profiled(self):
+        """Test that the profiling flag is ignored for non-staff users."""
+        self.client.get(ARTICLES_URL, HTTP_X_PROFILE="1")
+        self.client.force_login(self.user)
+        self.client.get(ARTICLES_URL, {"profile": "1"})
+
+        self.assertEqual(self._profiles(), [])
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_MAX_PROFILES=2)
+    def test_sampling_keeps_newest_profiles(self):
+        """Test that sampled requests are profiled up to the limit."""
+        for page in (1, 2, 3):
+            self.client.get(ARTICLES_URL, {"page_size": page})
+
+        profiles = self._profiles()
+        self.assertEqual(len(profiles), 2)
+        self.assertEqual(profiles[0]["path"],
+                         f"{ARTICLES_URL}?page_size=3")
+        self.assertEqual(profiles[0]["trigger"], "sample")
+
+    def test_profiles_require_staff(self):
+        """Test that only staff users can read profiles."""
+        self.assertEqual(self.client.get(PROFILES_URL).status_code,
+                         status.HTTP_403_FORBIDDEN)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(PROFILES_URL).status_code,
+                         status.HTTP_403_FORBIDDEN)
+        self.client.force_login(self.staff)
+        res = self.client.get(reverse("profile-detail", args=["missing"]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
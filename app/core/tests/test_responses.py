@@ -0,0 +1,110 @@
+"""
+Tests for the orjson renderer/parser and response compression.
+"""
+import gzip
+import json
+from decimal import Decimal
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core import compression
+from core.models import Article, Source
+from core.renderers import ORJSONParser, ORJSONRenderer
+
+
+class ORJSONTests(TestCase):
+    def test_renders_like_drf(self):
+        """Test that orjson output decodes to what DRF renders."""
+        data = {"title": "Café", "price": Decimal("1.50"),
+                "label": gettext_lazy("Summary"), "ids": [1, 2]}
+
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(json.loads(rendered),
+                         json.loads(JSONRenderer().render(data)))
+        self.assertIn("Café".encode(), rendered)
+
+    def test_indent_and_empty_bodies(self):
+        """Test that an indent is honored and None renders nothing."""
+        renderer = ORJSONRenderer()
+
+        self.assertEqual(renderer.render(None), b"")
+        self.assertIn(b'\n  "a": 1', renderer.render(
+            {"a": 1}, "application/json; indent=4"))
+
+    def test_parser(self):
+        """Test that the parser decodes JSON and rejects bad input."""
+        parser = ORJSONParser()
+
+        self.assertEqual(parser.parse(BytesIO(b'{"a": [1]}')), {"a": [1]})
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b"{"))
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        source = Source.objects.create(name="Wire")
+        for i in range(5):
+            Article.objects.create(
+                source=source, title=f"Story {i}", url=f"https://x/{i}",
+                published_at=timezone.now(), content="Body.",
+            )
+        self.url = reverse("article-list")
+
+    def test_gzip(self):
+        """Test that large responses are gzipped for clients accepting it."""
+        res = self.client.get(self.url, headers={"accept-encoding": "gzip"})
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res["Vary"])
+        body = json.loads(gzip.decompress(res.content))
+        self.assertEqual(body["count"], 5)
+
+    def test_brotli_is_preferred_when_available(self):
+        """Test that brotli is used when installed and accepted."""
+        fake = type("brotli", (), {
+            "compress": staticmethod(lambda data, quality: b"br" + data[:10])
+        })
+        with patch.object(compression, "brotli", fake):
+            res = self.client.get(
+                self.url, headers={"accept-encoding": "gzip, deflate, br"})
+
+        self.assertEqual(res["Content-Encoding"], "br")
+
+    def test_small_or_unaccepted_responses_are_not_compressed(self):
+        """Test the size threshold and a client without Accept-Encoding."""
+        res = self.client.get(self.url)
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+        with override_settings(COMPRESSION_MIN_SIZE=10**6):
+            res = self.client.get(reverse("article-detail", args=[1]),
+                                  headers={"accept-encoding": "gzip"})
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+    def test_cached_pages_are_stored_compressed(self):
+        """Test that a cache hit returns the stored compressed body."""
+        headers = {"accept-encoding": "gzip"}
+        first = self.client.get(self.url, headers=headers)
+
+        with CaptureQueriesContext(connection) as queries, \
+                patch.object(compression, "encode") as encode:
+            hit = self.client.get(self.url, headers=headers)
+
+        self.assertEqual(len(queries), 0)
+        encode.assert_not_called()
+        self.assertEqual(hit.content, first.content)
+        self.assertEqual(hit["Content-Encoding"], "gzip")
+        self.assertFalse(self.client.get(self.url).has_header(
+            "Content-Encoding"))
@@ -0,0 +1,112 @@
+"""
+Tests for the article retention policy.
+"""
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import Article, Job, Source, Summary, Topic
+from core.services import jobs
+from core.services.pipeline import PRUNE
+from core.services.retention import (
+    cutoff_for,
+    expired_batch,
+    prune_articles,
+)
+from core.tests.helpers import make_article
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        self.source = Source.objects.create(name="Wire")
+        self.topic = Topic.objects.create(name="AI")
+        now = timezone.now()
+        self.old = [self._article(f"old-{i}", now - timedelta(days=40 + i))
+                    for i in range(5)]
+        self.recent = self._article("recent", now - timedelta(days=1))
+
+    def _article(self, slug, published_at):
+        article = make_article(self.source, slug, title=slug,
+                               published_at=published_at)
+        article.topics.add(self.topic)
+        Summary.objects.create(article=article, text=f"Summary of {slug}")
+        return article
+
+    def test_prunes_old_articles_in_batches(self):
+        """Test that expired articles and their rows are deleted."""
+        batches = []
+        deleted = prune_articles(cutoff_for(30), batch_size=2,
+                                 on_batch=batches.append)
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertEqual(list(Article.objects.all()), [self.recent])
+        self.assertEqual(Summary.objects.count(), 1)
+        self.assertEqual(self.topic.articles.count(), 1)
+
+    def test_batches_are_found_through_the_published_at_index(self):
+        """Test that a batch of old articles is an index range scan."""
+        if connection.vendor == "postgresql":
+            # A handful of rows would be read with a sequential scan.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = expired_batch(cutoff_for(30), 1000).explain()
+
+        self.assertIn("core_article_published_idx", plan)
+
+    def test_command_archives_before_deleting(self):
+        """Test that --archive writes the deleted articles as JSON lines."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "archive.jsonl.gz")
+            out = StringIO()
+            call_command("prune_articles", days=30, batch_size=2,
+                         archive=path, stdout=out)
+            with gzip.open(path, "rt") as f:
+                rows = [json.loads(line) for line in f]
+
+        self.assertIn("Deleted 5 article(s)", out.getvalue())
+        self.assertEqual(sorted(r["title"] for r in rows),
+                         sorted(a.title for a in self.old))
+        self.assertEqual(rows[0]["topics"], ["AI"])
+        self.assertEqual(rows[0]["summary"], f"Summary of {rows[0]['title']}")
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_dry_run_only_counts(self):
+        """Test that --dry-run deletes nothing."""
+        out = StringIO()
+        call_command("prune_articles", days=30, dry_run=True, stdout=out)
+
+        self.assertIn("5 article(s)", out.getvalue())
+        self.assertEqual(Article.objects.count(), 6)
+
+    def test_command_requires_a_retention_window(self):
+        """Test that pruning without a retention window is refused."""
+        with self.assertRaises(CommandError):
+            call_command("prune_articles", stdout=StringIO())
+
+    @override_settings(ARTICLE_RETENTION_DAYS=30)
+    def test_pipeline_enqueues_and_runs_prune_jobs(self):
+        """Test that the pipeline prunes when a retention is set."""
+        call_command("run_pipeline", "--once", "--concurrency", "1",
+                     "--fetch-interval", "0", stdout=StringIO())
+
+        self.assertEqual(list(Article.objects.all()), [self.recent])
+        self.assertFalse(Job.objects.filter(kind=PRUNE).exists())
+
+    def test_prune_job(self):
+        """Test the prune job handler."""
+        jobs.enqueue(PRUNE, {"days": 30})
+        [job] = jobs.claim()
+
+        self.assertTrue(jobs.run(job))
+        self.assertEqual(Article.objects.count(), 1)
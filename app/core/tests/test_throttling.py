@@ -0,0 +1,178 @@
+"""
+Tests for the sliding-window rate limits.
+"""
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache, caches
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import throttling
+from core.models import Article, Source
+from core.tests.helpers import REDIS_CACHES
+
+WINDOW_START = 6000.0  # a multiple of 60
+
+
+@override_settings(THROTTLE_RATES={"article-list": "10/min",
+                                   "default": "3/min"})
+class ThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        source = Source.objects.create(name="Wire")
+        self.article = Article.objects.create(
+            source=source, title="Story", url="https://x/1",
+            published_at=timezone.now(), content="Body.",
+        )
+
+    def test_cache_misses_cost_more_than_hits(self):
+        """Test that a miss costs 1 + THROTTLE_MISS_COST, a hit 1."""
+        url = reverse("article-list")
+        statuses = [self.client.get(url).status_code for _ in range(6)]
+
+        self.assertEqual(statuses, [200] * 5 + [429])
+
+    def test_spoofed_forwarded_for_does_not_reset_the_budget(self):
+        """Test that X-Forwarded-For is ignored without NUM_PROXIES."""
+        url = reverse("article-detail", args=[self.article.pk])
+        statuses = [
+            self.client.get(url, headers={
+                "x-forwarded-for": f"203.0.113.{i}"}).status_code
+            for i in range(5)
+        ]
+
+        self.assertEqual(statuses, [200] * 3 + [429] * 2)
+
+    def test_throttled_response(self):
+        """Test that a throttled request gets a 429 with Retry-After."""
+        url = reverse("article-detail", args=[self.article.pk])
+        for _ in range(3):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, 429)
+        self.assertGreaterEqual(int(res["Retry-After"]), 1)
+        self.assertIn("throttled", res.json()["detail"])
+
+    def test_limits_are_per_client_and_route(self):
+        """Test that other clients and routes keep their own budget."""
+        url = reverse("article-detail", args=[self.article.pk])
+        for _ in range(4):
+            self.client.get(url)
+
+        self.assertEqual(self.client.get(url, REMOTE_ADDR="10.0.0.2")
+                         .status_code, 200)
+        self.assertEqual(self.client.get(reverse("article-list"))
+                         .status_code, 200)
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def test_disabled(self):
+        """Test that THROTTLE_ENABLED=False turns the limits off."""
+        url = reverse("article-detail", args=[self.article.pk])
+        statuses = {self.client.get(url).status_code for _ in range(5)}
+
+        self.assertEqual(statuses, {200})
+
+
+class SlidingWindowTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _hit(self, at, cost=1):
+        with patch("core.throttling.time.time", return_value=at):
+            return throttling.hit("route", "ip:1", limit=10, window=60,
+                                  cost=cost)
+
+    def test_previous_window_fades_out(self):
+        """Test that the previous window counts for its overlap only."""
+        self.assertEqual(self._hit(WINDOW_START, cost=10), (True, 0))
+        self.assertFalse(self._hit(WINDOW_START + 30)[0])
+
+        # Halfway through the next window, half of the 10 still counts.
+        halfway = WINDOW_START + 90
+        allowed = [self._hit(halfway)[0] for _ in range(6)]
+        self.assertEqual(allowed, [True] * 5 + [False])
+
+    def test_retry_after(self):
+        """Test the wait until a request fits the window again."""
+        self._hit(WINDOW_START, cost=10)
+
+        allowed, wait = self._hit(WINDOW_START + 15)
+
+        self.assertFalse(allowed)
+        # The next window starts in 45 s and the full count has to fade
+        # by a tenth of it (6 s) before one more unit fits.
+        self.assertEqual(wait, 51)
+
+    def test_response_cost_grows_with_page_depth(self):
+        """Test that deep uncached pages cost more than the first one."""
+        request = RequestFactory().get("/articles/", {"page": 25})
+        self.assertEqual(throttling.response_cost(request), 0)
+
+        request._cache_miss = True
+        self.assertEqual(throttling.response_cost(request), 5 + 2)
+
+    def test_parse_rate(self):
+        """Test that rates are read as a limit and a window."""
+        self.assertEqual(throttling.parse_rate("300/min"), (300, 60))
+        self.assertEqual(throttling.parse_rate("5/s"), (5, 1))
+
+
+@override_settings(CACHES=REDIS_CACHES)
+class RedisThrottleTests(TestCase):
+    """Test the Redis path against a mocked redis-py client."""
+
+    def setUp(self):
+        self.redis = MagicMock()
+        self.script = self.redis.register_script.return_value
+        backend = caches["default"]
+        patcher = patch.object(backend.client, "get_client",
+                               return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(throttling._scripts.clear)
+
+    def test_hit_runs_the_lua_script(self):
+        """Test that checking a request is one call of the Lua script."""
+        self.script.return_value = [1, 3, 0]
+
+        with patch("core.throttling.time.time",
+                   return_value=WINDOW_START + 15):
+            allowed = throttling.hit("route", "ip:1", limit=10, window=60,
+                                     cost=3)
+
+        self.assertEqual(allowed, (True, 0))
+        self.redis.register_script.assert_called_once_with(
+            throttling.SLIDING_WINDOW_LUA)
+        self.script.assert_called_once_with(
+            keys=["test:1:throttle:{route:ip:1}:100",
+                  "test:1:throttle:{route:ip:1}:99"],
+            args=[10, 3, 0.75, 120000],
+        )
+
+    def test_hit_refused_by_the_script(self):
+        """Test that a refusal of the script yields a Retry-After."""
+        self.script.return_value = [0, 10, 0]
+
+        with patch("core.throttling.time.time",
+                   return_value=WINDOW_START + 15):
+            allowed, wait = throttling.hit("route", "ip:1", limit=10,
+                                           window=60)
+
+        self.assertFalse(allowed)
+        self.assertEqual(wait, 51)
+
+    def test_charge_increments_in_one_pipeline(self):
+        """Test that charging a response is INCRBY and PEXPIRE."""
+        pipe = self.redis.pipeline.return_value
+
+        with patch("core.throttling.time.time", return_value=WINDOW_START):
+            throttling.charge("route", "ip:1", window=60, cost=5)
+
+        pipe.incrby.assert_called_once_with(
+            "test:1:throttle:{route:ip:1}:100", 5)
+        pipe.pexpire.assert_called_once_with(
+            "test:1:throttle:{route:ip:1}:100", 120000)
+        pipe.execute.assert_called_once()
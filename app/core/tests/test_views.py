@@ -1,6 +1,10 @@
 """
 Tests for ViewSets.
 """
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -8,10 +12,13 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from datetime import timedelta
+from unittest.mock import patch
 
 from core.models import Source, Topic, Article, Summary
+from core.views.summaries import MAX_BULK_SUMMARY_IDS
 
 ARTICLES_URL = reverse("article-list")
+SUMMARIES_URL = reverse("summary-list")
 
 
 def article_detail_url(pk):
@@ -24,6 +31,7 @@ def article_summary_url(pk):
 
 class ArticleViewSetTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.source = Source.objects.create(
             name="Test Source",
             homepage="https://testsource.com"
@@ -69,6 +77,73 @@ class ArticleViewSetTests(APITestCase):
         self.assertEqual(titles[0], "New Article")
         self.assertEqual(titles[1], "Old Article")
 
+    def test_list_articles_omits_body(self):
+        """Tests that list rows leave the body out, joined in one query."""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ARTICLES_URL)
+
+        self.assertNotIn("content", res.data["results"][0])
+        body_queries = [q for q in queries.captured_queries
+                        if "core_articlebody" in q["sql"]]
+        self.assertEqual(len(body_queries), 1)
+        self.assertIn("JOIN", body_queries[0]["sql"])
+
+    def test_list_articles_include_content(self):
+        """Tests that ?include=content joins the bodies into the list."""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ARTICLES_URL, {"include": "content"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["content"] for row in res.data["results"]],
+                         [self.article_new.content, self.article_old.content])
+        body_queries = [q for q in queries.captured_queries
+                        if "core_articlebody" in q["sql"]]
+        self.assertEqual(len(body_queries), 1)
+        self.assertIn("JOIN", body_queries[0]["sql"])
+
+    def test_list_articles_include_content_query_count(self):
+        """Tests that ?include=content costs the same queries per page."""
+        def queries_for_page():
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.get(ARTICLES_URL, {"include": "content"})
+            self.assertTrue(all("content" in row
+                                for row in res.data["results"]))
+            return len(queries)
+
+        two_articles = queries_for_page()
+        for i in range(5):
+            article = Article.objects.create(
+                title=f"Extra {i}", url=f"https://testsource.com/extra/{i}",
+                source=self.source, published_at=timezone.now(),
+                content=f"Extra content {i}.",
+            )
+            article.topics.add(self.topic_two)
+
+        self.assertEqual(queries_for_page(), two_articles)
+
+    def test_filter_by_several_topics_lists_articles_once(self):
+        """Tests that an article with several of the topics is one row."""
+        self.article_new.topics.add(self.topic_two)
+
+        res = self.client.get(ARTICLES_URL, {
+            "topic_ids": f"{self.topic_one.id},{self.topic_two.id}"})
+
+        self.assertEqual([row["id"] for row in res.data["results"]],
+                         [self.article_new.id])
+        self.assertEqual(res.data["count"], 1)
+
+    def test_related_articles_include_content(self):
+        """Tests that ?include=content adds the bodies to related articles."""
+        url = reverse("article-related", args=[self.article_old.id])
+        with patch("core.services.embeddings.related_article_ids",
+                   return_value=[self.article_new.id]):
+            res = self.client.get(url, {"include": "content"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["content"],
+                         self.article_new.content)
+
     def test_retrieve_article(self):
         """Tests retrieving a specific article by ID."""
         url = article_detail_url(self.article_old.id)
@@ -78,6 +153,27 @@ class ArticleViewSetTests(APITestCase):
         self.assertEqual(res.data["id"], self.article_old.id)
         self.assertEqual(res.data["title"], "Old Article")
 
+    def test_retrieve_article_related_rows_preloaded(self):
+        """Tests the detail view loads source, summary and topics upfront."""
+        url = article_detail_url(self.article_new.id)
+        with self.assertNumQueries(2):
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["source"]["name"], "Test Source")
+        self.assertEqual(res.data["summary"]["text"],
+                         "This is a summary of the new article.")
+        self.assertEqual(res.data["content"], self.article_new.content)
+        self.assertEqual([t["name"] for t in res.data["topics"]],
+                         ["First Topic"])
+
+    def test_retrieve_article_not_found(self):
+        """Tests retrieving an article that does not exist."""
+        res = self.client.get(article_detail_url(999999))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res.json(), {"detail": "Not found."})
+
     def test_article_sumamry_exists(self):
         """Tests retrieving summary for an article that has one."""
         url = article_summary_url(self.article_new.id)
@@ -121,6 +217,52 @@ class ArticleViewSetTests(APITestCase):
         self.assertIn("results", res.data)
         self.assertEqual(len(res.data["results"]), 7)
 
+    def _extra_articles(self, n):
+        for i in range(n):
+            Article.objects.create(
+                title=f"Extra {i}",
+                url=f"https://testsource.com/extra-{i}",
+                source=self.source,
+                published_at=timezone.now() - timedelta(minutes=i),
+                content="Extra content.",
+            )
+
+    def test_count_is_exact_under_the_cap(self):
+        """Tests that small result sets get an exact count."""
+        res = self.client.get(ARTICLES_URL)
+
+        self.assertEqual(res.data["count"], 2)
+        self.assertFalse(res.data["count_is_approximate"])
+
+    @override_settings(PAGINATION_COUNT_CAP=10)
+    def test_count_is_capped(self):
+        """Tests that counts stop at the cap and later pages still work."""
+        self._extra_articles(25)
+
+        res = self.client.get(ARTICLES_URL)
+        self.assertEqual(res.data["count"], 10)
+        self.assertTrue(res.data["count_is_approximate"])
+        self.assertIsNotNone(res.data["next"])
+
+        res = self.client.get(ARTICLES_URL, {"page": 2})
+        self.assertEqual(len(res.data["results"]), 7)
+        self.assertIsNone(res.data["next"])
+
+        res = self.client.get(ARTICLES_URL, {"page": 3})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(PAGINATION_COUNT_CAP=10)
+    def test_planner_estimate_for_broad_queries(self):
+        """Tests that a large planner estimate replaces the count."""
+        with patch("core.pagination._planner_estimate",
+                   return_value=123456) as estimate:
+            res = self.client.get(ARTICLES_URL, {"topic_slugs": "first-topic"})
+
+        self.assertEqual(res.data["count"], 123456)
+        self.assertTrue(res.data["count_is_approximate"])
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertTrue(estimate.call_args.args[0].query.where)
+
     def test_post_is_read_only(self):
         """Tests that POST requests are not allowed on articles."""
         payload = {
@@ -207,3 +349,108 @@ class ArticleViewSetTests(APITestCase):
 
         titles = [row["title"] for row in res.data["results"]]
         self.assertCountEqual(titles, ["New Article", "Third Article"])
+
+    def test_collapse_duplicates(self):
+        """Tests that collapse_duplicates keeps one article per cluster."""
+        self.article_old.cluster_id = self.article_old.id
+        self.article_old.save()
+        self.article_new.cluster_id = self.article_old.id
+        self.article_new.save()
+
+        res = self.client.get(ARTICLES_URL, {"collapse_duplicates": "true"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        titles = [row["title"] for row in res.data["results"]]
+        self.assertEqual(titles, ["Old Article"])
+
+    def test_collapse_duplicates_keeps_members_matching_other_filters(self):
+        """Tests that a cluster is kept when only a non-root matches."""
+        self.article_old.cluster_id = self.article_old.id
+        self.article_old.save()
+        self.article_new.cluster_id = self.article_old.id
+        self.article_new.save()
+        self.article_old.topics.clear()
+        self.article_new.topics.set([self.topic_two])
+
+        res = self.client.get(ARTICLES_URL, {
+            "collapse_duplicates": "true",
+            "topic_slugs": self.topic_two.slug,
+        })
+
+        titles = [row["title"] for row in res.data["results"]]
+        self.assertEqual(titles, ["New Article"])
+
+    def test_collapse_duplicates_after_the_root_is_deleted(self):
+        """Tests that a cluster whose root was pruned is still listed."""
+        self.article_old.cluster_id = self.article_old.id
+        self.article_old.save()
+        self.article_new.cluster_id = self.article_old.id
+        self.article_new.save()
+        self.article_old.delete()
+
+        res = self.client.get(ARTICLES_URL, {"collapse_duplicates": "true"})
+
+        titles = [row["title"] for row in res.data["results"]]
+        self.assertEqual(titles, ["New Article"])
+
+
+class SummaryViewSetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.source = Source.objects.create(
+            name="Test Source",
+            homepage="https://testsource.com"
+        )
+        self.articles = []
+        for i in range(3):
+            article = Article.objects.create(
+                title=f"Article {i}",
+                url=f"https://testsource.com/{i}",
+                source=self.source,
+                published_at=timezone.now(),
+                content=f"Content {i}.",
+            )
+            self.articles.append(article)
+        for article in self.articles[:2]:
+            Summary.objects.create(article=article,
+                                   text=f"Summary of {article.title}")
+
+    def test_bulk_summaries(self):
+        """Tests fetching several summaries in one request."""
+        ids = ",".join(str(a.id) for a in self.articles)
+        with self.assertNumQueries(1):
+            res = self.client.get(SUMMARIES_URL, {"article_ids": ids})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["article_id"] for row in res.data["results"]],
+            [a.id for a in self.articles[:2]],
+        )
+        self.assertEqual(set(res.data["results"][0].keys()),
+                         {"article_id", "text", "model_name"})
+
+    def test_bulk_summaries_are_cached_per_id_set(self):
+        """Tests that a repeated id set is served from the cache."""
+        ids = f"{self.articles[1].id},{self.articles[0].id}"
+        self.client.get(SUMMARIES_URL, {"article_ids": ids})
+
+        reordered = f"{self.articles[0].id},{self.articles[1].id}"
+        with self.assertNumQueries(0):
+            res = self.client.get(SUMMARIES_URL, {"article_ids": reordered})
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_bulk_summaries_requires_ids(self):
+        """Tests that article_ids is required."""
+        res = self.client.get(SUMMARIES_URL)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_summaries_invalid_ids(self):
+        """Tests that non-numeric ids are rejected."""
+        res = self.client.get(SUMMARIES_URL, {"article_ids": "1,abc"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_summaries_capped(self):
+        """Tests that too many ids are rejected."""
+        ids = ",".join(str(i) for i in range(MAX_BULK_SUMMARY_IDS + 1))
+        res = self.client.get(SUMMARIES_URL, {"article_ids": ids})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
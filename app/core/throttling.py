@@ -0,0 +1,171 @@
+"""
+Sliding-window rate limits per client and route.
+
+Each client (user id when signed in, otherwise IP address) has a budget
+of `limit` cost units per window on each route (THROTTLE_RATES, keyed
+by URL name with a "default" entry). The window slides: the count of
+the previous fixed window is weighted by how much of it still overlaps
+the sliding one and added to the count of the current window, which
+needs two counters per client and route instead of a log of requests.
+
+On Redis, checking and charging a request is one Lua script call, so
+it is atomic and costs one round trip. Requests start at a cost of 1.
+Responses that missed the page cache are charged THROTTLE_MISS_COST
+more, plus one for every THROTTLE_PAGE_COST_STEP pages of depth, so a
+scraper walking uncached deep pages runs out long before a reader of
+the cached front page. Other backends get the same algorithm without
+atomicity (fine for development and tests).
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from rest_framework.throttling import BaseThrottle
+
+# KEYS: current and previous window counters.
+# ARGV: limit, cost, weight of the previous window, counter expiry (ms).
+# Returns {allowed, current count, previous count}.
+SLIDING_WINDOW_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+if previous * tonumber(ARGV[3]) + current + cost > limit then
+  return {0, current, previous}
+end
+redis.call('INCRBY', KEYS[1], cost)
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return {1, current + cost, previous}
+"""
+
+PERIODS = {"s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hour": 3600,
+           "d": 86400, "day": 86400}
+
+_scripts: dict = {}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    Parse a rate such as "300/min".
+
+    Returns:
+        tuple[int, int]: The limit and the window in seconds.
+    """
+    limit, _, period = rate.partition("/")
+    return int(limit), PERIODS[period.strip()]
+
+
+def rate_for(route: str) -> tuple[int, int] | None:
+    """Returns the limit and window of a route, or None if unlimited."""
+    rates = settings.THROTTLE_RATES
+    rate = rates.get(route, rates.get("default"))
+    return parse_rate(rate) if rate else None
+
+
+def client_ident(request, user=None) -> str:
+    """Returns the throttling identity of the client of a request."""
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    # DRF's ident honours REST_FRAMEWORK["NUM_PROXIES"] for
+    # X-Forwarded-For.
+    return f"ip:{BaseThrottle().get_ident(request)}"
+
+
+def _uses_redis() -> bool:
+    # `cache` is a proxy; the backend class is the one of the alias.
+    return type(caches["default"]).__module__.startswith("django_redis")
+
+
+def _keys(route: str, ident: str, window: int,
+          now: float) -> tuple[str, str, float]:
+    index, into = divmod(now, window)
+    # The hash tag keeps both counters on one Redis Cluster slot.
+    base = f"throttle:{{{route}:{ident}}}"
+    return f"{base}:{int(index)}", f"{base}:{int(index) - 1}", into / window
+
+
+def retry_after(limit: int, window: int, cost: int, current: float,
+                previous: float, elapsed: float) -> int:
+    """
+    Returns the seconds until a request of `cost` fits in the window,
+    given the counts of the current and previous fixed windows and the
+    fraction of the current window that has `elapsed`.
+    """
+    room = limit - cost - current
+    if room >= 0 and previous > 0:
+        # The previous window fades out while the current one runs.
+        fraction = 1 - room / previous
+        if fraction <= 1:
+            return max(1, math.ceil((fraction - elapsed) * window))
+    if cost > limit:
+        return window
+    # Wait for the next window, then for the current count to fade.
+    fade = max(0.0, 1 - (limit - cost) / current) if current else 0.0
+    return max(1, math.ceil((1 - elapsed + fade) * window))
+
+
+def hit(route: str, ident: str, limit: int, window: int,
+        cost: int = 1) -> tuple[bool, int]:
+    """
+    Charge a request to the client's window if it fits.
+
+    Returns:
+        tuple[bool, int]: Whether the request is allowed and, if not,
+        the seconds to wait (Retry-After).
+    """
+    current_key, previous_key, elapsed = _keys(route, ident, window,
+                                               time.time())
+    weight = 1 - elapsed
+    if _uses_redis():
+        client = cache.client.get_client(write=True)
+        script = _scripts.get(id(client))
+        if script is None:
+            script = _scripts[id(client)] = client.register_script(
+                SLIDING_WINDOW_LUA)
+        allowed, current, previous = script(
+            keys=[cache.client.make_key(current_key),
+                  cache.client.make_key(previous_key)],
+            args=[limit, cost, weight, window * 2000],
+        )
+    else:
+        counts = cache.get_many([current_key, previous_key])
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+        allowed = previous * weight + current + cost <= limit
+        if allowed:
+            current += cost
+            cache.set(current_key, current, window * 2)
+    if allowed:
+        return True, 0
+    return False, retry_after(limit, window, cost, current, previous,
+                              elapsed)
+
+
+def charge(route: str, ident: str, window: int, cost: int) -> None:
+    """Add `cost` to the client's current window (after a response)."""
+    current_key, _, _ = _keys(route, ident, window, time.time())
+    if _uses_redis():
+        key = cache.client.make_key(current_key)
+        pipe = cache.client.get_client(write=True).pipeline()
+        pipe.incrby(key, cost)
+        pipe.pexpire(key, window * 2000)
+        pipe.execute()
+        return
+    cache.set(current_key, cache.get(current_key, 0) + cost, window * 2)
+
+
+def response_cost(request) -> int:
+    """
+    Returns the cost to add for a request once it has been answered, on
+    top of the 1 charged upfront: page cache misses cost more, the more
+    so for deep pages.
+    """
+    if not getattr(request, "_cache_miss", False):
+        return 0
+    try:
+        page = max(1, int(request.GET.get("page", 1)))
+    except ValueError:
+        page = 1
+    return (settings.THROTTLE_MISS_COST
+            + (page - 1) // settings.THROTTLE_PAGE_COST_STEP)
@@ -1,53 +1,126 @@
 """
-Viewset for articles.
+Viewset and async views for articles.
 """
-from rest_framework.viewsets import ReadOnlyModelViewSet
+from rest_framework.viewsets import GenericViewSet
+from rest_framework.mixins import ListModelMixin
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-from rest_framework import status
 
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.views.decorators.http import require_GET
 
 from rest_framework.filters import OrderingFilter
 
+from core.cache import cache_page
+from core.db_router import use_replica
 from core.models import Article, Summary
-from core.serializers import ArticleSerializer, SummarySerializer
+from core.serializers import (
+    ArticleListSerializer,
+    ArticleSerializer,
+    SummarySerializer,
+)
 from core.filters import ArticleFilter
 from core.pagination import DefaultPagination
+from core.views.responses import api_response, not_found
 
+MAX_RELATED = 50
+# `?include=content` adds the article bodies to the list and related
+# responses.
+INCLUDE_PARAM = "include"
 
-@method_decorator(cache_page(60*5), name='list')
-class ArticleViewSet(ReadOnlyModelViewSet):
+
+# Fresh for 5 minutes; stale copies are served for up to an hour while
+# one request refreshes the page.
+@method_decorator(cache_page(60 * 5, hard_timeout=60 * 60), name='list')
+@method_decorator(use_replica, name='list')
+@method_decorator(use_replica, name='related')
+class ArticleViewSet(ListModelMixin, GenericViewSet):
     """
     Endpoints:
       GET /api/articles
-      GET /api/articles/{id}
-      GET /api/articles/{id}/summary
+      GET /api/articles/{id}/related
+
+    Both leave the article body out unless asked for with
+    `?include=content`. The detail and summary endpoints are the async
+    views below. All of them read from a replica when one is configured.
     """
-    queryset = Article.objects.all().distinct()
-    serializer_class = ArticleSerializer
+    # The body is joined whether or not the response includes it, so no
+    # serializer reading `content` can fall back to a query per row.
+    queryset = (
+        Article.objects
+        .select_related("source", "summary", "body")
+        .prefetch_related("topics")
+    )
+    serializer_class = ArticleListSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = ArticleFilter
     ordering_fields = ["published_at"]
     ordering = ["-published_at"]
     pagination_class = DefaultPagination
 
+    def _include_content(self) -> bool:
+        include = self.request.query_params.get(INCLUDE_PARAM, "")
+        return "content" in include.split(",")
+
+    def get_serializer_class(self):
+        if self._include_content():
+            return ArticleSerializer
+        return super().get_serializer_class()
+
     @action(detail=True,
             methods=["get"],
-            url_path="summary",
-            url_name="summary"
+            url_path="related",
+            url_name="related"
             )
-    def summary(self, request, pk=None):
-        """Fetch a summary of a specific article (read-only)."""
+    def related(self, request, pk=None):
+        """Fetch articles semantically similar to a specific article."""
+        # numpy is only loaded by the processes that serve this endpoint.
+        from core.services.embeddings import related_article_ids
+
+        article = get_object_or_404(Article.objects.only("id"), pk=pk)
         try:
-            summary = Summary.objects.get(article_id=pk)
-        except Summary.DoesNotExist:
-            return Response(
-                {"detail": "Not found."},
-                status=status.HTTP_404_NOT_FOUND
-            )
+            limit = min(int(request.query_params.get("limit", 10)),
+                        MAX_RELATED)
+        except ValueError:
+            limit = 10
+        ids = related_article_ids(article.pk, k=max(limit, 1))
+        by_id = self.get_queryset().in_bulk(ids)
+        related = [by_id[i] for i in ids if i in by_id]
+
+        serializer = self.get_serializer(related, many=True)
+        return Response({"results": serializer.data})
 
-        serializer = SummarySerializer(summary)
-        return Response(serializer.data)
+
+@require_GET
+@use_replica
+async def article_detail(request, pk):
+    """
+    Endpoint:
+      GET /api/articles/{id}
+    """
+    try:
+        article = await (
+            Article.objects
+            .select_related("source", "summary", "body")
+            .prefetch_related("topics")
+            .aget(pk=pk)
+        )
+    except Article.DoesNotExist:
+        return not_found()
+    return api_response(ArticleSerializer(article).data)
+
+
+@require_GET
+@use_replica
+async def article_summary(request, pk):
+    """
+    Endpoint:
+      GET /api/articles/{id}/summary
+    """
+    try:
+        summary = await Summary.objects.aget(article_id=pk)
+    except Summary.DoesNotExist:
+        return not_found()
+    return api_response(SummarySerializer(summary).data)
@@ -0,0 +1,27 @@
+"""
+Prometheus metrics endpoint.
+"""
+from django.http import HttpResponse
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+
+from core import metrics as core_metrics
+from core.permissions import MetricsAccess
+
+
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([MetricsAccess])
+def metrics(request):
+    """
+    Endpoint:
+      GET /metrics
+
+    Only for METRICS_ALLOWED_IPS or a `Bearer` METRICS_TOKEN; anyone
+    else gets 403.
+    """
+    body, content_type = core_metrics.render()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,55 @@
+"""
+Views for the request profiles captured by ProfilingMiddleware.
+"""
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from core import profiling
+from core.views.responses import not_found
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def profile_list(request):
+    """
+    Endpoint:
+      GET /api/profiles
+    """
+    return Response({"results": profiling.list_profiles()})
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def profile_detail(request, profile_id):
+    """
+    Endpoint:
+      GET /api/profiles/{id}
+
+    The top of the cProfile output by cumulative time and the SQL
+    timeline (query start and duration relative to the request).
+    """
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        return not_found()
+    return Response({k: v for k, v in profile.items() if k != "pstats"})
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def profile_pstats(request, profile_id):
+    """
+    Endpoint:
+      GET /api/profiles/{id}/pstats
+
+    The raw profile, for `python -m pstats` or snakeviz.
+    """
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        return not_found()
+    response = HttpResponse(profile["pstats"],
+                            content_type="application/octet-stream")
+    response["Content-Disposition"] = (
+        f'attachment; filename="{profile_id}.prof"')
+    return response
@@ -0,0 +1,21 @@
+"""
+Helpers for plain (async) Django views that answer like DRF views.
+"""
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.renderers import ORJSONRenderer
+
+
+def api_response(data, status=status.HTTP_200_OK) -> Response:
+    """Returns a DRF Response that renders as JSON without an APIView."""
+    response = Response(data, status=status)
+    response.accepted_renderer = ORJSONRenderer()
+    response.accepted_media_type = ORJSONRenderer.media_type
+    response.renderer_context = {}
+    return response
+
+
+def not_found() -> Response:
+    return api_response({"detail": "Not found."},
+                        status=status.HTTP_404_NOT_FOUND)
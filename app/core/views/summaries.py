@@ -0,0 +1,69 @@
+"""
+Async view for bulk summary lookups.
+"""
+from rest_framework import status
+
+from django.views.decorators.http import require_GET
+
+from core import async_cache, metrics
+from core.db_router import use_replica
+from core.models import Summary
+from core.serializers import ArticleSummarySerializer
+from core.views.responses import api_response
+
+MAX_BULK_SUMMARY_IDS = 100
+BULK_SUMMARY_CACHE_TTL = 60 * 5
+
+
+def _parse_article_ids(value: str) -> list[int]:
+    """Parse a comma-separated list of ids into sorted, unique ints."""
+    return sorted({int(v) for v in value.split(",") if v.strip()})
+
+
+@require_GET
+@use_replica
+async def bulk_summaries(request):
+    """
+    Fetch the summaries of several articles in one request.
+
+    Endpoint:
+      GET /api/summaries?article_ids=1,2,3
+    """
+    try:
+        ids = _parse_article_ids(request.GET.get("article_ids", ""))
+    except ValueError:
+        return api_response(
+            {"article_ids": ["Expected a comma-separated list of ids."]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not ids:
+        return api_response(
+            {"article_ids": ["This query parameter is required."]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(ids) > MAX_BULK_SUMMARY_IDS:
+        return api_response(
+            {"article_ids": [
+                f"At most {MAX_BULK_SUMMARY_IDS} ids are allowed."
+            ]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    cache_key = "summaries:" + ",".join(str(i) for i in ids)
+    data = await async_cache.aget(cache_key)
+    metrics.CACHE_REQUESTS.labels(
+        "summaries", "miss" if data is None else "hit"
+    ).inc()
+    if data is None:
+        summaries = [
+            s async for s in (
+                Summary.objects
+                .filter(article_id__in=ids)
+                .only("article_id", "text", "model_name")
+                .order_by("article_id")
+                .aiterator()
+            )
+        ]
+        data = ArticleSummarySerializer(summaries, many=True).data
+        await async_cache.aset(cache_key, data, BULK_SUMMARY_CACHE_TTL)
+    return api_response({"results": data})
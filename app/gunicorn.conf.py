@@ -0,0 +1,59 @@
+"""
+Gunicorn settings for the production profile.
+
+    gunicorn -c gunicorn.conf.py
+
+Every value can be overridden from the environment. The default worker
+class is "gthread": threaded sync workers serving the WSGI app. Set
+GUNICORN_WORKER_CLASS to "uvicorn.workers.UvicornWorker" to serve the
+ASGI app instead; the app follows the worker class.
+
+gthread is the default because the database sits one PgBouncer hop
+away: with a few milliseconds per query, a sync worker serves more
+requests than an async one and keeps a couple of database connections
+instead of one per request (see bench_async in the README). Uvicorn
+workers pull ahead when queries are slow, as with a remote database.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS",
+                        multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+if worker_class == "gthread":
+    wsgi_app = "app.wsgi:application"
+    # Sync threads are reused across requests, so they can keep their
+    # database connections; the settings read this when the app loads.
+    os.environ.setdefault("DB_CONN_MAX_AGE", "60")
+else:
+    wsgi_app = "app.asgi:application"
+
+# Import Django once in the master so workers fork with it loaded.
+preload_app = os.getenv("GUNICORN_PRELOAD", "True").lower() == "true"
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers now and then to bound memory growth.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-")
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading must not be shared by workers.
+    from django.db import connections
+    connections.close_all()
+
+
+def child_exit(server, worker):
+    # Drop the live-gauge files of dead workers from the metrics dir.
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,18 @@
+#!/bin/sh
+# Entrypoint of the dev streaming replica (docker-compose.replica.yml):
+# on first start, clone the primary with pg_basebackup (which writes the
+# standby settings), then run Postgres as a hot standby.
+set -e
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until pg_isready -h "$PRIMARY_HOST" -U "$POSTGRES_USER" -q; do
+        echo "Waiting for the primary..."
+        sleep 1
+    done
+    PGPASSWORD="$POSTGRES_PASSWORD" pg_basebackup \
+        -h "$PRIMARY_HOST" -U "$POSTGRES_USER" -D "$PGDATA" \
+        --write-recovery-conf --wal-method=stream --checkpoint=fast
+    chmod 700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on
@@ -0,0 +1,17 @@
+#!/bin/sh
+# Production entrypoint: wait for the database, migrate, then serve the
+# app with gunicorn (see app/gunicorn.conf.py for the tunables).
+set -e
+
+python manage.py wait_for_db
+python manage.py migrate --noinput
+
+# Workers write their metrics here; start from an empty directory so
+# samples of a previous run are not aggregated into /metrics.
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+# gunicorn.conf.py picks the WSGI or ASGI app for the worker class.
+exec gunicorn -c gunicorn.conf.py